@@ -0,0 +1,92 @@
+"""
+Saving benchmark results as JSON baselines and comparing later runs against
+them.
+
+Results are nested dictionaries of ``{case: {operation: {metric: value}}}``.
+Baselines are specific to the machine they were recorded on and are kept
+out of version control in ``benchmarks/.baselines``.
+"""
+import json
+import os
+import platform
+import sys
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+)
+
+
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.baselines')
+
+
+Change = NamedTuple('Change', (
+    ('case', str),
+    ('operation', str),
+    ('baseline', float),
+    ('current', float),
+))
+
+
+def default_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def save(path: str, results: Results) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document: Dict[str, Any] = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w') as baseline_file:
+        json.dump(document, baseline_file, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Results:
+    with open(path) as baseline_file:
+        document = json.load(baseline_file)
+    if document.get('python') != platform.python_version():
+        print(
+            f"warning: baseline recorded with python {document.get('python')}, "
+            f"running {platform.python_version()}",
+            file=sys.stderr,
+        )
+    return document['results']
+
+
+def compare(baseline: Results, results: Results, metric: str) -> List[Change]:
+    """
+    Return the change in ``metric`` for every case and operation measured in
+    both ``baseline`` and ``results``.
+    """
+    return [
+        Change(case, operation, baseline[case][operation][metric], metrics[metric])
+        for case, operations in results.items()
+        for operation, metrics in operations.items()
+        if metric in baseline.get(case, {}).get(operation, {})
+    ]
+
+
+def relative_change(change: Change) -> float:
+    if not change.baseline:
+        return 0.0
+    return change.current / change.baseline - 1
+
+
+def report(changes: List[Change], threshold: float, higher_is_better: bool = True) -> int:
+    """
+    Print the relative change of each of ``changes`` and return how many
+    are worse than the baseline by more than ``threshold``.
+    """
+    regressions = 0
+    for change in changes:
+        relative = relative_change(change)
+        print(f"{change.case:<16} {change.operation:<9} {relative:>+8.1%}")
+        if (-relative if higher_is_better else relative) > threshold:
+            regressions += 1
+    return regressions
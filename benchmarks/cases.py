@@ -0,0 +1,95 @@
+"""
+The types and values measured by the benchmarks: one case for each kind of
+type in :mod:`bimini.types` plus the Ethereum shaped presets of
+:mod:`bimini.corpus`.
+"""
+from typing import (
+    Any,
+    Dict,
+    NamedTuple,
+    Tuple,
+)
+
+from bimini.corpus import (
+    PRESETS,
+    CorpusGenerator,
+    constant,
+    preset,
+)
+from bimini.grammar import parse
+from bimini.records import record
+from bimini.types import BaseType
+
+
+BenchmarkCase = NamedTuple('BenchmarkCase', (
+    ('name', str),
+    ('value_type', BaseType),
+    ('values', Tuple[Any, ...]),
+))
+
+# Number of values encoded or decoded by each timed operation.
+NUM_VALUES = 100
+
+
+# The name, type string and generator options of each case of a single
+# kind of type.
+_TYPE_CASES: Tuple[Tuple[str, str, Dict[str, Any]], ...] = (
+    ('bit', 'bit', {}),
+    ('bool', 'bool', {}),
+    ('byte', 'byte', {}),
+    ('uint8', 'uint8', {}),
+    ('uint64', 'uint64', {}),
+    ('uint256', 'uint256', {}),
+    ('scalar8', 'scalar8', {}),
+    ('scalar64', 'scalar64', {}),
+    ('scalar256', 'scalar256', {'scalar_bits': constant(256)}),
+    ('bytes-32', 'bytes', {'bytes_length': constant(32)}),
+    ('bytes-4096', 'bytes', {'bytes_length': constant(4096)}),
+    ('bytes32', 'bytes32', {}),
+    ('optional', 'bytes32?', {}),
+    ('container', '{uint64,scalar64,bytes,bool}', {'bytes_length': constant(16)}),
+    ('tuple', 'uint64[16]', {}),
+    ('uint64-array', 'uint64[]', {'array_length': constant(256)}),
+    ('scalar64-array', 'scalar64[]', {'array_length': constant(256)}),
+    ('bytes-array', 'bytes[]', {'array_length': constant(17), 'bytes_length': constant(32)}),
+    ('bit-array', 'bit[]', {'array_length': constant(2048)}),
+    ('bitfield', 'bitfield', {'array_length': constant(2048)}),
+)
+
+
+# The header preset decoded into records rather than tuples.
+HeaderRecord = record('HeaderRecord', zip(
+    (
+        'parent_hash', 'uncles_hash', 'coinbase', 'state_root', 'transaction_root',
+        'receipt_root', 'bloom', 'difficulty', 'block_number', 'gas_limit', 'gas_used',
+        'timestamp', 'extra_data', 'mix_hash', 'nonce',
+    ),
+    parse(PRESETS['header'].type_str).element_types,
+))
+
+
+def _header_record_generator(seed: int) -> CorpusGenerator:
+    _, options, lengths, overrides = PRESETS['header']
+    return CorpusGenerator(
+        HeaderRecord._value_type, seed, lengths=lengths, overrides=overrides, **options
+    )
+
+
+def get_cases(num_values: int = NUM_VALUES, seed: int = 0) -> Dict[str, BenchmarkCase]:
+    """
+    Return every benchmark case by name, each with ``num_values`` values
+    generated deterministically from ``seed``.
+    """
+    generators = [
+        (name, CorpusGenerator(type_str, seed, **options))
+        for name, type_str, options in _TYPE_CASES
+    ] + [
+        (name, preset(name, seed))
+        for name in PRESETS
+    ] + [
+        ('header-record', _header_record_generator(seed)),
+    ]
+    return {
+        name: BenchmarkCase(name, generator.value_type, generator.samples(num_values))
+        for name, generator in generators
+    }
@@ -0,0 +1,82 @@
+"""
+Measure the cost of importing bimini modules with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter ``--runs`` times and the
+median cumulative import time is reported in milliseconds.  With
+``--max-ms`` the script exits with a non-zero status when any module is
+slower than the limit.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 20 --max-ms 100 bimini
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import (
+    Dict,
+    List,
+    Sequence,
+)
+
+
+DEFAULT_MODULES = ('bimini', 'bimini.types', 'bimini.grammar')
+
+# `import time: <self us> | <cumulative us> | <indented module name>`
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$')
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module: str) -> float:
+    """
+    Return the cumulative time in milliseconds taken to import ``module`` in
+    a fresh interpreter.
+    """
+    env = dict(os.environ, PYTHONPATH=_ROOT)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        universal_newlines=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        # Only the top level entry for the module includes the cost of the
+        # packages it is nested in.
+        if match is not None and match.group(4) == module and len(match.group(3)) == 1:
+            return int(match.group(2)) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def run(modules: Sequence[str], runs: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for module in modules:
+        timings: List[float] = [measure_import(module) for _ in range(runs)]
+        results[module] = statistics.median(timings)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    results = run(args.modules, args.runs)
+    for module, elapsed in results.items():
+        print(f'{module:<20} {elapsed:8.2f} ms')
+
+    if args.max_ms is not None:
+        slow = [module for module, elapsed in results.items() if elapsed > args.max_ms]
+        if slow:
+            sys.exit(f"Slower to import than {args.max_ms} ms: {', '.join(slow)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Measure the python heap used by decoded values with ``tracemalloc``.
+
+For each benchmark case the encoded values are decoded while tracing
+allocations, reporting per decoded value the peak bytes allocated while
+decoding and the bytes retained by the result, and the retained bytes of
+python heap per byte of encoded data.
+
+    python -m benchmarks.memory                 # run every case
+    python -m benchmarks.memory --save          # record a baseline
+    python -m benchmarks.memory --compare       # compare to the baseline
+
+When comparing, cases which retain more memory than the baseline by more
+than ``--threshold`` are reported and the script exits with a non-zero
+status.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from typing import (
+    Dict,
+    Sequence,
+)
+
+from benchmarks import baselines
+from benchmarks.cases import (
+    BenchmarkCase,
+    get_cases,
+)
+
+
+def measure(case: BenchmarkCase) -> Dict[str, float]:
+    value_type = case.value_type
+    blobs = tuple(value_type.encode(value) for value in case.values)
+    num_bytes = sum(len(blob) for blob in blobs)
+
+    # Compile the codec before tracing so that only the values are measured.
+    value_type.decode(blobs[0])
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        decoded = [value_type.decode(blob) for blob in blobs]
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The list holding the results is not part of the values.
+    retained = current - start - sys.getsizeof(decoded)
+    del decoded
+
+    return {
+        'peak_bytes_per_value': (peak - start) / len(blobs),
+        'retained_bytes_per_value': retained / len(blobs),
+        'heap_bytes_per_encoded_byte': retained / num_bytes,
+    }
+
+
+def run(cases: Sequence[BenchmarkCase]) -> baselines.Results:
+    results: baselines.Results = {}
+    print(f"{'case':<16} {'peak B/value':>14} {'retained B/value':>18} {'heap B/encoded B':>18}")
+    for case in cases:
+        metrics = measure(case)
+        results[case.name] = {'decode': metrics}
+        print(
+            f"{case.name:<16} {metrics['peak_bytes_per_value']:>14,.0f} "
+            f"{metrics['retained_bytes_per_value']:>18,.0f} "
+            f"{metrics['heap_bytes_per_encoded_byte']:>18.2f}",
+            flush=True,
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('cases', nargs='*', help="names of the cases to run, default all")
+    parser.add_argument('--save', nargs='?', const=baselines.default_path('memory'))
+    parser.add_argument('--compare', nargs='?', const=baselines.default_path('memory'))
+    parser.add_argument('--threshold', type=float, default=0.05)
+    args = parser.parse_args()
+
+    all_cases = get_cases()
+    unknown = set(args.cases) - set(all_cases)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    cases = [all_cases[name] for name in args.cases or all_cases]
+
+    results = run(cases)
+
+    if args.save:
+        baselines.save(args.save, results)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        changes = baselines.compare(
+            baselines.load(args.compare), results, 'retained_bytes_per_value',
+        )
+        print()
+        regressions = baselines.report(changes, args.threshold, higher_is_better=False)
+        if regressions:
+            sys.exit(f"{regressions} cases use more memory by more than {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Measure the encode, decode and s_decode throughput of each benchmark case in
+operations per second and MB/s of encoded data.
+
+    python -m benchmarks.throughput                  # run every case
+    python -m benchmarks.throughput header block     # run selected cases
+    python -m benchmarks.throughput --save           # record a baseline
+    python -m benchmarks.throughput --compare        # compare to the baseline
+
+When comparing, operations which are slower than the baseline by more than
+``--threshold`` are reported and the script exits with a non-zero status.
+"""
+import argparse
+import io
+import sys
+import timeit
+from typing import (
+    Callable,
+    Dict,
+    Sequence,
+)
+
+from benchmarks import baselines
+from benchmarks.cases import (
+    BenchmarkCase,
+    get_cases,
+)
+
+
+OPERATIONS = ('encode', 'decode', 's_decode')
+
+# Each operation is timed `REPEAT` times for at least `MIN_TIME` seconds and
+# the fastest run is kept.
+REPEAT = 5
+MIN_TIME = 0.2
+
+
+def _make_operation(case: BenchmarkCase, operation: str) -> Callable[[], None]:
+    value_type = case.value_type
+    values = case.values
+    blobs = tuple(value_type.encode(value) for value in values)
+
+    for value, blob in zip(values, blobs):
+        if value_type.decode(blob) != value:
+            raise AssertionError(f"{case.name} does not round trip")
+
+    if operation == 'encode':
+        encode = value_type.encode
+
+        def run() -> None:
+            for value in values:
+                encode(value)
+    elif operation == 'decode':
+        decode = value_type.decode
+
+        def run() -> None:
+            for blob in blobs:
+                decode(blob)
+    elif operation == 's_decode':
+        s_decode = value_type.s_decode
+        stream = io.BytesIO(b''.join(blobs))
+
+        def run() -> None:
+            stream.seek(0)
+            for _ in blobs:
+                s_decode(stream)
+    else:
+        raise ValueError(f"Unknown operation: {operation}")
+    return run
+
+
+def _time(run: Callable[[], None], repeat: int, min_time: float) -> float:
+    """
+    Return the fastest time in seconds of a single call to ``run``.
+    """
+    timer = timeit.Timer(run)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure(case: BenchmarkCase,
+            operation: str,
+            repeat: int = REPEAT,
+            min_time: float = MIN_TIME) -> Dict[str, float]:
+    run = _make_operation(case, operation)
+    elapsed = _time(run, repeat, min_time)
+    num_bytes = sum(len(case.value_type.encode(value)) for value in case.values)
+    return {
+        'ops_per_sec': len(case.values) / elapsed,
+        'mb_per_sec': num_bytes / elapsed / 1e6,
+    }
+
+
+def run(cases: Sequence[BenchmarkCase],
+        operations: Sequence[str] = OPERATIONS,
+        repeat: int = REPEAT,
+        min_time: float = MIN_TIME) -> baselines.Results:
+    results: baselines.Results = {}
+    for case in cases:
+        results[case.name] = {}
+        for operation in operations:
+            metrics = measure(case, operation, repeat, min_time)
+            results[case.name][operation] = metrics
+            print(
+                f"{case.name:<16} {operation:<9} "
+                f"{metrics['ops_per_sec']:>14,.0f} ops/s {metrics['mb_per_sec']:>10.2f} MB/s",
+                flush=True,
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('cases', nargs='*', help="names of the cases to run, default all")
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--min-time', type=float, default=MIN_TIME)
+    parser.add_argument('--save', nargs='?', const=baselines.default_path('throughput'))
+    parser.add_argument('--compare', nargs='?', const=baselines.default_path('throughput'))
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    all_cases = get_cases()
+    unknown = set(args.cases) - set(all_cases)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    cases = [all_cases[name] for name in args.cases or all_cases]
+
+    results = run(cases, args.operations, args.repeat, args.min_time)
+
+    if args.save:
+        baselines.save(args.save, results)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        changes = baselines.compare(baselines.load(args.compare), results, 'ops_per_sec')
+        print()
+        regressions = baselines.report(changes, args.threshold)
+        if regressions:
+            sys.exit(f"{regressions} operations regressed by more than {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
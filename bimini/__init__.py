@@ -0,0 +1,11 @@
+from bimini.grammar import (  # noqa: F401
+    codec_for,
+    parse,
+)
+from bimini.incremental import (  # noqa: F401
+    Decoder,
+    iter_decode,
+)
+from bimini.records import (  # noqa: F401
+    record,
+)
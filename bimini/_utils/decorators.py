@@ -1,5 +1,6 @@
 import functools
 from typing import (
+    Any,
     Iterable,
     Callable,
     Tuple,
@@ -15,3 +16,19 @@ def to_tuple(fn: Callable[..., Iterable[T]]) -> Callable[..., Tuple[T, ...]]:
     def inner(*args, **kwargs) -> Tuple[T, ...]:  # type: ignore
         return tuple(fn(*args, **kwargs))
     return inner
+
+
+def curry(fn: Callable[..., T]) -> Callable[..., Any]:
+    """
+    Allow ``fn`` to be called with fewer than all of its required
+    arguments, returning a partial application of the rest.  A minimal
+    replacement for ``cytoolz.curry`` which is slow to import.
+    """
+    num_args = fn.__code__.co_argcount - len(fn.__defaults__ or ())
+
+    @functools.wraps(fn)
+    def inner(*args, **kwargs):  # type: ignore
+        if len(args) + len(kwargs) < num_args:
+            return functools.partial(inner, *args, **kwargs)
+        return fn(*args, **kwargs)
+    return inner
@@ -0,0 +1,317 @@
+"""
+Encoding and decoding of many values in parallel across worker processes.
+
+The items of a single large array are decoded in parallel by
+:func:`decode_array_parallel`, which finds the boundaries between ranges of
+items with a sequential skip over the encoding first.
+
+The encoded blobs passed to :func:`decode_many` are packed into a single
+``multiprocessing.shared_memory`` segment, preceded by a table of their
+offsets, so that workers read them in place rather than receiving each one
+pickled.  Every task carries the type and the segment it works on, so a pool
+passed in by the caller can be reused across calls to avoid starting new
+worker processes each time.
+
+``multiprocessing.shared_memory`` requires python 3.8.  On older versions
+each task is sent the packed blobs or bytes it decodes instead.
+"""
+import contextlib
+import functools
+import multiprocessing
+from multiprocessing.pool import (
+    Pool,
+)
+import os
+import traceback
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from bimini.compiler import (
+    Buffer,
+    Codec,
+)
+from bimini.decoders import (
+    decode_scalar_from,
+)
+from bimini.grammar import (
+    parse,
+)
+from bimini.types import (
+    ArrayType,
+    BaseType,
+)
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None  # type: ignore
+
+
+HAS_SHARED_MEMORY = shared_memory is not None
+
+# Size of each entry in the offsets table.
+OFFSET_SIZE = 8
+
+# Work is split into about this many tasks per worker to balance the load.
+TASKS_PER_WORKER = 4
+
+
+@contextlib.contextmanager
+def _open_buffer(source: Union[str, bytes]) -> Iterator[memoryview]:
+    """
+    Open the buffer of a task: the name of a shared memory segment or the
+    bytes themselves.
+    """
+    if isinstance(source, str):
+        shm = shared_memory.SharedMemory(name=source)
+        try:
+            with shm.buf[:] as buf:
+                yield buf
+        except BaseException as err:
+            # Views of the segment held by the frames of the traceback would
+            # prevent it from being closed.
+            traceback.clear_frames(err.__traceback__)
+            raise
+        finally:
+            shm.close()
+    else:
+        with memoryview(source) as buf:
+            yield buf
+
+
+@functools.lru_cache(maxsize=64)
+def _worker_codec(value_type: BaseType[Any]) -> Codec:
+    # Types are sent to workers pickled, which re-interns them.  The cache
+    # keeps the recent ones alive so that they are compiled only once.
+    return value_type.compile()
+
+
+def _decode_range(value_type: BaseType[Any],
+                  source: Union[str, bytes],
+                  num_blobs: int,
+                  start: int,
+                  stop: int) -> List[Any]:
+    decode = _worker_codec(value_type).decode
+    with _open_buffer(source) as buf:
+        with buf[:OFFSET_SIZE * (num_blobs + 1)].cast('Q') as offsets:
+            with buf[OFFSET_SIZE * (num_blobs + 1):] as data:
+                return [
+                    decode(data[offsets[index]:offsets[index + 1]])
+                    for index in range(start, stop)
+                ]
+
+
+def _decode_items(value_type: BaseType[Any],
+                  source: Union[str, bytes],
+                  offset: int,
+                  count: int) -> List[Any]:
+    decode_from = _worker_codec(value_type).decode_from
+    items = []
+    with _open_buffer(source) as buf:
+        for _ in range(count):
+            item, offset = decode_from(buf, offset)
+            items.append(item)
+    return items
+
+
+def _encode_values(value_type: BaseType[Any], values: Sequence[Any]) -> List[bytes]:
+    encode = _worker_codec(value_type).encode
+    return [encode(value) for value in values]
+
+
+def _get_ranges(num_items: int, num_workers: int) -> List[Tuple[int, int]]:
+    if not num_items:
+        return []
+    num_tasks = max(1, min(num_items, num_workers * TASKS_PER_WORKER))
+    task_size = -(-num_items // num_tasks)
+    return [
+        (start, min(start + task_size, num_items))
+        for start in range(0, num_items, task_size)
+    ]
+
+
+def _pack(blobs: Sequence[Buffer], buf: Union[bytearray, memoryview]) -> None:
+    offsets_size = OFFSET_SIZE * (len(blobs) + 1)
+    with memoryview(buf) as view:
+        with view[:offsets_size].cast('Q') as offsets:
+            position = 0
+            offsets[0] = 0
+            for index, blob in enumerate(blobs):
+                start = offsets_size + position
+                view[start:start + len(blob)] = blob
+                position += len(blob)
+                offsets[index + 1] = position
+
+
+def _pack_bytes(blobs: Sequence[Buffer]) -> bytes:
+    packed = bytearray(OFFSET_SIZE * (len(blobs) + 1) + sum(len(blob) for blob in blobs))
+    _pack(blobs, packed)
+    return bytes(packed)
+
+
+@contextlib.contextmanager
+def _get_pool(pool: Optional[Pool], num_workers: int) -> Iterator[Pool]:
+    if pool is not None:
+        yield pool
+    else:
+        with multiprocessing.Pool(num_workers) as new_pool:
+            yield new_pool
+
+
+@contextlib.contextmanager
+def _shared_buffer(size: int) -> Iterator[Any]:
+    """
+    Create a shared memory segment of ``size`` bytes which is removed on
+    exit.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        yield shm
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _get_type(value_type: Union[str, BaseType[Any]]) -> BaseType[Any]:
+    if isinstance(value_type, str):
+        return parse(value_type)
+    else:
+        return value_type
+
+
+def decode_many(value_type: Union[str, BaseType[Any]],
+                blobs: Iterable[Buffer],
+                workers: Optional[int] = None,
+                pool: Optional[Pool] = None) -> List[Any]:
+    """
+    Decode each of ``blobs`` as ``value_type`` using ``pool``, or a new pool
+    of ``workers`` processes which defaults to the number of CPUs.  The
+    decoded values are returned in the order of ``blobs``.
+    """
+    value_type = _get_type(value_type)
+    blobs = [memoryview(blob).cast('B') for blob in blobs]
+    num_workers = workers or os.cpu_count() or 1
+
+    if (num_workers == 1 and pool is None) or len(blobs) <= 1:
+        decode = value_type.decode
+        return [decode(blob) for blob in blobs]
+
+    ranges = _get_ranges(len(blobs), num_workers)
+    with contextlib.ExitStack() as stack:
+        if HAS_SHARED_MEMORY:
+            size = OFFSET_SIZE * (len(blobs) + 1) + sum(len(blob) for blob in blobs)
+            shm = stack.enter_context(_shared_buffer(size))
+            _pack(blobs, shm.buf)
+            tasks = [(value_type, shm.name, len(blobs), start, stop) for start, stop in ranges]
+        else:
+            tasks = [
+                (value_type, _pack_bytes(blobs[start:stop]), stop - start, 0, stop - start)
+                for start, stop in ranges
+            ]
+        results = stack.enter_context(_get_pool(pool, num_workers)).starmap(_decode_range, tasks)
+
+    return [value for result in results for value in result]
+
+
+def encode_many(value_type: Union[str, BaseType[Any]],
+                values: Iterable[Any],
+                workers: Optional[int] = None,
+                pool: Optional[Pool] = None) -> List[bytes]:
+    """
+    Encode each of ``values`` as ``value_type`` using ``pool``, or a new pool
+    of ``workers`` processes which defaults to the number of CPUs.  The
+    encodings are returned in the order of ``values``.
+    """
+    value_type = _get_type(value_type)
+    values = list(values)
+    num_workers = workers or os.cpu_count() or 1
+
+    if (num_workers == 1 and pool is None) or len(values) <= 1:
+        encode = value_type.encode
+        return [encode(value) for value in values]
+
+    with _get_pool(pool, num_workers) as active_pool:
+        results = active_pool.starmap(
+            _encode_values,
+            (
+                (value_type, values[start:stop])
+                for start, stop in _get_ranges(len(values), num_workers)
+            ),
+        )
+
+    return [encoded for result in results for encoded in result]
+
+
+def _find_item_ranges(item_type: BaseType[Any],
+                      buf: Buffer,
+                      offset: int,
+                      length: int,
+                      num_workers: int) -> List[Tuple[int, int]]:
+    """
+    Return the offset and number of items of each range of the array items
+    starting at ``offset``, skipping over the items to find the offsets.
+    """
+    ranges = []
+    item_size = item_type.fixed_size
+    skip_from = item_type.compile().skip_from
+    index = 0
+    for start, stop in _get_ranges(length, num_workers):
+        if item_size is None:
+            while index < start:
+                offset = skip_from(buf, offset)
+                index += 1
+            ranges.append((offset, stop - start))
+        else:
+            ranges.append((offset + start * item_size, stop - start))
+    return ranges
+
+
+def decode_array_parallel(array_type: Union[str, ArrayType],
+                          data: Buffer,
+                          workers: Optional[int] = None,
+                          pool: Optional[Pool] = None) -> Tuple[Any, ...]:
+    """
+    Decode the array encoded in ``data`` using ``pool``, or a new pool of
+    ``workers`` processes which defaults to the number of CPUs.
+
+    The boundaries between ranges of items are found by a sequential skip
+    over the items, after which the ranges are decoded concurrently and the
+    results joined in order.
+    """
+    if isinstance(array_type, str):
+        array_type = parse(array_type)
+    if not isinstance(array_type, ArrayType):
+        raise TypeError(f"Can only decode arrays in parallel: got {array_type}")
+
+    num_workers = workers or os.cpu_count() or 1
+    if num_workers == 1 and pool is None:
+        return array_type.decode(data)
+
+    data = memoryview(data).cast('B')
+    length, offset = decode_scalar_from(32, data, 0)
+    item_ranges = _find_item_ranges(array_type.item_type, data, offset, length, num_workers)
+
+    item_type = array_type.item_type
+    with contextlib.ExitStack() as stack:
+        if HAS_SHARED_MEMORY:
+            shm = stack.enter_context(_shared_buffer(len(data)))
+            shm.buf[:len(data)] = data
+            tasks = [(item_type, shm.name, start, count) for start, count in item_ranges]
+        else:
+            # Each task is sent the bytes of its items.
+            ends = [start for start, _ in item_ranges[1:]] + [len(data)]
+            tasks = [
+                (item_type, bytes(data[start:end]), 0, count)
+                for (start, count), end in zip(item_ranges, ends)
+            ]
+        results = stack.enter_context(_get_pool(pool, num_workers)).starmap(_decode_items, tasks)
+
+    return tuple(item for result in results for item in result)
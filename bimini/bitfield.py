@@ -0,0 +1,164 @@
+"""
+Compact sequences of bits as encoded by the ``bitfield`` type.
+
+A :class:`Bitfield` holds its bits packed eight to a byte, least significant
+bit first, exactly as they appear on the wire, so decoding one copies the
+encoded bytes rather than building a python object per bit.
+"""
+import collections.abc
+import itertools
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from bimini.exceptions import (
+    EncodingError,
+)
+from bimini.vectorized import (
+    is_ndarray,
+    pack_bit_array,
+    require_numpy,
+    unpack_bit_array,
+)
+
+if TYPE_CHECKING:
+    from numpy import ndarray  # noqa: F401
+
+
+# The bits of every byte value, least significant first.
+_BYTE_BITS = tuple(
+    tuple(bool(byte >> shift & 1) for shift in range(8))
+    for byte in range(256)
+)
+
+# Maps the bytes 0 and 1 onto the binary digits and every other byte onto a
+# character which `int` rejects.
+_BINARY_DIGITS = b'01' + b'x' * 254
+
+
+def _num_bytes(length: int) -> int:
+    return (length + 7) >> 3
+
+
+def pack_bits(bits: Union[Sequence[Any], 'ndarray']) -> bytes:
+    """
+    Pack ``bits`` eight to a byte, least significant bit first.  Each bit
+    must be a ``bool`` or the integer ``0`` or ``1``.
+    """
+    if isinstance(bits, Bitfield):
+        return bits._data
+    elif is_ndarray(bits):
+        return pack_bit_array(bits)
+
+    # The bits are packed by reading them as the binary digits of an integer
+    # with the first bit last.
+    try:
+        digits = bytes(bits)[::-1].translate(_BINARY_DIGITS)
+    except (TypeError, ValueError):
+        raise EncodingError(f"Invalid bit values: {bits!r}")
+    if not digits:
+        return b''
+    try:
+        value = int(digits, 2)
+    except ValueError:
+        raise EncodingError(f"Invalid bit values: {bits!r}")
+    return value.to_bytes(_num_bytes(len(digits)), 'little')
+
+
+class Bitfield(collections.abc.Sequence):
+    """
+    An immutable sequence of ``length`` bits packed into ``data``.  Bitfields
+    compare equal to any sequence of the same bits, such as a tuple of
+    ``bool``.
+    """
+    __slots__ = ('_data', '_length')
+
+    _data: bytes
+    _length: int
+
+    def __init__(self, data: bytes, length: int) -> None:
+        if len(data) != _num_bytes(length):
+            raise ValueError(f"{length} bits are packed into {_num_bytes(length)} bytes")
+        elif length & 7 and data[-1] >> (length & 7):
+            raise ValueError("Padding bits must not be set")
+        self._data = bytes(data)
+        self._length = length
+
+    @classmethod
+    def from_bits(cls, bits: Iterable[Any]) -> 'Bitfield':
+        if not isinstance(bits, collections.abc.Sized):
+            bits = tuple(bits)
+        return cls(pack_bits(bits), len(bits))  # type: ignore
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self._data, self._length))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:  # type: ignore
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return type(self).from_bits(tuple(self)[index])
+            length = max(stop - start, 0)
+            value = int.from_bytes(self._data, 'little') >> start & ((1 << length) - 1)
+            return type(self)(value.to_bytes(_num_bytes(length), 'little'), length)
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"Index out of range: {index}")
+        return bool(self._data[index >> 3] >> (index & 7) & 1)
+
+    def __iter__(self) -> Iterator[bool]:
+        bits = itertools.chain.from_iterable(map(_BYTE_BITS.__getitem__, self._data))
+        return itertools.islice(bits, self._length)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Bitfield):
+            return self._length == other._length and self._data == other._data
+        elif isinstance(other, collections.abc.Sequence) and not isinstance(other, str):
+            return len(other) == self._length and all(
+                bit == other_bit for bit, other_bit in zip(self, other)
+            )
+        else:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        # Consistent with the tuple of the same bits which compares equal.
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"<Bitfield {''.join('1' if bit else '0' for bit in self)}>"
+
+    def __bytes__(self) -> bytes:
+        return self._data
+
+    def count(self, value: Any) -> int:
+        num_set = bin(int.from_bytes(self._data, 'little')).count('1')
+        if value == 1:
+            return num_set
+        elif value == 0:
+            return self._length - num_set
+        else:
+            return 0
+
+    def to_bytes(self) -> bytes:
+        """
+        Return the bits packed eight to a byte, least significant bit first.
+        """
+        return self._data
+
+    def to_ndarray(self) -> 'ndarray':
+        """
+        Return the bits as a numpy array of ``bool``.
+        """
+        require_numpy()
+        return unpack_bit_array(self._data, self._length)
@@ -0,0 +1,683 @@
+"""
+Generation of specialized encoder and decoder functions for types.
+
+Each type contributes python source to a :class:`CodeBuilder` through its
+``_emit_encode`` and ``_emit_decode`` methods.  Composite types inline the
+source of their children so that a whole type tree is compiled into one flat
+function without any per-element dispatch.
+"""
+import contextlib
+import itertools
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from bimini.exceptions import (
+    DecodingError,
+    EncodingError,
+    ParseError,
+)
+
+if TYPE_CHECKING:
+    import asyncio  # noqa: F401
+    from bimini.types import BaseType  # noqa: F401
+
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+# Python refuses to compile more than 20 statically nested blocks.  Children
+# of composite types nested deeper than this are called rather than inlined.
+MAX_INLINE_DEPTH = 12
+
+ENCODE = 'encode'
+ENCODE_INTO = 'encode_into'
+S_ENCODE = 's_encode'
+READ = 'read'
+ASYNC_READ = 'async_read'
+FEED = 'feed'
+DECODE_FROM = 'decode_from'
+SKIP_FROM = 'skip_from'
+S_SKIP = 's_skip'
+
+# Skipped runs of at least this many bytes are discarded from streams rather
+# than buffered, in chunks of `DISCARD_CHUNK_SIZE`.
+DISCARD_THRESHOLD = 512
+DISCARD_CHUNK_SIZE = 65536
+
+_DISCARD_SCRATCH = memoryview(bytearray(DISCARD_CHUNK_SIZE))
+
+# Reads from streams larger than this are made in chunks of this size.
+READ_CHUNK_SIZE = 65536
+
+# Encodings are written to streams in chunks of about this many bytes.
+# Individual writes at least this large bypass the buffer.
+FLUSH_SIZE = 65536
+
+
+def _read_exact(stream: IO[bytes], num_bytes: int) -> Buffer:
+    if num_bytes <= READ_CHUNK_SIZE:
+        data = stream.read(num_bytes)
+    else:
+        # Large reads are usually sized by a length prefix from the stream
+        # itself, so they are made in chunks: a bogus length then only costs
+        # memory for the bytes which actually arrive.
+        data = bytearray()
+        while len(data) < num_bytes:
+            chunk = stream.read(min(num_bytes - len(data), READ_CHUNK_SIZE))
+            if not chunk:
+                break
+            data += chunk
+    if len(data) != num_bytes:
+        raise ParseError(f"Insufficient bytes in stream: needed {num_bytes},  got {len(data)}")
+    return data
+
+
+async def _read_exactly(reader: 'asyncio.StreamReader', num_bytes: int) -> bytes:
+    # asyncio is slow to import and only needed by callers which already use it.
+    import asyncio
+
+    try:
+        return await reader.readexactly(num_bytes)
+    except asyncio.IncompleteReadError as err:
+        raise ParseError(
+            f"Insufficient bytes in stream: needed {num_bytes}, got {len(err.partial)}"
+        ) from err
+
+
+def _discard_exact(stream: IO[bytes], num_bytes: int) -> None:
+    readinto = getattr(stream, 'readinto', None)
+    remaining = num_bytes
+    while remaining:
+        chunk_size = min(remaining, DISCARD_CHUNK_SIZE)
+        if readinto is None:
+            num_read = len(stream.read(chunk_size))
+        else:
+            # The contents of the scratch buffer are never read so it is
+            # safely shared between calls.
+            num_read = readinto(_DISCARD_SCRATCH[:chunk_size])
+        if not num_read:
+            raise ParseError(
+                f"Insufficient bytes in stream: needed {num_bytes}, "
+                f"got {num_bytes - remaining}"
+            )
+        remaining -= num_read
+
+
+def _group(expr: str) -> str:
+    """
+    Parenthesize ``expr`` unless it is a name or a literal, so that it can
+    be pasted into a larger expression.
+    """
+    if expr.isidentifier() or expr.isdigit():
+        return expr
+    return f'({expr})'
+
+
+def _grow(buf: Union[bytearray, memoryview], size: int) -> int:
+    if isinstance(buf, bytearray):
+        buf.extend(bytes(size - len(buf)))
+        return size
+    else:
+        raise EncodingError(f"Insufficient space in buffer: needed {size}, got {len(buf)}")
+
+
+class Codec:
+    """
+    The compiled encoder and decoder for a single type.
+    """
+    def __init__(self,
+                 write: Callable[[bytearray, Any], None],
+                 write_into: Callable[[Union[bytearray, memoryview], int, Any], int],
+                 s_write: Callable[[IO[bytes], bytearray, Any], None],
+                 read: Callable[[IO[bytes], bytearray, int], Tuple[Any, int]],
+                 decode_from: Callable[[Buffer, int], Tuple[Any, int]],
+                 skip_from: Callable[[Buffer, int], int],
+                 s_skip: Callable[[IO[bytes], bytearray, int], Tuple[int, int]],
+                 async_read: Callable[
+                     ['asyncio.StreamReader', bytearray, int],
+                     Awaitable[Tuple[Any, int]],
+                 ],
+                 feed: Callable[[bytearray, int], Generator[None, None, Tuple[Any, int]]]) -> None:
+        self.write = write
+        self.write_into = write_into
+        self._s_write = s_write
+        self.read = read
+        self.decode_from = decode_from
+        self.skip_from = skip_from
+        self._s_skip = s_skip
+        self._async_read = async_read
+        self._feed = feed
+
+    def encode(self, value: Any) -> bytes:
+        out = bytearray()
+        self.write(out, value)
+        return bytes(out)
+
+    def encode_into(self, buf: Union[bytearray, memoryview], offset: int, value: Any) -> int:
+        return self.write_into(buf, offset, value)
+
+    def s_encode(self, stream: IO[bytes], value: Any) -> None:
+        out = bytearray()
+        self._s_write(stream, out, value)
+        if out:
+            stream.write(out)
+
+    def decode(self, data: Buffer) -> Any:
+        value, _ = self.decode_from(data, 0)
+        return value
+
+    def s_decode(self, stream: IO[bytes]) -> Any:
+        value, _ = self.read(stream, bytearray(), 0)
+        return value
+
+    def s_skip(self, stream: IO[bytes]) -> int:
+        pos, discarded = self._s_skip(stream, bytearray(), 0)
+        return pos + discarded
+
+    async def async_decode(self, reader: 'asyncio.StreamReader') -> Any:
+        value, _ = await self._async_read(reader, bytearray(), 0)
+        return value
+
+    async def async_encode(self, writer: 'asyncio.StreamWriter', value: Any) -> None:
+        out = bytearray()
+        self.write(out, value)
+        data = memoryview(out)
+        for start in range(0, len(data), FLUSH_SIZE):
+            writer.write(data[start:start + FLUSH_SIZE])
+            await writer.drain()
+
+
+class CodeBuilder:
+    """
+    Accumulates the source of a single generated function.
+
+    The ``mode`` determines the calling convention of the generated function:
+
+    - ``encode``: ``(out, v0) -> None`` appending the encoding of ``v0`` to
+      the ``bytearray`` named ``out``.
+    - ``encode_into``: ``(buf, pos, v0) -> pos`` writing the encoding of
+      ``v0`` into the buffer named ``buf`` at index ``pos``.  A ``bytearray``
+      is extended as needed.
+    - ``s_encode``: ``(stream, out, v0) -> None`` like ``encode`` but writing
+      the contents of ``out`` to ``stream`` whenever it grows large.
+    - ``read``: ``(stream, buf, pos) -> (value, pos)`` decoding from the
+      ``bytearray`` named ``buf`` at index ``pos``, extending it with bytes
+      read from ``stream`` as needed.
+    - ``decode_from``: ``(buf, pos) -> (value, pos)`` decoding from the
+      buffer named ``buf`` at index ``pos``.
+    - ``async_read``: ``async (stream, buf, pos) -> (value, pos)`` like
+      ``read`` but awaiting bytes from the ``asyncio.StreamReader`` named
+      ``stream``.
+    - ``feed``: ``(buf, pos) -> (value, pos)`` as a generator which yields
+      whenever it needs more bytes than ``buf`` holds, expecting ``buf`` to
+      have been extended before it is resumed.  The decoded value is the
+      result of the generator.
+    - ``skip_from``: ``(buf, pos) -> pos`` validating the framing of the
+      value in ``buf`` at index ``pos`` without decoding it.
+    - ``s_skip``: ``(stream, buf, pos) -> (pos, discarded)`` like ``read``
+      but without decoding the value.  Bytes which are skipped over in bulk
+      are discarded from the stream rather than buffered and counted in
+      ``discarded``.
+    """
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = {
+            'DecodingError': DecodingError,
+            'EncodingError': EncodingError,
+            'ParseError': ParseError,
+            'from_bytes': int.from_bytes,
+            'read_exact': _read_exact,
+            'read_exactly': _read_exactly,
+            'discard_exact': _discard_exact,
+            'grow': _grow,
+        }
+        self.depth = 0
+        # Set while emitting a value of fixed size whose bytes have all been
+        # checked to be present in ``buf`` up front.
+        self._prechecked = False
+        self._indent = 1
+        self._counter = itertools.count()
+
+    #
+    # Source accumulation
+    #
+    def new_var(self, prefix: str = 'v') -> str:
+        return f'{prefix}{next(self._counter)}'
+
+    def add_const(self, value: Any, prefix: str = 'c') -> str:
+        name = self.new_var(f'_{prefix}')
+        self.namespace[name] = value
+        return name
+
+    def emit(self, line: str) -> None:
+        self.lines.append('    ' * self._indent + line)
+
+    @contextlib.contextmanager
+    def block(self, header: str) -> Iterator[None]:
+        self.emit(header)
+        self._indent += 1
+        num_lines = len(self.lines)
+        try:
+            yield
+            # Types with nothing to encode or decode, such as `{}`, emit no
+            # statements.
+            if len(self.lines) == num_lines:
+                self.emit('pass')
+        finally:
+            self._indent -= 1
+
+    @contextlib.contextmanager
+    def loop(self, header: str) -> Iterator[None]:
+        self.depth += 1
+        try:
+            with self.block(header):
+                yield
+        finally:
+            self.depth -= 1
+
+    #
+    # Encoding primitives
+    #
+    def write(self, expr: str, num_bytes: Optional[int] = None) -> None:
+        """
+        Write the bytes ``expr`` evaluates to, which are known to be
+        ``num_bytes`` long if given.
+        """
+        if self.mode == ENCODE_INTO:
+            if num_bytes is None:
+                data = self.new_var('t')
+                self.emit(f'{data} = {expr}')
+                self.require(f'len({data})')
+                self.emit(f'buf[pos:pos + len({data})] = {data}')
+                self.emit(f'pos += len({data})')
+            else:
+                self.require(str(num_bytes))
+                self.emit(f'buf[pos:pos + {num_bytes}] = {expr}')
+                self.emit(f'pos += {num_bytes}')
+        elif self.mode == S_ENCODE and (num_bytes is None or num_bytes >= FLUSH_SIZE):
+            data = self.new_var('t')
+            self.emit(f'{data} = {expr}')
+            with self.block(f'if len({data}) >= {FLUSH_SIZE}:'):
+                with self.block('if out:'):
+                    self.emit('stream.write(out)')
+                    self.emit('del out[:]')
+                self.emit(f'stream.write({data})')
+            with self.block('else:'):
+                self.emit(f'out += {data}')
+        else:
+            self.emit(f'out += {expr}')
+
+    def write_byte(self, expr: str) -> None:
+        if self.mode == ENCODE_INTO:
+            self.require('1')
+            self.emit(f'buf[pos] = {expr}')
+            self.emit('pos += 1')
+        else:
+            self.emit(f'out.append({expr})')
+
+    def flush(self) -> None:
+        """
+        Write out the buffered encoding if it has grown large when encoding
+        to a stream.
+        """
+        if self.mode == S_ENCODE:
+            with self.block(f'if len(out) >= {FLUSH_SIZE}:'):
+                self.emit('stream.write(out)')
+                self.emit('del out[:]')
+
+    def write_leb128(self, value: str, bit_size: Optional[int] = None) -> None:
+        tmp = self.new_var('t')
+        self.emit(f'{tmp} = {value}')
+        with self.block(f'if 0 <= {tmp} < 128:'):
+            self.write_byte(tmp)
+        with self.block(f'elif {tmp} < 0:'):
+            self.emit(f'raise EncodingError(f"Cannot encode negative integer: {{{tmp}}}")')
+        if bit_size is not None:
+            with self.block(f'elif {tmp} >> {bit_size}:'):
+                self.emit(
+                    f'raise EncodingError(f"Integer {{{tmp}}} exceeds maximum bit size: '
+                    f'{bit_size}")'
+                )
+        with self.block('else:'):
+            with self.loop(f'while {tmp} >= 128:'):
+                self.write_byte(f'({tmp} & 127) | 128')
+                self.emit(f'{tmp} >>= 7')
+            self.write_byte(tmp)
+
+    def emit_encode(self, type_: 'BaseType[Any]', value: str) -> None:
+        if self.depth < MAX_INLINE_DEPTH:
+            if self.mode == ENCODE_INTO:
+                with self._checked_size(type_):
+                    type_._emit_encode(self, value)
+            else:
+                type_._emit_encode(self, value)
+        elif self.mode == ENCODE_INTO:
+            write_into = self.add_const(type_.compile().write_into, 'write_into')
+            self.emit(f'pos = {write_into}(buf, pos, {value})')
+            self.emit('n = len(buf)')
+        elif self.mode == S_ENCODE:
+            s_write = self.add_const(type_.compile()._s_write, 's_write')
+            self.emit(f'{s_write}(stream, out, {value})')
+        else:
+            write = self.add_const(type_.compile().write, 'write')
+            self.emit(f'{write}(out, {value})')
+
+    #
+    # Decoding primitives
+    #
+    @property
+    def in_memory(self) -> bool:
+        """
+        Whether the complete encoded value is available in ``buf``.
+        """
+        return self.mode in (DECODE_FROM, SKIP_FROM)
+
+    @property
+    def streaming(self) -> bool:
+        """
+        Whether bytes are pulled from ``stream`` into ``buf`` on demand.
+        """
+        return self.mode in (READ, ASYNC_READ, S_SKIP)
+
+    @property
+    def error(self) -> str:
+        if self.in_memory:
+            return 'DecodingError'
+        else:
+            return 'ParseError'
+
+    def require(self, num_bytes: str) -> None:
+        """
+        Ensure that at least ``num_bytes`` are available in ``buf`` past
+        ``pos``.
+        """
+        if self._prechecked:
+            return
+        num_bytes = _group(num_bytes)
+        if self.mode == FEED:
+            with self.block(f'while pos + {num_bytes} > n:'):
+                self.emit('yield')
+                self.emit('n = len(buf)')
+            return
+        with self.block(f'if pos + {num_bytes} > n:'):
+            if self.mode == ENCODE_INTO:
+                self.emit(f'n = grow(buf, pos + {num_bytes})')
+            elif self.mode == ASYNC_READ:
+                self.emit(f'buf += await read_exactly(stream, pos + {num_bytes} - n)')
+                self.emit('n = len(buf)')
+            elif self.streaming:
+                self.emit(f'buf += read_exact(stream, pos + {num_bytes} - n)')
+                self.emit('n = len(buf)')
+            else:
+                self.emit(
+                    f'raise DecodingError(f"Insufficient bytes: needed {{{num_bytes}}} at '
+                    f'offset {{pos}}, got {{n - pos}}")'
+                )
+
+    def read_leb128(self, bit_size: int, target: str) -> None:
+        max_shift = 7 * ((bit_size + 6) // 7)
+        byte = self.new_var('b')
+        shift = self.new_var('s')
+        self.require('1')
+        self.emit(f'{target} = buf[pos]')
+        self.emit('pos += 1')
+        with self.block(f'if {target} & 128:'):
+            self.emit(f'{target} &= 127')
+            self.emit(f'{shift} = 7')
+            with self.loop('while True:'):
+                with self.block(f'if {shift} >= {max_shift}:'):
+                    self.emit(
+                        f'raise {self.error}("Parsed integer exceeds maximum bit size: {bit_size}")'
+                    )
+                self.require('1')
+                self.emit(f'{byte} = buf[pos]')
+                self.emit('pos += 1')
+                self.emit(f'{target} |= ({byte} & 127) << {shift}')
+                with self.block(f'if not {byte} & 128:'):
+                    self.emit('break')
+                self.emit(f'{shift} += 7')
+            if max_shift > bit_size:
+                with self.block(f'if {target} >> {bit_size}:'):
+                    self.emit(
+                        f'raise {self.error}("Parsed integer exceeds maximum bit size: {bit_size}")'
+                    )
+
+    def advance(self, num_bytes: str) -> None:
+        """
+        Move ``pos`` past the next ``num_bytes`` without inspecting them.
+        """
+        is_small = num_bytes.isdigit() and int(num_bytes) < DISCARD_THRESHOLD
+        num_bytes = _group(num_bytes)
+        if self._prechecked:
+            self.emit(f'pos += {num_bytes}')
+        elif self.mode == S_SKIP and not is_small:
+            with self.block(f'if pos + {num_bytes} > n:'):
+                with self.block(f'if {num_bytes} >= {DISCARD_THRESHOLD}:'):
+                    self.emit(f'discarded += pos + {num_bytes} - n')
+                    self.emit(f'discard_exact(stream, pos + {num_bytes} - n)')
+                    self.emit('pos = n')
+                with self.block('else:'):
+                    self.emit(f'buf += read_exact(stream, pos + {num_bytes} - n)')
+                    self.emit('n = len(buf)')
+                    self.emit(f'pos += {num_bytes}')
+            with self.block('else:'):
+                self.emit(f'pos += {num_bytes}')
+        else:
+            self.require(num_bytes)
+            self.emit(f'pos += {num_bytes}')
+
+    def skip_leb128(self, bit_size: int) -> None:
+        limit = self.new_var('m')
+        self.emit(f'{limit} = pos + {(bit_size + 6) // 7}')
+        with self.loop('while True:'):
+            self.require('1')
+            self.emit('pos += 1')
+            with self.block('if not buf[pos - 1] & 128:'):
+                self.emit('break')
+            with self.block(f'if pos >= {limit}:'):
+                self.emit(
+                    f'raise {self.error}("Parsed integer exceeds maximum bit size: {bit_size}")'
+                )
+
+    def emit_skip(self, type_: 'BaseType[Any]') -> None:
+        if self.depth < MAX_INLINE_DEPTH:
+            type_._emit_skip(self)
+        elif self.mode == S_SKIP:
+            s_skip = self.add_const(type_.compile()._s_skip, 's_skip')
+            discarded = self.new_var('d')
+            self.emit(f'pos, {discarded} = {s_skip}(stream, buf, pos)')
+            self.emit(f'discarded += {discarded}')
+            self.emit('n = len(buf)')
+        else:
+            skip_from = self.add_const(type_.compile().skip_from, 'skip_from')
+            self.emit(f'pos = {skip_from}(buf, pos)')
+
+    def emit_decode(self, type_: 'BaseType[Any]', target: str) -> None:
+        if self.depth < MAX_INLINE_DEPTH:
+            with self._checked_size(type_):
+                type_._emit_decode(self, target)
+        elif self.mode == READ:
+            read = self.add_const(type_.compile().read, 'read')
+            self.emit(f'{target}, pos = {read}(stream, buf, pos)')
+            self.emit('n = len(buf)')
+        elif self.mode == ASYNC_READ:
+            async_read = self.add_const(type_.compile()._async_read, 'async_read')
+            self.emit(f'{target}, pos = await {async_read}(stream, buf, pos)')
+            self.emit('n = len(buf)')
+        elif self.mode == FEED:
+            feed = self.add_const(type_.compile()._feed, 'feed')
+            self.emit(f'{target}, pos = yield from {feed}(buf, pos)')
+            self.emit('n = len(buf)')
+        else:
+            decode_from = self.add_const(type_.compile().decode_from, 'decode_from')
+            self.emit(f'{target}, pos = {decode_from}(buf, pos)')
+
+    @contextlib.contextmanager
+    def checked(self, num_bytes: str) -> Iterator[None]:
+        """
+        Require ``num_bytes`` up front for source emitted within the context,
+        which must not consume more than that, and omit any checks within it.
+        """
+        if self._prechecked:
+            yield
+            return
+
+        self.require(num_bytes)
+        self._prechecked = True
+        try:
+            yield
+        finally:
+            self._prechecked = False
+
+    @contextlib.contextmanager
+    def checked_items(self, length: str, item_size: Optional[int]) -> Iterator[None]:
+        """
+        Check up front for all of ``length`` items when they have a fixed
+        size, which for streams reads them at once.  Large reads are made in
+        chunks, so a bogus length does not allocate a huge read buffer.
+        """
+        if item_size:
+            with self.checked(f'{length} * {item_size}'):
+                yield
+        else:
+            yield
+
+    @contextlib.contextmanager
+    def _checked_size(self, type_: 'BaseType[Any]') -> Iterator[None]:
+        """
+        Check up front for the bytes which any encoding of ``type_`` occupies.
+        A value of fixed size is then handled without further checks, which
+        for streams means that it is read with a single call to ``read``.
+        """
+        if self._prechecked:
+            yield
+            return
+
+        fixed_size = type_.fixed_size
+        if fixed_size:
+            with self.checked(str(fixed_size)):
+                yield
+        else:
+            if type_.min_size > 1:
+                self.require(str(type_.min_size))
+            yield
+
+    #
+    # Compilation
+    #
+    def build(self, name: str, filename: str) -> Callable[..., Any]:
+        if self.mode == ENCODE:
+            header = f'def {name}(out, v0):'
+            footer: List[str] = []
+        elif self.mode == ENCODE_INTO:
+            header = f'def {name}(buf, pos, v0):'
+            self.lines[:0] = [
+                '    if type(buf) is memoryview:',
+                "        buf = buf.cast('B')",
+                '    n = len(buf)',
+            ]
+            footer = ['    return pos']
+        elif self.mode == S_ENCODE:
+            header = f'def {name}(stream, out, v0):'
+            footer = []
+        elif self.mode == READ:
+            header = f'def {name}(stream, buf, pos):'
+            self.lines.insert(0, '    n = len(buf)')
+            footer = ['    return v0, pos']
+        elif self.mode == ASYNC_READ:
+            header = f'async def {name}(stream, buf, pos):'
+            self.lines.insert(0, '    n = len(buf)')
+            footer = ['    return v0, pos']
+        elif self.mode == FEED:
+            header = f'def {name}(buf, pos):'
+            self.lines.insert(0, '    n = len(buf)')
+            # The unreachable `yield` makes this a generator even for types
+            # which never need to wait for bytes.
+            footer = ['    return v0, pos', '    yield']
+        elif self.mode in (DECODE_FROM, SKIP_FROM):
+            header = f'def {name}(buf, pos):'
+            self.lines[:0] = [
+                '    if type(buf) is memoryview:',
+                "        buf = buf.cast('B')",
+                '    n = len(buf)',
+            ]
+            if self.mode == DECODE_FROM:
+                footer = ['    return v0, pos']
+            else:
+                footer = ['    return pos']
+        elif self.mode == S_SKIP:
+            header = f'def {name}(stream, buf, pos):'
+            self.lines[:0] = ['    n = len(buf)', '    discarded = 0']
+            footer = ['    return pos, discarded']
+        else:
+            raise Exception("Unreachable")
+
+        source = '\n'.join([header] + self.lines + footer) + '\n'
+        namespace = dict(self.namespace)
+        exec(compile(source, filename, 'exec'), namespace)
+        fn = namespace[name]
+        fn.__source__ = source
+        return fn
+
+
+def compile_codec(type_: 'BaseType[Any]') -> Codec:
+    filename = f'<bimini {type_}>'
+
+    encoder = CodeBuilder(ENCODE)
+    next(encoder._counter)  # `v0` is the argument of the generated function
+    type_._emit_encode(encoder, 'v0')
+
+    into_encoder = CodeBuilder(ENCODE_INTO)
+    next(into_encoder._counter)  # `v0` is the argument of the generated function
+    into_encoder.emit_encode(type_, 'v0')
+
+    stream_encoder = CodeBuilder(S_ENCODE)
+    next(stream_encoder._counter)  # `v0` is the argument of the generated function
+    type_._emit_encode(stream_encoder, 'v0')
+
+    reader = CodeBuilder(READ)
+    next(reader._counter)  # `v0` is the return value of the generated function
+    reader.emit_decode(type_, 'v0')
+
+    async_reader = CodeBuilder(ASYNC_READ)
+    next(async_reader._counter)  # `v0` is the return value of the generated function
+    async_reader.emit_decode(type_, 'v0')
+
+    feeder = CodeBuilder(FEED)
+    next(feeder._counter)  # `v0` is the return value of the generated function
+    feeder.emit_decode(type_, 'v0')
+
+    decoder = CodeBuilder(DECODE_FROM)
+    next(decoder._counter)  # `v0` is the return value of the generated function
+    decoder.emit_decode(type_, 'v0')
+
+    skipper = CodeBuilder(SKIP_FROM)
+    type_._emit_skip(skipper)
+
+    stream_skipper = CodeBuilder(S_SKIP)
+    type_._emit_skip(stream_skipper)
+
+    return Codec(
+        write=encoder.build('write', filename),
+        write_into=into_encoder.build('write_into', filename),
+        s_write=stream_encoder.build('s_write', filename),
+        read=reader.build('read', filename),
+        decode_from=decoder.build('decode_from', filename),
+        skip_from=skipper.build('skip_from', filename),
+        s_skip=stream_skipper.build('s_skip', filename),
+        async_read=async_reader.build('async_read', filename),
+        feed=feeder.build('feed', filename),
+    )
@@ -0,0 +1,393 @@
+"""
+Deterministic generation of random values of any type, for benchmarking and
+testing without fixture data.
+
+A :class:`CorpusGenerator` draws values for a type from a seeded random
+number generator.  The lengths of ``bytes`` values and arrays and the
+magnitude of ``scalar`` values are drawn from configurable distributions,
+and the values of individual elements can be overridden by their path in
+the type, a tuple of container element indices with :data:`ITEM` standing
+for the items of an array or tuple.  The lengths of the ``bytes`` values
+or arrays at a path can be overridden in the same way.
+
+:data:`PRESETS` mirror the shapes of Ethereum headers, transactions, blocks,
+receipts, accounts, trie nodes and discovery messages::
+
+    >>> from bimini.corpus import preset
+    >>> headers = preset('header', seed=1).samples(1000)
+"""
+import math
+import random
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from bimini.bitfield import Bitfield
+from bimini.grammar import parse
+from bimini.types import (
+    ArrayType,
+    BaseBit,
+    BaseType,
+    BitfieldType,
+    ByteType,
+    BytesType,
+    ContainerType,
+    FixedBytesType,
+    OptionalType,
+    RecordType,
+    ScalarType,
+    TupleType,
+    UnsignedIntegerType,
+)
+
+
+# A function drawing a value from a random number generator.
+Sampler = Callable[[random.Random], Any]
+
+# Path component standing for every item of an array or tuple.
+ITEM = '*'
+
+Path = Tuple[Union[int, str], ...]
+
+# Attempts at drawing a non-empty value for an optional which is present.
+_MAX_PRESENT_ATTEMPTS = 100
+
+
+#
+# Distributions
+#
+def constant(value: int) -> Sampler:
+    return lambda rng: value
+
+
+def uniform(low: int, high: int) -> Sampler:
+    """
+    Draw integers between ``low`` and ``high`` inclusive with equal
+    probability.
+    """
+    return lambda rng: rng.randint(low, high)
+
+
+def log_uniform(low: int, high: int) -> Sampler:
+    """
+    Draw integers between ``low`` and ``high`` inclusive whose logarithm is
+    uniformly distributed, favouring small values.
+    """
+    log_low, log_high = math.log(low + 1), math.log(high + 1)
+    return lambda rng: min(high, int(math.exp(rng.uniform(log_low, log_high))) - 1)
+
+
+def choice(values: Sequence[Any], weights: Optional[Sequence[float]] = None) -> Sampler:
+    """
+    Draw one of ``values``, optionally with relative ``weights``.
+    """
+    if weights is None:
+        return lambda rng: rng.choice(values)
+    else:
+        return lambda rng: rng.choices(values, weights)[0]
+
+
+#
+# Values
+#
+def random_bytes(length: Union[int, Sampler]) -> Sampler:
+    """
+    Draw random byte strings of ``length``, a fixed length or a distribution.
+    """
+    if isinstance(length, int):
+        length = constant(length)
+    sample_length = length
+
+    def sample(rng: random.Random) -> bytes:
+        num_bytes = sample_length(rng)
+        return rng.getrandbits(8 * num_bytes).to_bytes(num_bytes, 'little') if num_bytes else b''
+    return sample
+
+
+def random_bitfield(length: Union[int, Sampler]) -> Sampler:
+    """
+    Draw random bitfields of ``length`` bits, a fixed length or a
+    distribution.
+    """
+    if isinstance(length, int):
+        length = constant(length)
+    sample_length = length
+
+    def sample(rng: random.Random) -> Bitfield:
+        num_bits = sample_length(rng)
+        value = rng.getrandbits(num_bits) if num_bits else 0
+        return Bitfield(value.to_bytes((num_bits + 7) // 8, 'little'), num_bits)
+    return sample
+
+
+def random_integer(bits: Sampler, bit_size: Optional[int] = None) -> Sampler:
+    """
+    Draw integers of up to ``bits`` significant bits, capped at
+    ``bit_size``.
+    """
+    def sample(rng: random.Random) -> int:
+        num_bits = bits(rng)
+        if bit_size is not None:
+            num_bits = min(num_bits, bit_size)
+        return rng.getrandbits(num_bits) if num_bits > 0 else 0
+    return sample
+
+
+class CorpusGenerator:
+    """
+    Generate random values of ``value_type`` deterministically from
+    ``seed``.
+
+    - ``bytes_length``: distribution of the length of ``bytes`` values.
+    - ``array_length``: distribution of the length of arrays and
+      bitfields.
+    - ``scalar_bits``: distribution of the number of significant bits of
+      ``scalar`` values, capped at their bit size.  ``uint`` values are
+      drawn uniformly from their full range.
+    - ``optional_rate``: probability that an optional value is present.
+    - ``lengths``: distributions used instead for the lengths of the
+      ``bytes`` values, arrays or bitfields at the given paths.
+    - ``overrides``: samplers used instead for the values at the given
+      paths.
+    """
+    def __init__(self,
+                 value_type: Union[str, BaseType[Any]],
+                 seed: int = 0,
+                 bytes_length: Sampler = log_uniform(0, 1024),
+                 array_length: Sampler = log_uniform(0, 64),
+                 scalar_bits: Sampler = uniform(0, 64),
+                 optional_rate: float = 0.5,
+                 lengths: Optional[Mapping[Path, Sampler]] = None,
+                 overrides: Optional[Mapping[Path, Sampler]] = None) -> None:
+        if isinstance(value_type, str):
+            value_type = parse(value_type)
+        self.value_type = value_type
+        self.bytes_length = bytes_length
+        self.array_length = array_length
+        self.scalar_bits = scalar_bits
+        self.optional_rate = optional_rate
+        self.lengths: Dict[Path, Sampler] = dict(lengths or {})
+        self.overrides: Dict[Path, Sampler] = dict(overrides or {})
+        self.rng = random.Random(seed)
+        self._sample = self._build(value_type, ())
+
+    def sample(self) -> Any:
+        return self._sample(self.rng)
+
+    def samples(self, count: int) -> Tuple[Any, ...]:
+        sample, rng = self._sample, self.rng
+        return tuple(sample(rng) for _ in range(count))
+
+    def __iter__(self) -> Iterator[Any]:
+        sample, rng = self._sample, self.rng
+        while True:
+            yield sample(rng)
+
+    def _build(self, value_type: BaseType[Any], path: Path) -> Sampler:
+        if path in self.overrides:
+            return self.overrides[path]
+        elif isinstance(value_type, BaseBit):
+            return lambda rng: rng.random() < 0.5
+        elif isinstance(value_type, ByteType):
+            return random_bytes(1)
+        elif isinstance(value_type, UnsignedIntegerType):
+            bit_size = value_type.bit_size
+            return lambda rng: rng.getrandbits(bit_size)
+        elif isinstance(value_type, ScalarType):
+            return random_integer(self.scalar_bits, value_type.bit_size)
+        elif isinstance(value_type, BytesType):
+            return random_bytes(self.lengths.get(path, self.bytes_length))
+        elif isinstance(value_type, FixedBytesType):
+            return random_bytes(value_type.length)
+        elif isinstance(value_type, BitfieldType):
+            return random_bitfield(self.lengths.get(path, self.array_length))
+        elif isinstance(value_type, OptionalType):
+            return self._build_optional(value_type, path)
+        elif isinstance(value_type, ContainerType):
+            element_samplers = tuple(
+                self._build(element_type, path + (index,))
+                for index, element_type in enumerate(value_type.element_types)
+            )
+            if isinstance(value_type, RecordType):
+                record_class = value_type.record_class
+                return lambda rng: record_class(*(sample(rng) for sample in element_samplers))
+            return lambda rng: tuple(sample(rng) for sample in element_samplers)
+        elif isinstance(value_type, TupleType):
+            sample_item = self._build(value_type.item_type, path + (ITEM,))
+            length = value_type.length
+            return lambda rng: tuple(sample_item(rng) for _ in range(length))
+        elif isinstance(value_type, ArrayType):
+            sample_item = self._build(value_type.item_type, path + (ITEM,))
+            array_length = self.lengths.get(path, self.array_length)
+            return lambda rng: tuple(sample_item(rng) for _ in range(array_length(rng)))
+        else:
+            raise TypeError(f"Cannot generate values of type {value_type}")
+
+    def _build_optional(self, value_type: OptionalType, path: Path) -> Sampler:
+        sample_value = self._build(value_type.value_type, path)
+        optional_rate = self.optional_rate
+
+        def sample(rng: random.Random) -> Any:
+            if rng.random() < optional_rate:
+                # Empty values are indistinguishable from absent ones.
+                for _ in range(_MAX_PRESENT_ATTEMPTS):
+                    value = sample_value(rng)
+                    if value:
+                        return value
+            return b''
+        return sample
+
+
+#
+# Presets
+#
+HEADER_TYPE_STR = (
+    '{bytes32,bytes32,bytes20,bytes32,bytes32,bytes32,uint2048,scalar256,scalar256,'
+    'scalar256,scalar256,scalar256,bytes,bytes,bytes8?}'
+)
+TXN_TYPE_STR = '{scalar256,scalar256,scalar256,bytes20?,scalar256,bytes,uint8,uint256,uint256}'
+BLOCK_TYPE_STR = '{%s,%s[],%s[]}' % (HEADER_TYPE_STR, TXN_TYPE_STR, HEADER_TYPE_STR)
+LOG_TYPE_STR = '{bytes20,uint256[],bytes}'
+RECEIPT_TYPE_STR = '{bytes,scalar256,uint2048,%s[]}' % LOG_TYPE_STR
+RECEIPTS_TYPE_STR = '%s[]' % RECEIPT_TYPE_STR
+ACCOUNT_TYPE_STR = '{scalar256,scalar256,bytes32,bytes32}'
+TRIE_NODE_TYPE_STR = 'bytes[]'
+ADDRESS_TYPE_STR = '{bytes,scalar16,scalar16}'
+PING_TYPE_STR = '{scalar8,%s,%s,scalar32}' % (ADDRESS_TYPE_STR, ADDRESS_TYPE_STR)
+PONG_TYPE_STR = '{%s,bytes,scalar32}' % ADDRESS_TYPE_STR
+FIND_NODE_TYPE_STR = '{bytes,scalar32}'
+NEIGHBOURS_TYPE_STR = '{{bytes,scalar16,scalar16,bytes}[],scalar32}'
+
+
+Preset = NamedTuple('Preset', (
+    ('type_str', str),
+    ('options', Dict[str, Any]),
+    ('lengths', Dict[Path, Sampler]),
+    ('overrides', Dict[Path, Sampler]),
+))
+
+
+_timestamp = uniform(1500000000, 1600000000)
+_port = uniform(1024, 65535)
+_ip_address = random_bytes(choice((4, 16), (9, 1)))
+
+
+def _header_overrides(prefix: Path) -> Dict[Path, Sampler]:
+    return {
+        # difficulty, number, gas limit, gas used and timestamp
+        prefix + (7,): random_integer(uniform(40, 64)),
+        prefix + (8,): uniform(1, 10**7),
+        prefix + (9,): uniform(10**6, 10**7),
+        prefix + (10,): uniform(0, 10**7),
+        prefix + (11,): _timestamp,
+        # extra data and mix hash
+        prefix + (12,): random_bytes(uniform(0, 32)),
+        prefix + (13,): random_bytes(32),
+    }
+
+
+def _txn_overrides(prefix: Path) -> Dict[Path, Sampler]:
+    return {
+        # nonce, gas price, gas, value, data and v
+        prefix + (0,): log_uniform(0, 10**5),
+        prefix + (1,): uniform(10**9, 10**11),
+        prefix + (2,): uniform(21000, 10**6),
+        prefix + (4,): random_integer(uniform(0, 80)),
+        prefix + (5,): random_bytes(choice((0, 4, 68, 1024), (6, 1, 2, 1))),
+        prefix + (6,): choice((27, 28, 37, 38)),
+    }
+
+
+def _receipt_overrides(prefix: Path) -> Dict[Path, Sampler]:
+    # state root and cumulative gas used
+    return {prefix + (0,): random_bytes(32), prefix + (1,): uniform(21000, 10**7)}
+
+
+def _log_lengths(prefix: Path) -> Dict[Path, Sampler]:
+    # topics and data
+    return {prefix + (1,): uniform(0, 4), prefix + (2,): log_uniform(0, 256)}
+
+
+def _address_overrides(prefix: Path) -> Dict[Path, Sampler]:
+    return {prefix + (0,): _ip_address, prefix + (1,): _port, prefix + (2,): _port}
+
+
+PRESETS: Dict[str, Preset] = {
+    'header': Preset(HEADER_TYPE_STR, {'optional_rate': 1.0}, {}, _header_overrides(())),
+    'txn': Preset(TXN_TYPE_STR, {'optional_rate': 0.9}, {}, _txn_overrides(())),
+    'block': Preset(
+        BLOCK_TYPE_STR,
+        {'optional_rate': 0.9},
+        # transactions and uncles
+        {(1,): uniform(0, 200), (2,): choice((0, 1, 2), (8, 1, 1))},
+        {**_header_overrides((0,)), **_txn_overrides((1, ITEM)), **_header_overrides((2, ITEM))},
+    ),
+    'receipts': Preset(
+        RECEIPTS_TYPE_STR,
+        {},
+        {(): log_uniform(0, 200), (ITEM, 3): log_uniform(0, 8), **_log_lengths((ITEM, 3, ITEM))},
+        _receipt_overrides((ITEM,)),
+    ),
+    'log': Preset(LOG_TYPE_STR, {}, _log_lengths(()), {}),
+    'account': Preset(
+        ACCOUNT_TYPE_STR,
+        {},
+        {},
+        # nonce and balance
+        {(0,): log_uniform(0, 10**5), (1,): random_integer(uniform(0, 80))},
+    ),
+    'trie-node': Preset(
+        TRIE_NODE_TYPE_STR,
+        {},
+        # branch nodes with 17 items or extension and leaf nodes with 2
+        {(): choice((2, 17), (1, 3))},
+        {(ITEM,): random_bytes(choice((0, 32), (1, 3)))},
+    ),
+    'ping': Preset(
+        PING_TYPE_STR,
+        {},
+        {},
+        {
+            **_address_overrides((1,)),
+            **_address_overrides((2,)),
+            (0,): constant(4),
+            (3,): _timestamp,
+        },
+    ),
+    'pong': Preset(
+        PONG_TYPE_STR,
+        {},
+        {},
+        {**_address_overrides((0,)), (1,): random_bytes(32), (2,): _timestamp},
+    ),
+    'find-node': Preset(FIND_NODE_TYPE_STR, {}, {}, {(0,): random_bytes(64), (1,): _timestamp}),
+    'neighbours': Preset(
+        NEIGHBOURS_TYPE_STR,
+        {},
+        {(0,): uniform(1, 16)},
+        {**_address_overrides((0, ITEM)), (0, ITEM, 3): random_bytes(64), (1,): _timestamp},
+    ),
+}
+
+
+def preset(name: str, seed: int = 0, **options: Any) -> CorpusGenerator:
+    """
+    Return a generator for the preset ``name``.  ``options`` are passed to
+    :class:`CorpusGenerator`, with ``lengths`` and ``overrides`` merged into
+    those of the preset, for example ``lengths={(1,): constant(1000)}``
+    generates blocks of 1000 transactions.
+    """
+    type_str, preset_options, lengths, overrides = PRESETS[name]
+    options = dict(preset_options, **options)
+    options['lengths'] = {**lengths, **options.get('lengths', {})}
+    options['overrides'] = {**overrides, **options.get('overrides', {})}
+    return CorpusGenerator(type_str, seed, **options)
@@ -1,21 +1,38 @@
-import functools
+"""
+Parsing of type strings into :class:`~bimini.types.BaseType` trees.
+
+Type strings are parsed by hand with a recursive descent over the grammar::
+
+    type      = base "?"? array* "?"?
+    base      = "bit" / "bitfield" / "bool" / "byte" / "bytes" / "bytes" N /
+                "uint" N / "scalar" N / container
+    container = "{}" / "{" type ("," type)* "}"
+    array     = "[]" / "[" N "]"
+
+where ``N`` is a positive decimal integer without leading zeros.  Array
+suffixes apply from the outside in, so ``uint8[2][]`` is a tuple of two
+``uint8`` arrays.  Types may be nested at most ``MAX_NESTING_DEPTH`` deep.
+"""
+import re
 from typing import (
+    List,
     Optional,
     Tuple,
-    Union,
 )
 
-import parsimonious
-from parsimonious import (
-    expressions,
+from bimini.compiler import (
+    Codec,
 )
-
 from bimini.exceptions import (
     ParseError,
 )
+from bimini.registry import (
+    CodecRegistry,
+)
 from bimini.types import (
     ArrayType,
     BaseType,
+    BitfieldType,
     BitType,
     ByteType,
     BytesType,
@@ -29,226 +46,191 @@ from bimini.types import (
 )
 
 
-grammar = parsimonious.Grammar(r"""
-type = types optional?
-types = basic_type / alias_type / container_type / tuple_type / array_type
-
-container_type = container_types optional? arrlist?
-container_types = zero_container / non_zero_container
-tuple_type = type const_arr optional?
-array_type = type dynam_arr optional?
-
-non_zero_container = "{" type next_type* "}"
-next_type = "," type
-
-zero_container = "{}"
-
-optional = "?"
-
-basic_type = basic_types optional? arrlist?
-basic_types = integer_types / bit_type
-bit_type = "bit"
-
-integer_types = base_integer_type bit_size
-bit_size = ~"[1-9][0-9]*"
-base_integer_type = "uint" / "scalar"
-
-alias_type = alias_types optional? arrlist?
-alias_types = bool_type / bytesN_type / bytes_type / byte_type
-
-bytesN_type = bytes_type digits
-
-bool_type = "bool"
-bytes_type = "bytes"
-byte_type = "byte"
-
-arrlist = dynam_arr / const_arr
-dynam_arr = dynam_arr_comp any_arr_comp*
-const_arr = const_arr_comp any_arr_comp*
-
-any_arr_comp = (const_arr_comp / dynam_arr_comp)*
-
-dynam_arr_comp = "[]"
-const_arr_comp = "[" digits "]"
-
-digits = ~"[1-9][0-9]*"
-""")
-
-
-ArrTypeMeta = Tuple[Union[ArrayType, TupleType], Optional[int]]
-
+_NAME_RE = re.compile(r'([a-z]+)([0-9]*)')
+_ARRAY_RE = re.compile(r'\[([0-9]*)\]')
 
-def _reduce_arrlist(item_type: BaseType,
-                    arr_type_meta: ArrTypeMeta,
-                    ) -> Union[TupleType, ArrayType]:
-    arr_type, arr_size = arr_type_meta
-    if arr_type is TupleType:
-        return TupleType(item_type, arr_size)
-    elif arr_type is ArrayType:
-        if arr_size is not None:
-            raise Exception("INVALID")
-        else:
-            return ArrayType(item_type)
-    else:
-        raise Exception('INVARIANT')
+# The maximum number of types enclosing each other, counting containers,
+# arrays, tuples and optionals.  Compiling and encoding recurse through the
+# levels of a type so deeper types would exhaust the python stack.
+MAX_NESTING_DEPTH = 100
 
 
-class NodeVisitor(parsimonious.NodeVisitor):
-    """
-    Parsimonious node visitor which performs both parsing of type strings and
-    post-processing of parse trees.  Parsing operations are cached.
-    """
-    grammar = grammar
+class _Parser:
+    def __init__(self, type_str: str) -> None:
+        self.type_str = type_str
+        self.pos = 0
+        self.num_open_containers = 0
 
-    def _maybe_reduce_arrlist(self, node, visited_children):
-        base_type, optional, arr_comps = visited_children
-
-        if optional:
-            declared_type = optional(base_type)
-        else:
-            declared_type = base_type
-
-        if arr_comps is None:
-            value_type = declared_type
-        else:
-            value_type = functools.reduce(_reduce_arrlist, reversed(arr_comps), declared_type)
+    def error(self, reason: str, pos: Optional[int] = None) -> ParseError:
+        if pos is None:
+            pos = self.pos
+        return ParseError(f"Invalid type string {self.type_str!r}: {reason} at offset {pos}")
 
+    def parse(self) -> BaseType:
+        value_type, _ = self.parse_type()
+        if self.pos < len(self.type_str):
+            raise self.error(f"unexpected {self.type_str[self.pos]!r}")
         return value_type
 
-    def visit_type(self, node, visited_children):
-        value_type, optional = visited_children
-
-        if optional:
-            return optional(value_type)
-        else:
-            return value_type
-
-    def visit_container_type(self, node, visited_children):
-        return self._maybe_reduce_arrlist(node, visited_children)
-
-    def visit_next_type(self, node, visited_children):
-        # Ignore comma
-        _, element_type = visited_children
-
-        return element_type
-
-    def visit_zero_container(self, node, visited_children):
-        return ContainerType((), 0)
+    def check_depth(self, depth: int, pos: int) -> None:
+        if depth > MAX_NESTING_DEPTH:
+            raise self.error(
+                f"types are nested more than {MAX_NESTING_DEPTH} deep", pos
+            )
 
-    def visit_non_zero_container(self, node, visited_children):
-        # Ignore left and right braces
-        _, first, rest, _ = visited_children
-
-        return ContainerType((first,) + rest)
-
-    def visit_optional(self, node, visited_children):
-        return OptionalType
-
-    ############
-    def _visit_any_arr(self, node, visited_children):
-        base_arr, tail_arrs = visited_children
-        if tail_arrs:
-            return (base_arr,) + tail_arrs[0]
-        else:
-            return (base_arr,)
-
-    def visit_dynam_arr(self, node, visited_children):
-        return self._visit_any_arr(node, visited_children)
-
-    def visit_const_arr(self, node, visited_children):
-        return self._visit_any_arr(node, visited_children)
-
-    def visit_dynam_arr_comp(self, node, visited_children):
-        return (ArrayType, None)
-
-    def visit_const_arr_comp(self, node, visited_children):
-        _, size, _ = visited_children
-        return (TupleType, int(size))
-
-    ############
-    def visit_basic_type(self, node, visited_children):
-        return self._maybe_reduce_arrlist(node, visited_children)
-
-    def visit_bit_size(self, node, visited_children):
-        bit_size = int(node.text)
-        if bit_size % 8 != 0:
-            raise ParseError("Invalid bit_size.  Must be multiple of 8")
-        return bit_size
-
-    def visit_base_integer_type(self, node, visited_children):
-        if node.text == 'uint':
-            return UnsignedIntegerType
-        elif node.text == 'scalar':
-            return ScalarType
-        else:
-            raise Exception("Unreachable")
-
-    def visit_integer_types(self, node, visited_children):
-        base, bit_size = visited_children
-        return base(bit_size)
-
-    def visit_bit_type(self, node, visited_children):
-        return BitType()
-
-    ############
-    def visit_alias_type(self, node, visited_children):
-        return self._maybe_reduce_arrlist(node, visited_children)
-
-    def visit_bool_type(self, node, visited_children):
-        return BoolType()
-
-    def visit_byte_type(self, node, visited_children):
-        return ByteType()
-
-    def visit_bytes_type(self, node, visited_children):
-        return BytesType()
-
-    def visit_bytesN_type(self, node, visited_children):
-        # we discard the parsed type to replace with just a `byte` type.
-        _, size = visited_children
-        return FixedBytesType(size)
-
-    ############
-    def visit_digits(self, node, visited_children):
-        return int(node.text)
-
-    def generic_visit(self, node, visited_children):
-        if isinstance(node.expr, expressions.OneOf):
-            # Unwrap value chosen from alternatives
-            return visited_children[0]
-
-        if isinstance(node.expr, expressions.Optional):
-            # Unwrap optional value or return `None`
-            if len(visited_children) != 0:
-                return visited_children[0]
-
-            return None
-
-        return tuple(visited_children)
-
-    @functools.lru_cache(maxsize=None)
-    def parse(self, type_str):
+    def parse_type(self) -> Tuple[BaseType, int]:
         """
-        Parses a type string into an appropriate instance of
-        :class:`~eth_abi.grammar.ABIType`.  If a type string cannot be parsed,
-        throws :class:`~eth_abi.exceptions.ParseError`.
-
-        :param type_str: The type string to be parsed.
-        :returns: An instance of :class:`~eth_abi.grammar.ABIType` containing
-            information about the parsed type string.
+        Return the type at the current position and its nesting depth.
         """
-        if not isinstance(type_str, str):
-            raise TypeError('Can only parse string values: got {}'.format(type(type_str)))
-
-        try:
-            return super().parse(type_str)
-        except parsimonious.ParseError as e:
-            raise ParseError(e.text, e.pos, e.expr)
+        type_str = self.type_str
+
+        value_type, depth = self.parse_base()
+        if type_str.startswith('?', self.pos):
+            self.check_depth(depth + 1, self.pos)
+            self.pos += 1
+            value_type = OptionalType(value_type)
+            depth += 1
+
+        array_sizes: List[Optional[int]] = []
+        while type_str.startswith('[', self.pos):
+            match = _ARRAY_RE.match(type_str, self.pos)
+            if match is None:
+                raise self.error("invalid array suffix")
+            self.check_depth(depth + len(array_sizes) + 1, self.pos)
+            if match.group(1):
+                array_sizes.append(self.parse_size(match.group(1), self.pos + 1))
+            else:
+                array_sizes.append(None)
+            self.pos = match.end()
+
+        for size in reversed(array_sizes):
+            if size is None:
+                value_type = ArrayType(value_type)
+            else:
+                value_type = TupleType(value_type, size)
+        depth += len(array_sizes)
+
+        if type_str.startswith('?', self.pos):
+            self.check_depth(depth + 1, self.pos)
+            self.pos += 1
+            value_type = OptionalType(value_type)
+            depth += 1
+
+        return value_type, depth
+
+    def parse_base(self) -> Tuple[BaseType, int]:
+        if self.type_str.startswith('{', self.pos):
+            return self.parse_container()
+        else:
+            return self.parse_name(), 1
+
+    def parse_name(self) -> BaseType:
+
+        match = _NAME_RE.match(self.type_str, self.pos)
+        if match is None:
+            if self.pos < len(self.type_str):
+                raise self.error(f"expected a type, got {self.type_str[self.pos]!r}")
+            else:
+                raise self.error("expected a type, got the end of the string")
+
+        name, digits = match.groups()
+        digits_pos = match.start(2)
+        self.pos = match.end()
+
+        if name in ('uint', 'scalar'):
+            if not digits:
+                raise self.error(f"missing bit size of {name}", digits_pos)
+            bit_size = self.parse_size(digits, digits_pos)
+            if bit_size % 8 != 0:
+                raise self.error("bit size must be a multiple of 8", digits_pos)
+            elif name == 'uint':
+                return UnsignedIntegerType(bit_size)
+            else:
+                return ScalarType(bit_size)
+        elif name == 'bytes':
+            if digits:
+                return FixedBytesType(self.parse_size(digits, digits_pos))
+            else:
+                return BytesType()
+        elif digits:
+            raise self.error(f"unexpected size of {name}", digits_pos)
+        elif name == 'bit':
+            return BitType()
+        elif name == 'bitfield':
+            return BitfieldType()
+        elif name == 'bool':
+            return BoolType()
+        elif name == 'byte':
+            return ByteType()
+        else:
+            raise self.error(f"unknown type {name!r}", match.start())
+
+    def parse_container(self) -> Tuple[ContainerType, int]:
+        type_str = self.type_str
+        # Every open container encloses the elements parsed within it, so
+        # their count bounds the depth before the elements are parsed.
+        self.num_open_containers += 1
+        self.check_depth(self.num_open_containers, self.pos)
+        # skip the opening brace
+        self.pos += 1
+        if type_str.startswith('}', self.pos):
+            self.pos += 1
+            self.num_open_containers -= 1
+            return ContainerType(()), 1
+
+        element_type, max_depth = self.parse_type()
+        element_types = [element_type]
+        while True:
+            if type_str.startswith(',', self.pos):
+                self.pos += 1
+                element_type, depth = self.parse_type()
+                element_types.append(element_type)
+                max_depth = max(max_depth, depth)
+            elif type_str.startswith('}', self.pos):
+                self.pos += 1
+                self.check_depth(max_depth + 1, self.pos - 1)
+                self.num_open_containers -= 1
+                return ContainerType(tuple(element_types)), max_depth + 1
+            else:
+                raise self.error("expected ',' or '}'")
+
+    def parse_size(self, digits: str, pos: int) -> int:
+        if digits.startswith('0'):
+            raise self.error("size must be a positive integer without leading zeros", pos)
+        return int(digits)
+
+
+def _parse(type_str: str) -> BaseType:
+    try:
+        return _Parser(type_str).parse()
+    except RecursionError:
+        raise ParseError(
+            f"Invalid type string {type_str!r}: types are nested too deeply"
+        ) from None
+
+
+# The cache of parsed types and codecs used by `parse` and `codec_for`.
+registry = CodecRegistry(_parse)
+
+
+def parse(type_str: str) -> BaseType:
+    """
+    Parse a type string into the corresponding :class:`~bimini.types.BaseType`.
+    Invalid type strings raise :class:`~bimini.exceptions.ParseError` which
+    reports the offset of the problem.
+    """
+    return registry.get_type(type_str)
 
 
-visitor = NodeVisitor()
+def codec_for(type_str: str) -> Codec:
+    """
+    Return the compiled :class:`~bimini.compiler.Codec` for ``type_str``.
+    """
+    return registry.codec_for(type_str)
 
 
+# Types which share the wire format of another type but decode to different
+# python values.
 TYPE_ALIASES = {
     'byte': 'uint8',
     'bytes': 'uint8[]',
@@ -257,11 +239,28 @@ TYPE_ALIASES = {
 }
 
 
-def normalize(type_str):
-    """
-    TODO
-    """
-    assert False
+def _normalize_type(value_type: BaseType) -> BaseType:
+    if isinstance(value_type, FixedBytesType):
+        return parse(TYPE_ALIASES['bytesN'].replace('N', str(value_type.length)))
+    elif isinstance(value_type, (BoolType, ByteType, BytesType)):
+        return parse(TYPE_ALIASES[str(value_type)])
+    elif isinstance(value_type, ContainerType):
+        return ContainerType(_normalize_type(element) for element in value_type.element_types)
+    elif isinstance(value_type, TupleType):
+        return TupleType(_normalize_type(value_type.item_type), value_type.length)
+    elif isinstance(value_type, ArrayType):
+        return ArrayType(_normalize_type(value_type.item_type))
+    elif isinstance(value_type, OptionalType):
+        return OptionalType(_normalize_type(value_type.value_type))
+    else:
+        return value_type
 
 
-parse = visitor.parse
+def normalize(type_str: str) -> str:
+    """
+    Return the canonical form of ``type_str`` in which every alias from
+    ``TYPE_ALIASES`` is replaced by the type it stands for.  Two type strings
+    have the same normal form exactly when their encodings are identical,
+    so ``parse(normalize('bytes32'))`` is ``parse('uint8[32]')``.
+    """
+    return str(_normalize_type(parse(type_str)))
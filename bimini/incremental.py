@@ -0,0 +1,140 @@
+"""
+Incremental decoding of values from bytes which arrive in arbitrary chunks.
+
+The :class:`Decoder` performs no I/O itself: bytes are pushed into it as they
+arrive and decoded values are returned as soon as they are complete.
+"""
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from bimini.compiler import (
+    Buffer,
+)
+from bimini.exceptions import (
+    ParseError,
+)
+
+if TYPE_CHECKING:
+    from bimini.types import BaseType  # noqa: F401
+
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class Decoder:
+    """
+    Decode a sequence of back to back encoded values of ``value_type`` from
+    bytes fed in chunks of any size.
+
+    A value which is split across chunks is resumed where it left off when
+    the next chunk arrives, so the bytes of each value are only examined
+    once regardless of how they are fragmented.
+
+    Types whose encoding is empty are rejected since any number of their
+    values can be decoded from no bytes at all.
+    """
+    def __init__(self, value_type: 'BaseType[Any]') -> None:
+        if value_type.fixed_size == 0:
+            raise ValueError(f"Cannot decode a stream of the empty type: {value_type}")
+        self.value_type = value_type
+        self._feed = value_type.compile()._feed
+        self._buf = bytearray()
+        self._pos = 0
+        self._pending: Optional[Generator[None, None, Tuple[Any, int]]] = None
+        self._error: Optional[Exception] = None
+
+    def __repr__(self) -> str:
+        return f'<Decoder {self.value_type} buffered={len(self._buf) - self._pos}>'
+
+    @property
+    def buffered(self) -> int:
+        """
+        The number of bytes received which are not part of a complete value.
+        """
+        return len(self._buf) - self._pos
+
+    def feed(self, chunk: Buffer) -> List[Any]:
+        """
+        Add ``chunk`` to the buffered bytes and return every value which has
+        been completed, in order.
+
+        Invalid data raises its error and fails the decoder.  When values were
+        completed before the invalid data by the same call they are returned
+        instead, and the error is raised by the next call.
+        """
+        self._check_failed()
+        buf = self._buf
+        buf += chunk
+
+        values = []
+        try:
+            while True:
+                if self._pending is None:
+                    # Drop the bytes of the values completed so far.  A value
+                    # which is still pending refers to its bytes by position,
+                    # so the buffer holds at most one value and one chunk.
+                    if self._pos:
+                        del buf[:self._pos]
+                        self._pos = 0
+                    if not buf:
+                        break
+                    self._pending = self._feed(buf, 0)
+                try:
+                    next(self._pending)
+                except StopIteration as done:
+                    value, self._pos = done.value
+                    self._pending = None
+                    values.append(value)
+                else:
+                    break
+        except Exception as err:
+            self._pending = None
+            self._error = err
+            if not values:
+                raise
+
+        return values
+
+    def _check_failed(self) -> None:
+        if self._error is not None:
+            raise ParseError(
+                f"Cannot continue decoding after invalid data: {self._error}"
+            ) from self._error
+
+    def close(self) -> None:
+        """
+        Signal the end of the input, raising ``ParseError`` if the last value
+        is incomplete.
+        """
+        self._check_failed()
+        if self.buffered:
+            raise ParseError(
+                f"Insufficient bytes in stream: {self.buffered} trailing bytes of an "
+                "incomplete value"
+            )
+
+
+def iter_decode(value_type: 'BaseType[Any]',
+                stream: IO[bytes],
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Decode back to back encoded values of ``value_type`` from ``stream``
+    until it is exhausted.  The stream is read ahead in chunks of
+    ``chunk_size`` bytes.  Ending cleanly between two values stops the
+    iteration while ending partway through a value raises ``ParseError``.
+    """
+    decoder = Decoder(value_type)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield from decoder.feed(chunk)
+    decoder.close()
@@ -0,0 +1,232 @@
+"""
+Encoding and decoding of integers: LEB128 for ``scalar<N>`` and little
+endian for ``uint<N>``.
+
+Every function validates that values are within the range of the bit size
+they are encoded as, raising :class:`~bimini.exceptions.EncodingError` when
+encoding, :class:`~bimini.exceptions.DecodingError` when decoding from
+memory and :class:`~bimini.exceptions.ParseError` when reading from a
+stream.
+"""
+import collections.abc
+import functools
+from typing import (
+    IO,
+    Iterable,
+    Tuple,
+    Union,
+)
+
+from bimini.exceptions import (
+    DecodingError,
+    EncodingError,
+    ParseError,
+)
+
+
+LOW_MASK = 2**7 - 1
+HIGH_MASK = 2**7
+
+# The encodings of values below this limit, which fit in two bytes, are
+# looked up in a table rather than computed.
+SMALL_VALUE_LIMIT = 2**14
+
+
+def validate_bit_size(bit_size: int) -> None:
+    if bit_size < 8 or bit_size % 8:
+        raise ValueError(f"Bit size must be a positive multiple of 8: got {bit_size}")
+
+
+def max_scalar_length(bit_size: int) -> int:
+    """
+    Return the length of the longest LEB128 encoding of a ``scalar<bit_size>``.
+    """
+    return (bit_size + 6) // 7
+
+
+@functools.lru_cache(maxsize=None)
+def _small_encodings() -> Tuple[bytes, ...]:
+    # Built on first use as it takes a few milliseconds.
+    one_byte = [bytes((value,)) for value in range(HIGH_MASK)]
+    two_bytes = [
+        bytes(((value & LOW_MASK) | HIGH_MASK, value >> 7))
+        for value in range(HIGH_MASK, SMALL_VALUE_LIMIT)
+    ]
+    return tuple(one_byte + two_bytes)
+
+
+def _validate_value(bit_size: int, value: int) -> None:
+    if not isinstance(value, int):
+        raise EncodingError(f"Can only encode integers: got {type(value)}")
+    elif value < 0:
+        raise EncodingError(f"Cannot encode negative integer: {value}")
+    elif value.bit_length() > bit_size:
+        raise EncodingError(f"Integer {value} exceeds maximum bit size: {bit_size}")
+
+
+def encode_leb128(value: int) -> bytes:
+    """
+    Return the LEB128 encoding of the non-negative integer ``value`` of any
+    size.
+    """
+    if 0 <= value < SMALL_VALUE_LIMIT:
+        return _small_encodings()[value]
+    elif value < 0:
+        raise EncodingError(f"Cannot encode negative integer: {value}")
+
+    length = (value.bit_length() + 6) // 7
+    if length == 3:
+        return bytes((
+            (value & LOW_MASK) | HIGH_MASK,
+            ((value >> 7) & LOW_MASK) | HIGH_MASK,
+            value >> 14,
+        ))
+
+    # Appending to a bytearray is faster in CPython than filling one
+    # allocated at its final length.
+    out = bytearray()
+    for _ in range(length - 1):
+        out.append((value & LOW_MASK) | HIGH_MASK)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def encode_scalar(bit_size: int, value: int) -> bytes:
+    validate_bit_size(bit_size)
+    _validate_value(bit_size, value)
+    return encode_leb128(value)
+
+
+def encode_scalars(bit_size: int, values: Iterable[int]) -> bytes:
+    """
+    Return the concatenated encodings of ``values`` as ``scalar<bit_size>``.
+    Long sequences are encoded with numpy when it is installed.
+    """
+    validate_bit_size(bit_size)
+    # Imported here since `bimini.vectorized` builds on this module.
+    from bimini import vectorized
+    is_sized = isinstance(values, collections.abc.Sized)
+    if vectorized.HAS_NUMPY and is_sized and len(values) >= vectorized.VECTORIZE_THRESHOLD:
+        return vectorized.encode_scalar_array(bit_size, values)  # type: ignore
+
+    table = _small_encodings()
+    limit = min(SMALL_VALUE_LIMIT, 1 << bit_size)
+    return b''.join([
+        table[value] if type(value) is int and 0 <= value < limit
+        else encode_scalar(bit_size, value)
+        for value in values
+    ])
+
+
+def decode_scalar_from(bit_size: int,
+                       data: Union[bytes, bytearray, memoryview],
+                       offset: int) -> Tuple[int, int]:
+    """
+    Decode a ``scalar<bit_size>`` from ``data`` at ``offset``, returning the
+    value and the offset following its encoding.
+    """
+    try:
+        value = data[offset]
+    except IndexError:
+        raise DecodingError("Unexpected end of data while decoding LEB128 encoded integer")
+    offset += 1
+    if value < HIGH_MASK:
+        return value, offset
+
+    value &= LOW_MASK
+    max_shift = 7 * max_scalar_length(bit_size)
+    for shift in range(7, max_shift, 7):
+        try:
+            byte = data[offset]
+        except IndexError:
+            raise DecodingError("Unexpected end of data while decoding LEB128 encoded integer")
+        offset += 1
+        value |= (byte & LOW_MASK) << shift
+        if not byte & HIGH_MASK:
+            break
+    else:
+        raise DecodingError(f"Decoded integer exceeds maximum bit size: {bit_size}")
+
+    if value >> bit_size:
+        raise DecodingError(f"Decoded integer exceeds maximum bit size: {bit_size}")
+    return value, offset
+
+
+def decode_scalar(bit_size: int, data: Union[bytes, bytearray, memoryview]) -> int:
+    """
+    Decode ``data`` which must be exactly one ``scalar<bit_size>``.
+    """
+    validate_bit_size(bit_size)
+    value, offset = decode_scalar_from(bit_size, data, 0)
+    if offset != len(data):
+        raise DecodingError(
+            f"Unexpected {len(data) - offset} bytes after LEB128 encoded integer"
+        )
+    return value
+
+
+def decode_scalars(bit_size: int,
+                   data: Union[bytes, bytearray, memoryview],
+                   offset: int,
+                   count: int) -> Tuple[Tuple[int, ...], int]:
+    """
+    Decode ``count`` consecutive ``scalar<bit_size>`` values from ``data``
+    starting at ``offset``, returning the values and the offset following
+    the last one.  Many values are decoded with numpy when it is installed.
+    """
+    validate_bit_size(bit_size)
+    from bimini import vectorized
+    if vectorized.HAS_NUMPY and count >= vectorized.VECTORIZE_THRESHOLD:
+        return vectorized.decode_scalar_array_from(bit_size, data, offset, count)
+
+    values = []
+    append = values.append
+    end = len(data)
+    for _ in range(count):
+        # Single byte values are decoded inline.
+        if offset < end and data[offset] < HIGH_MASK:
+            append(data[offset])
+            offset += 1
+        else:
+            value, offset = decode_scalar_from(bit_size, data, offset)
+            append(value)
+    return tuple(values), offset
+
+
+def read_scalar(bit_size: int, stream: IO[bytes]) -> int:
+    """
+    Read a ``scalar<bit_size>`` from ``stream`` one byte at a time so that no
+    bytes past its encoding are consumed.
+    """
+    validate_bit_size(bit_size)
+    value = 0
+    for shift in range(0, 7 * max_scalar_length(bit_size), 7):
+        data = stream.read(1)
+        if not data:
+            raise ParseError("Unexpected end of stream while parsing LEB128 encoded integer")
+        byte = data[0]
+        value |= (byte & LOW_MASK) << shift
+        if not byte & HIGH_MASK:
+            break
+    else:
+        raise ParseError(f"Parsed integer exceeds maximum bit size: {bit_size}")
+
+    if value >> bit_size:
+        raise ParseError(f"Parsed integer exceeds maximum bit size: {bit_size}")
+    return value
+
+
+def encode_uint(bit_size: int, value: int) -> bytes:
+    validate_bit_size(bit_size)
+    _validate_value(bit_size, value)
+    return value.to_bytes(bit_size // 8, 'little')
+
+
+def decode_uint(bit_size: int, data: Union[bytes, bytearray, memoryview]) -> int:
+    validate_bit_size(bit_size)
+    if len(data) != bit_size // 8:
+        raise DecodingError(
+            f"Invalid length for uint{bit_size}: expected {bit_size // 8} bytes, got {len(data)}"
+        )
+    return int.from_bytes(data, 'little')
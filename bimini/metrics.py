@@ -0,0 +1,281 @@
+"""
+Opt-in instrumentation of encoding and decoding.
+
+While enabled, every call to the ``encode``, ``decode`` and ``s_decode``
+methods of a type records its duration and the number of bytes produced or
+consumed, keyed by the type string and operation::
+
+    >>> import bimini.metrics
+    >>> bimini.metrics.enable()
+    >>> ...
+    >>> bimini.metrics.snapshot()[('uint8', 'encode')].calls
+    >>> print(bimini.metrics.to_prometheus())
+
+The methods are only wrapped while metrics are enabled, so disabled metrics
+cost nothing.  Each thread records its calls separately without taking a
+lock.  See :func:`enable` for the calls which are not recorded.
+"""
+import collections
+import functools
+import threading
+import time
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from bimini.types import BaseType
+
+
+OPERATIONS = ('encode', 'decode', 's_decode')
+
+# Number of the most recent latencies of each operation kept to compute
+# percentiles.
+LATENCY_SAMPLE_SIZE = 1024
+
+
+OperationStats = NamedTuple('OperationStats', (
+    ('calls', int),
+    ('bytes_in', int),
+    ('bytes_out', int),
+    ('total_seconds', float),
+    ('p99_seconds', float),
+))
+
+
+class _Counter:
+    __slots__ = ('calls', 'bytes_in', 'bytes_out', 'total_seconds', 'latencies')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.total_seconds = 0.0
+        self.latencies: Deque[float] = collections.deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    def stats(self) -> OperationStats:
+        return OperationStats(
+            calls=self.calls,
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+            total_seconds=self.total_seconds,
+            p99_seconds=_percentile(sorted(self.latencies), 0.99),
+        )
+
+    def merge(self, other: '_Counter') -> '_Counter':
+        merged = _Counter()
+        merged.calls = self.calls + other.calls
+        merged.bytes_in = self.bytes_in + other.bytes_in
+        merged.bytes_out = self.bytes_out + other.bytes_out
+        merged.total_seconds = self.total_seconds + other.total_seconds
+        merged.latencies.extend(self.latencies)
+        merged.latencies.extend(other.latencies)
+        return merged
+
+
+class _ThreadCounters(threading.local):
+    """
+    The counters of the calls made by one thread, so that recording a call
+    takes no lock.  The counters of every thread are merged by
+    :func:`snapshot`.
+    """
+    def __init__(self) -> None:
+        # Keyed by type string, so distinct types with the same string such
+        # as a record type and its plain container are counted together and
+        # no reference to a type is kept.
+        self.counters: Dict[Tuple[str, str], _Counter] = {}
+        # The strings of the types recorded, which are slow to build for
+        # large types.
+        self.type_strs: 'weakref.WeakKeyDictionary[BaseType[Any], str]' = (
+            weakref.WeakKeyDictionary()
+        )
+        with _lock:
+            _thread_counters.append(self.counters)
+
+
+_lock = threading.Lock()
+# The counters of every thread which has recorded a call, kept after the
+# thread exits.
+_thread_counters: List[Dict[Tuple[str, str], _Counter]] = []
+_local = _ThreadCounters()
+# The original methods replaced while enabled.
+_originals: List[Tuple[Type[BaseType[Any]], str, Callable[..., Any]]] = []
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _record(value_type: BaseType[Any],
+            operation: str,
+            elapsed: float,
+            bytes_in: int,
+            bytes_out: int) -> None:
+    local = _local
+    type_str = local.type_strs.get(value_type)
+    if type_str is None:
+        type_str = local.type_strs[value_type] = str(value_type)
+    key = (type_str, operation)
+    counter = local.counters.get(key)
+    if counter is None:
+        counter = local.counters[key] = _Counter()
+    counter.calls += 1
+    counter.bytes_in += bytes_in
+    counter.bytes_out += bytes_out
+    counter.total_seconds += elapsed
+    counter.latencies.append(elapsed)
+
+
+def _tell(stream: Any) -> Optional[int]:
+    try:
+        return stream.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _wrap(operation: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    perf_counter = time.perf_counter
+
+    if operation == 'encode':
+        @functools.wraps(method)
+        def encode(self: BaseType[Any], value: Any) -> bytes:
+            start = perf_counter()
+            data = method(self, value)
+            _record(self, operation, perf_counter() - start, 0, len(data))
+            return data
+        return encode
+    elif operation == 'decode':
+        @functools.wraps(method)
+        def decode(self: BaseType[Any], data: bytes) -> Any:
+            start = perf_counter()
+            value = method(self, data)
+            _record(self, operation, perf_counter() - start, len(data), 0)
+            return value
+        return decode
+    elif operation == 's_decode':
+        @functools.wraps(method)
+        def s_decode(self: BaseType[Any], stream: Any) -> Any:
+            position = _tell(stream)
+            start = perf_counter()
+            value = method(self, stream)
+            elapsed = perf_counter() - start
+            end = _tell(stream) if position is not None else None
+            _record(self, operation, elapsed, 0 if end is None else end - position, 0)
+            return value
+        return s_decode
+    else:
+        raise ValueError(f"Unknown operation: {operation}")
+
+
+def _iter_type_classes(cls: Type[BaseType[Any]]) -> Iterator[Type[BaseType[Any]]]:
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _iter_type_classes(subclass)
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def enable() -> None:
+    """
+    Start recording the calls to every type.  Calling ``enable`` again has
+    no effect.
+
+    Only the ``encode``, ``decode`` and ``s_decode`` methods of the type
+    classes which exist when ``enable`` is called are instrumented, so the
+    following are not recorded:
+
+    - the types nested in another type, which are inlined into its codec
+      and attributed to the outermost type called;
+    - calls to the other methods of types such as ``decode_from``,
+      ``encode_into`` and ``async_decode``, and calls to codecs returned by
+      ``compile`` or ``codec_for``, which includes the :class:`Decoder
+      <bimini.incremental.Decoder>` and :mod:`bimini.batch`;
+    - the methods of type classes defined after ``enable`` is called.
+    """
+    with _lock:
+        if _originals:
+            return
+        for cls in set(_iter_type_classes(BaseType)):
+            for operation in OPERATIONS:
+                method = cls.__dict__.get(operation)
+                if method is None or getattr(method, '__isabstractmethod__', False):
+                    continue
+                _originals.append((cls, operation, method))
+                setattr(cls, operation, _wrap(operation, method))
+
+
+def disable() -> None:
+    """
+    Stop recording calls, restoring the uninstrumented methods.  Recorded
+    metrics are kept until :func:`reset`.
+    """
+    with _lock:
+        while _originals:
+            cls, operation, method = _originals.pop()
+            setattr(cls, operation, method)
+
+
+def reset() -> None:
+    with _lock:
+        for counters in _thread_counters:
+            counters.clear()
+
+
+def snapshot() -> Dict[Tuple[str, str], OperationStats]:
+    """
+    Return the metrics recorded so far keyed by type string and operation.
+    Distinct types with the same string, such as a record type and its plain
+    container, are counted together.
+    """
+    merged: Dict[Tuple[str, str], _Counter] = {}
+    with _lock:
+        for counters in _thread_counters:
+            for key, counter in list(counters.items()):
+                if key in merged:
+                    merged[key] = merged[key].merge(counter)
+                else:
+                    merged[key] = counter
+        return {key: counter.stats() for key, counter in merged.items()}
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(stats: Optional[Dict[Tuple[str, str], OperationStats]] = None) -> str:
+    """
+    Render ``stats``, by default a fresh :func:`snapshot`, in the Prometheus
+    text exposition format.
+    """
+    if stats is None:
+        stats = snapshot()
+
+    metrics = (
+        ('bimini_calls_total', 'counter', 'Number of calls.', 'calls'),
+        ('bimini_bytes_in_total', 'counter', 'Bytes decoded.', 'bytes_in'),
+        ('bimini_bytes_out_total', 'counter', 'Bytes encoded.', 'bytes_out'),
+        ('bimini_seconds_total', 'counter', 'Time spent in calls.', 'total_seconds'),
+        ('bimini_latency_p99_seconds', 'gauge', '99th percentile of recent call latency.',
+         'p99_seconds'),
+    )
+    lines = []
+    for name, metric_type, description, field in metrics:
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for (type_str, operation), operation_stats in sorted(stats.items()):
+            labels = f'type="{_escape_label(type_str)}",operation="{operation}"'
+            lines.append(f'{name}{{{labels}}} {getattr(operation_stats, field)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,130 @@
+r"""
+Record classes bound to containers.
+
+:func:`record` generates a class with a slot for each named element of a
+container together with the :class:`~bimini.types.RecordType` which
+encodes its instances, reading their attributes directly, and decodes
+straight into new instances::
+
+    >>> from bimini.records import record
+    >>> Log = record('Log', (('address', 'bytes20'), ('topics', 'uint256[]'), ('data', 'bytes')))
+    >>> log = Log(address=b'\x01' * 20, topics=(), data=b'')
+    >>> Log._value_type.decode(Log._value_type.encode(log)) == log
+    True
+"""
+import keyword
+import sys
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from bimini.grammar import parse
+from bimini.types import (
+    BaseType,
+    RecordType,
+)
+
+
+class Record:
+    """
+    The base class of the classes generated by :func:`record`.
+    """
+    __slots__ = ()
+
+    _fields: Tuple[str, ...] = ()
+    _field_types: Tuple[BaseType[Any], ...] = ()
+    _value_type: RecordType
+
+    def __iter__(self) -> Iterator[Any]:
+        for name in self._fields:
+            yield getattr(self, name)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in self._fields
+        )
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{type(self).__name__}({fields})'
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), tuple(self))
+
+
+FieldType = Union[str, BaseType[Any], Type[Record]]
+
+
+def _get_field_type(field_type: FieldType) -> BaseType[Any]:
+    if isinstance(field_type, str):
+        return parse(field_type)
+    elif isinstance(field_type, BaseType):
+        return field_type
+    elif isinstance(field_type, type) and issubclass(field_type, Record):
+        return field_type._value_type
+    else:
+        raise TypeError(f"Invalid field type: {field_type!r}")
+
+
+def _validate_name(name: str) -> None:
+    if not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name):
+        raise ValueError(f"Names must be valid identifiers: {name!r}")
+    elif name.startswith('_'):
+        raise ValueError(f"Names must not start with an underscore: {name!r}")
+
+
+def record(name: str,
+           fields: Iterable[Tuple[str, FieldType]],
+           module: Optional[str] = None) -> Type[Record]:
+    """
+    Return a new :class:`Record` class called ``name`` for a container with
+    an element for each of ``fields``, pairs of a field name and its type as
+    a type string, a type or another record class.
+
+    Instances are constructed from the fields in order or by name.  The type
+    of the container is the ``_value_type`` of the class.
+    """
+    fields = tuple(fields)
+    field_names = tuple(field_name for field_name, _ in fields)
+    for value in (name,) + field_names:
+        _validate_name(value)
+    if len(set(field_names)) != len(field_names):
+        raise ValueError(f"Duplicate field names: {field_names}")
+
+    # The constructor is generated so that it assigns every slot directly.
+    lines = [f'def __init__({", ".join(("self",) + field_names)}):'] + [
+        f'    self.{field_name} = {field_name}'
+        for field_name in field_names
+    ]
+    if not field_names:
+        lines.append('    pass')
+    source = '\n'.join(lines)
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f'<record {name}>', 'exec'), namespace)
+
+    if module is None:
+        # Allow instances to be pickled when the class is defined at the top
+        # level of the calling module, as with `collections.namedtuple`.
+        module = sys._getframe(1).f_globals.get('__name__', '__main__')
+
+    record_class = type(name, (Record,), {
+        '__slots__': field_names,
+        '__init__': namespace['__init__'],
+        '__module__': module,
+        '_fields': field_names,
+        '_field_types': tuple(_get_field_type(field_type) for _, field_type in fields),
+    })
+    record_class._value_type = RecordType(record_class)
+    return record_class
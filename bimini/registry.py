@@ -0,0 +1,131 @@
+"""
+A bounded cache of parsed types and their compiled codecs keyed by type
+string.
+"""
+import collections
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    NamedTuple,
+)
+
+from bimini.compiler import (
+    Codec,
+)
+
+if TYPE_CHECKING:
+    from bimini.types import BaseType  # noqa: F401
+
+
+DEFAULT_MAXSIZE = 1024
+
+
+RegistryStats = NamedTuple('RegistryStats', (
+    ('hits', int),
+    ('misses', int),
+    ('evictions', int),
+    ('size', int),
+    ('maxsize', int),
+))
+
+
+class CodecRegistry:
+    """
+    Cache the types parsed from type strings by ``parse`` along with their
+    compiled codecs.  At most ``maxsize`` type strings are cached, evicting
+    the least recently used.  The registry is safe to use from multiple
+    threads.
+
+    Types are interned, so a type which is evicted but still referenced
+    elsewhere keeps its compiled codec.
+    """
+    def __init__(self,
+                 parse: Callable[[str], 'BaseType[Any]'],
+                 maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize must not be negative: got {maxsize}")
+        self._parse = parse
+        self._maxsize = maxsize
+        self._types: 'collections.OrderedDict[str, BaseType[Any]]' = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __repr__(self) -> str:
+        return f'<CodecRegistry size={len(self._types)} maxsize={self._maxsize}>'
+
+    def get_type(self, type_str: str) -> 'BaseType[Any]':
+        """
+        Return the type described by ``type_str``.
+        """
+        if not isinstance(type_str, str):
+            raise TypeError('Can only parse string values: got {}'.format(type(type_str)))
+
+        with self._lock:
+            try:
+                value_type = self._types[type_str]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._types.move_to_end(type_str)
+                return value_type
+
+        # Parse outside of the lock.  Concurrent misses for the same string
+        # produce the same interned type.
+        value_type = self._parse(type_str)
+
+        with self._lock:
+            self._types[type_str] = value_type
+            self._types.move_to_end(type_str)
+            self._evict()
+        return value_type
+
+    def codec_for(self, type_str: str) -> Codec:
+        """
+        Return the compiled codec for the type described by ``type_str``.
+        """
+        return self.get_type(type_str).compile()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Change the maximum number of cached type strings, evicting the least
+        recently used entries if there are more than ``maxsize``.
+        """
+        if maxsize < 0:
+            raise ValueError(f"maxsize must not be negative: got {maxsize}")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def stats(self) -> RegistryStats:
+        with self._lock:
+            return RegistryStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._types),
+                maxsize=self._maxsize,
+            )
+
+    def clear(self) -> None:
+        """
+        Remove every cached entry and reset the statistics.
+        """
+        with self._lock:
+            self._types.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def _evict(self) -> None:
+        while len(self._types) > self._maxsize:
+            self._types.popitem(last=False)
+            self._evictions += 1
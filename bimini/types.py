@@ -2,55 +2,150 @@ from abc import (
     ABC,
     abstractmethod,
 )
-import io
+import threading
 from typing import (
     IO,
     Any,
     Generic,
+    Iterable,
+    Iterator,
+    TYPE_CHECKING,
+    Optional,
+    Sequence,
     Tuple,
     TypeVar,
+    Union,
 )
+import weakref
 
+from bimini.bitfield import (
+    Bitfield,
+    pack_bits,
+)
+from bimini.compiler import (
+    Buffer,
+    Codec,
+    CodeBuilder,
+    compile_codec,
+)
 from bimini.exceptions import (
     DecodingError,
     EncodingError,
 )
 from bimini.decoders import (
     decode_bool,
-    decode_uint,
-    decode_scalar,
     decode_bytes,
 )
 from bimini.parsers import (
     parse_bool,
     parse_uint,
-    parse_scalar,
-    parse_container,
-    parse_array,
-    parse_tuple,
-    parse_bytes,
 )
 from bimini.encoders import (
     encode_bool,
     encode_bytes,
-    encode_uint,
+)
+from bimini.integers import (
+    decode_scalar,
+    decode_scalar_from,
+    decode_uint,
     encode_scalar,
-    encode_container,
-    encode_tuple,
-    encode_array,
+    encode_uint,
+    read_scalar,
+)
+from bimini.views import (
+    ArrayView,
+    ContainerView,
 )
+from bimini.vectorized import (
+    HAS_NUMPY,
+    UINT_DTYPES,
+    VECTORIZE_THRESHOLD,
+    decode_scalar_array_from,
+    decode_uint_array_from,
+    encode_scalar_array,
+    encode_uint_array,
+    is_ndarray,
+    require_numpy,
+)
+
+if TYPE_CHECKING:
+    import asyncio  # noqa: F401
+    from numpy import ndarray  # noqa: F401
 
 
 T = TypeVar('T')
 
 
+# Every type in existence, keyed by its class and fields.
+_interned: 'weakref.WeakValueDictionary[Tuple[Any, ...], BaseType[Any]]' = (
+    weakref.WeakValueDictionary()
+)
+_intern_lock = threading.Lock()
+# Held while compiling so that each type is compiled at most once.  Deeply
+# nested types compile their children recursively.
+_compile_lock = threading.RLock()
+
+
 class BaseType(ABC, Generic[T]):
-    def __repr__(self) -> str:
-        return f'<{str(self)}>'
+    """
+    Types are immutable and interned: constructing a type with the same
+    fields as an existing one returns the existing instance.  Equality is
+    therefore identity and the structural hash is computed once.
+
+    The fields of each type are the public names in the ``__slots__`` of its
+    class, which are set from the constructor arguments in order.
+    """
+    __slots__ = ('_hash', '_codec', '_size_bounds', '__weakref__')
+
+    _fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)  # type: ignore
+        cls._fields = tuple(
+            name
+            for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get('__slots__', ())
+            if not name.startswith('_')
+        )
+
+    def __new__(cls, *args: Any) -> 'BaseType[Any]':
+        if len(args) != len(cls._fields):
+            raise TypeError(
+                f"{cls.__name__} takes {len(cls._fields)} arguments: got {len(args)}"
+            )
+        key = (cls,) + args
+        with _intern_lock:
+            try:
+                return _interned[key]
+            except KeyError:
+                pass
+
+            instance = super().__new__(cls)
+            for name, value in zip(cls._fields, args):
+                object.__setattr__(instance, name, value)
+            object.__setattr__(instance, '_hash', hash(key))
+            object.__setattr__(instance, '_codec', None)
+            object.__setattr__(instance, '_size_bounds', None)
+            _interned[key] = instance
+            return instance
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), tuple(getattr(self, name) for name in self._fields))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
-    @abstractmethod
     def __eq__(self, other: Any) -> bool:
-        pass
+        return self is other
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f'<{str(self)}>'
 
     @abstractmethod
     def __str__(self) -> str:
@@ -65,17 +160,139 @@ class BaseType(ABC, Generic[T]):
         pass
 
     def s_encode(self, stream: IO[bytes], value: T) -> None:
-        # TODO: optimize implementation for indivual types.
-        stream.write(self.encode(value))
+        """
+        Write the encoding of ``value`` to ``stream``.  Large encodings are
+        written in chunks rather than being assembled in memory first.
+        """
+        self.compile().s_encode(stream, value)
+
+    def encode_into(self, buf: Union[bytearray, memoryview], offset: int, value: T) -> int:
+        """
+        Write the encoding of ``value`` into ``buf`` starting at ``offset``,
+        returning the offset immediately following it.  A ``bytearray`` is
+        extended as needed while a ``memoryview`` must be large enough to hold
+        the encoding or ``EncodingError`` is raised.
+        """
+        return self.compile().encode_into(buf, offset, value)
 
     @abstractmethod
     def s_decode(self, stream: IO[bytes]) -> T:
         pass
 
+    async def async_decode(self, reader: 'asyncio.StreamReader') -> T:
+        """
+        Decode a value from ``reader``, consuming exactly its encoding.
+        Values of fixed size are read at once and other values read as much
+        of their encoding at once as their structure allows.
+        """
+        return await self.compile().async_decode(reader)
+
+    async def async_encode(self, writer: 'asyncio.StreamWriter', value: T) -> None:
+        """
+        Write the encoding of ``value`` to ``writer``, waiting for the
+        transport to drain after each chunk of the encoding.
+        """
+        await self.compile().async_encode(writer, value)
+
+    def decode_from(self, buf: Buffer, offset: int = 0) -> Tuple[T, int]:
+        """
+        Decode a value from ``buf`` starting at ``offset``, returning the
+        value and the offset immediately following its encoding.
+        """
+        return self.compile().decode_from(buf, offset)
+
+    def skip(self, buf: Buffer, offset: int = 0) -> int:
+        """
+        Return the offset immediately following the value encoded in ``buf``
+        at ``offset``.  The framing of the value is validated but nothing is
+        decoded.
+        """
+        return self.compile().skip_from(buf, offset)
+
+    def s_skip(self, stream: IO[bytes]) -> int:
+        """
+        Consume the value encoded at the current position of ``stream``
+        without decoding it, returning the number of bytes consumed.
+        """
+        return self.compile().s_skip(stream)
+
+    @property
+    def min_size(self) -> int:
+        """
+        The number of bytes in the shortest encoding of this type.
+        """
+        return self._get_size_bounds()[0]
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """
+        The number of bytes in the longest encoding of this type or ``None``
+        if the size of encodings is unbounded.
+        """
+        return self._get_size_bounds()[1]
+
+    @property
+    def is_fixed_size(self) -> bool:
+        """
+        Whether every encoding of this type has the same size.
+        """
+        min_size, max_size = self._get_size_bounds()
+        return min_size == max_size
+
+    @property
+    def fixed_size(self) -> Optional[int]:
+        """
+        The size of every encoding of this type or ``None`` if the size
+        depends on the value.
+        """
+        min_size, max_size = self._get_size_bounds()
+        if min_size == max_size:
+            return min_size
+        else:
+            return None
+
+    def _get_size_bounds(self) -> Tuple[int, Optional[int]]:
+        if self._size_bounds is None:
+            object.__setattr__(self, '_size_bounds', self._compute_size_bounds())
+        return self._size_bounds
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        """
+        Return the minimum and maximum encoded size of this type, with
+        ``None`` for an unbounded maximum.
+        """
+        return 0, None
+
+    def compile(self) -> Codec:
+        """
+        Return the :class:`~bimini.compiler.Codec` specialized for this type.
+        The codec is generated on first use and cached on the type.
+        """
+        if self._codec is None:
+            with _compile_lock:
+                if self._codec is None:
+                    object.__setattr__(self, '_codec', compile_codec(self))
+        return self._codec
+
+    @abstractmethod
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        pass
+
+    @abstractmethod
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        pass
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        # Types without a cheaper way to skip over their encoding are decoded
+        # and discarded.
+        builder.emit_decode(self, builder.new_var('x'))
+
 
 class BaseBit(BaseType[bool]):
-    def __eq__(self, other: Any) -> bool:
-        return type(self) is type(other)
+    __slots__ = ()
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        return 1, 1
 
     def encode(self, value: bool) -> bytes:
         return encode_bool(value)
@@ -86,23 +303,43 @@ class BaseBit(BaseType[bool]):
     def s_decode(self, stream: IO[bytes]) -> bool:
         return parse_bool(stream)
 
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        with builder.block(f'if {value} is True:'):
+            builder.write_byte('1')
+        with builder.block(f'elif {value} is False:'):
+            builder.write_byte('0')
+        with builder.block('else:'):
+            builder.emit(f'raise EncodingError(f"Invalid bit value: {{{value}!r}}")')
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        builder.require('1')
+        with builder.block('if buf[pos] == 1:'):
+            builder.emit(f'{target} = True')
+        with builder.block('elif buf[pos] == 0:'):
+            builder.emit(f'{target} = False')
+        with builder.block('else:'):
+            builder.emit('raise DecodingError(f"Invalid bit value: {buf[pos]}")')
+        builder.emit('pos += 1')
+
 
 class BitType(BaseBit):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return 'bit'
 
 
 class BoolType(BaseBit):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return 'bool'
 
 
 class UnsignedIntegerType(BaseType[int]):
-    def __init__(self, bit_size: int):
-        self.bit_size = bit_size
+    __slots__ = ('bit_size',)
 
-    def __eq__(self, other: Any) -> bool:
-        return isinstance(other, UnsignedIntegerType) and other.bit_size == self.bit_size
+    bit_size: int
 
     def __str__(self) -> str:
         return f'uint{self.bit_size}'
@@ -116,10 +353,32 @@ class UnsignedIntegerType(BaseType[int]):
     def s_decode(self, stream: IO[bytes]) -> int:
         return parse_uint(self.bit_size, stream)
 
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        if not value.isidentifier():
+            tmp = builder.new_var('t')
+            builder.emit(f'{tmp} = {value}')
+            value = tmp
+        with builder.block(f'if not 0 <= {value} < {1 << self.bit_size}:'):
+            builder.emit(
+                f'raise EncodingError(f"Integer {{{value}}} out of range for {self}")'
+            )
+        builder.write(f'{value}.to_bytes({self.bit_size // 8}, "little")', self.bit_size // 8)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        num_bytes = self.bit_size // 8
+        builder.require(str(num_bytes))
+        builder.emit(f'{target} = from_bytes(buf[pos:pos + {num_bytes}], "little")')
+        builder.emit(f'pos += {num_bytes}')
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        builder.advance(str(self.bit_size // 8))
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        return self.bit_size // 8, self.bit_size // 8
+
 
 class ByteType(BaseType[bytes]):
-    def __eq__(self, other: Any) -> bool:
-        return isinstance(other, ByteType)
+    __slots__ = ()
 
     def __str__(self) -> str:
         return f'byte'
@@ -140,13 +399,27 @@ class ByteType(BaseType[bytes]):
             raise EncodingError("TODO: INVALID")
         return data
 
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        with builder.block(f'if len({value}) != 1:'):
+            builder.emit(f'raise EncodingError(f"Invalid byte value: {{{value}!r}}")')
+        builder.write(value, 1)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        builder.require('1')
+        builder.emit(f'{target} = bytes(buf[pos:pos + 1])')
+        builder.emit('pos += 1')
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        builder.advance('1')
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        return 1, 1
+
 
 class ScalarType(BaseType[int]):
-    def __init__(self, bit_size: int):
-        self.bit_size = bit_size
+    __slots__ = ('bit_size',)
 
-    def __eq__(self, other: Any) -> bool:
-        return isinstance(other, ScalarType) and other.bit_size == self.bit_size
+    bit_size: int
 
     def __str__(self) -> str:
         return f'scalar{self.bit_size}'
@@ -158,98 +431,272 @@ class ScalarType(BaseType[int]):
         return decode_scalar(self.bit_size, data)
 
     def s_decode(self, stream: IO[bytes]) -> int:
-        return parse_scalar(self.bit_size, stream)
+        return read_scalar(self.bit_size, stream)
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        builder.write_leb128(value, self.bit_size)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        builder.read_leb128(self.bit_size, target)
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        builder.skip_leb128(self.bit_size)
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        return 1, (self.bit_size + 6) // 7
+
+
+# The type of the length prefix of arrays and byte strings.
+_LENGTH_TYPE = ScalarType(32)
 
 
 class ContainerType(BaseType[Tuple[Any, ...]]):
-    def __init__(self, element_types: Tuple[BaseType[Any], ...]):
-        self.element_types = element_types
+    __slots__ = ('element_types',)
 
-    def __eq__(self, other: Any) -> bool:
-        if not isinstance(other, ContainerType):
-            return False
-        elif len(self.element_types) != len(other.element_types):
-            return False
-        else:
-            return all(
-                mine == theirs
-                for mine, theirs
-                in zip(self.element_types, other.element_types)
-            )
+    element_types: Tuple[BaseType[Any], ...]
+
+    def __new__(cls, element_types: Iterable[BaseType[Any]]) -> 'ContainerType':
+        return super().__new__(cls, tuple(element_types))  # type: ignore
 
     def __str__(self) -> str:
         return f'{"{"}{",".join((str(element_type) for element_type in self.element_types))}{"}"}'
 
     def encode(self, elements: Tuple[Any, ...]) -> bytes:
-        element_encoders = tuple(
-            element_type.encode
-            for element_type
-            in self.element_types
-        )
-        return encode_container(element_encoders, elements)
+        return self.compile().encode(elements)
 
     def decode(self, data: bytes) -> Tuple[Any, ...]:
-        return self.s_decode(io.BytesIO(data))
+        return self.compile().decode(data)
 
     def s_decode(self, stream: IO[bytes]) -> Tuple[Any, ...]:
-        element_decoders = tuple(
-            element_type.s_decode
-            for element_type
-            in self.element_types
-        )
-        return parse_container(element_decoders, stream)
+        return self.compile().s_decode(stream)
+
+    def decode_lazy(self, buf: Buffer, offset: int = 0) -> ContainerView:
+        """
+        Return a view over the container encoded in ``buf`` at ``offset``
+        which only decodes elements as they are accessed.
+        """
+        return ContainerView(self, buf, offset)
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        num_elements = len(self.element_types)
+        with builder.block(f'if len({value}) != {num_elements}:'):
+            builder.emit(
+                f'raise EncodingError(f"Expected {num_elements} elements: got {{len({value})}}")'
+            )
+        if not num_elements:
+            return
+
+        elements = tuple(builder.new_var('e') for _ in self.element_types)
+        builder.emit(f'{", ".join(elements)}, = {value}')
+        for element_type, element in zip(self.element_types, elements):
+            builder.emit_encode(element_type, element)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        elements = tuple(builder.new_var('e') for _ in self.element_types)
+        for element_type, element in zip(self.element_types, elements):
+            builder.emit_decode(element_type, element)
+        if elements:
+            builder.emit(f'{target} = ({", ".join(elements)},)')
+        else:
+            builder.emit(f'{target} = ()')
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        fixed_size = self.fixed_size
+        if fixed_size is None:
+            for element_type in self.element_types:
+                builder.emit_skip(element_type)
+        elif fixed_size:
+            builder.advance(str(fixed_size))
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        min_size = sum(element_type.min_size for element_type in self.element_types)
+        max_sizes = tuple(element_type.max_size for element_type in self.element_types)
+        if None in max_sizes:
+            return min_size, None
+        else:
+            return min_size, sum(max_sizes)  # type: ignore
+
+
+class RecordType(ContainerType):
+    """
+    A container whose values are instances of ``record_class``, a class
+    generated by :func:`bimini.records.record` with an attribute for each
+    element.  The encoding is that of the plain container.
+    """
+    __slots__ = ('record_class',)
+
+    record_class: Any
+
+    def __new__(cls, record_class: Any) -> 'RecordType':  # type: ignore
+        return BaseType.__new__(cls, record_class._field_types, record_class)  # type: ignore
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self.record_class,))
+
+    def __repr__(self) -> str:
+        return f'<{self.record_class.__name__} {self}>'
+
+    def decode_lazy(self, buf: Buffer, offset: int = 0) -> Any:  # type: ignore
+        """
+        Return the record encoded in ``buf`` at ``offset``.  Records have no
+        lazy view so they are decoded immediately, including when nested in
+        a lazily decoded container or array.
+        """
+        value, _ = self.compile().decode_from(buf, offset)
+        return value
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        elements = tuple(builder.new_var('e') for _ in self.element_types)
+        if not elements:
+            builder.emit('pass')
+            return
+
+        with builder.block('try:'):
+            for name, element in zip(self.record_class._fields, elements):
+                builder.emit(f'{element} = {value}.{name}')
+        with builder.block('except AttributeError as err:'):
+            builder.emit(
+                f'raise EncodingError(f"Cannot encode {{{value}!r}} as '
+                f'{self.record_class.__name__}: {{err}}")'
+            )
+        for element_type, element in zip(self.element_types, elements):
+            builder.emit_encode(element_type, element)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        record_class = builder.add_const(self.record_class, self.record_class.__name__)
+        elements = tuple(builder.new_var('e') for _ in self.element_types)
+        for element_type, element in zip(self.element_types, elements):
+            builder.emit_decode(element_type, element)
+        builder.emit(f'{target} = {record_class}({", ".join(elements)})')
 
 
 class TupleType(BaseType[Tuple[Any, ...]]):
-    def __init__(self, item_type: BaseType, length: int):
-        self.length = length
-        self.item_type = item_type
+    __slots__ = ('item_type', 'length')
 
-    def __eq__(self, other: Any) -> bool:
-        if not isinstance(other, TupleType):
-            return False
-        else:
-            return self.item_type == other.item_type and self.length == other.length
+    item_type: BaseType[Any]
+    length: int
 
     def __str__(self) -> str:
-        return f'{str(self.item_type)}[{self.length}]'
+        return _format_array_type(self)
 
     def encode(self, values: Tuple[Any, ...]) -> bytes:
-        return encode_tuple(self.item_type.encode, values)
+        return self.compile().encode(values)
 
     def decode(self, data: bytes) -> Tuple[Any, ...]:
-        return self.s_decode(io.BytesIO(data))
+        return self.compile().decode(data)
 
     def s_decode(self, stream: IO[bytes]) -> Tuple[Any, ...]:
-        return parse_tuple(self.length, self.item_type.s_decode, stream)
+        return self.compile().s_decode(stream)
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        with builder.block(f'if len({value}) != {self.length}:'):
+            builder.emit(
+                f'raise EncodingError(f"Expected {self.length} items: got {{len({value})}}")'
+            )
+        _emit_encode_items(builder, self.item_type, value)
+
+    def iter_decode(self, stream: IO[bytes]) -> Iterator[Any]:
+        """
+        Decode the items of the tuple encoded at the current position of
+        ``stream`` one at a time.
+        """
+        return _iter_read_items(self.item_type, stream, self.length)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        _emit_decode_items(builder, self.item_type, str(self.length), target)
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        _emit_skip_items(builder, self.item_type, str(self.length))
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        min_size = self.item_type.min_size * self.length
+        max_size = self.item_type.max_size
+        if max_size is None:
+            return min_size, None
+        else:
+            return min_size, max_size * self.length
+
+    def decode_ndarray(self, data: Buffer) -> 'ndarray':
+        """
+        Decode a tuple of ``uint8``, ``uint16``, ``uint32`` or ``uint64``
+        values as a numpy array which shares memory with ``data``.
+        """
+        value, _ = self.decode_ndarray_from(data, 0)
+        return value
+
+    def decode_ndarray_from(self, buf: Buffer, offset: int = 0) -> Tuple['ndarray', int]:
+        bit_size = _get_ndarray_bit_size(self.item_type)
+        return decode_uint_array_from(bit_size, buf, offset, self.length)
 
 
 class ArrayType(BaseType[Tuple[Any, ...]]):
-    def __init__(self, item_type: BaseType):
-        self.item_type = item_type
+    __slots__ = ('item_type',)
 
-    def __eq__(self, other: Any) -> bool:
-        if not isinstance(other, ArrayType):
-            return False
-        else:
-            return self.item_type == other.item_type
+    item_type: BaseType[Any]
 
     def __str__(self) -> str:
-        return f'{str(self.item_type)}[]'
+        return _format_array_type(self)
 
     def encode(self, values: Tuple[Any, ...]) -> bytes:
-        return encode_array(self.item_type.encode, values)
+        return self.compile().encode(values)
 
     def decode(self, data: bytes) -> Tuple[Any, ...]:
-        return self.s_decode(io.BytesIO(data))
+        return self.compile().decode(data)
 
     def s_decode(self, stream: IO[bytes]) -> Tuple[Any, ...]:
-        return parse_array(self.item_type.s_decode, stream)
+        return self.compile().s_decode(stream)
+
+    def decode_lazy(self, buf: Buffer, offset: int = 0) -> ArrayView:
+        """
+        Return a view over the array encoded in ``buf`` at ``offset`` which
+        only decodes items as they are accessed.
+        """
+        return ArrayView(self, buf, offset)
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        builder.write_leb128(f'len({value})')
+        _emit_encode_items(builder, self.item_type, value)
+
+    def iter_decode(self, stream: IO[bytes]) -> Iterator[Any]:
+        """
+        Decode the items of the array encoded at the current position of
+        ``stream`` one at a time, so that arbitrarily long arrays can be
+        processed in constant memory.  The length prefix is read immediately
+        while each item is only read from the stream as it is requested.
+        """
+        length, _ = _LENGTH_TYPE.compile().read(stream, bytearray(), 0)
+        return _iter_read_items(self.item_type, stream, length)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        length = builder.new_var('n')
+        builder.read_leb128(32, length)
+        _emit_decode_items(builder, self.item_type, length, target)
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        length = builder.new_var('n')
+        builder.read_leb128(32, length)
+        _emit_skip_items(builder, self.item_type, length)
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        # The length prefix of an empty array.
+        return 1, None
+
+    def decode_ndarray(self, data: Buffer) -> 'ndarray':
+        """
+        Decode an array of ``uint8``, ``uint16``, ``uint32`` or ``uint64``
+        values as a numpy array which shares memory with ``data``.
+        """
+        value, _ = self.decode_ndarray_from(data, 0)
+        return value
+
+    def decode_ndarray_from(self, buf: Buffer, offset: int = 0) -> Tuple['ndarray', int]:
+        bit_size = _get_ndarray_bit_size(self.item_type)
+        length, offset = decode_scalar_from(32, buf, offset)
+        return decode_uint_array_from(bit_size, buf, offset, length)
 
 
 class BytesType(BaseType[bytes]):
-    def __eq__(self, other: Any) -> bool:
-        return isinstance(other, BytesType)
+    __slots__ = ()
 
     def __str__(self) -> str:
         return 'bytes'
@@ -261,52 +708,142 @@ class BytesType(BaseType[bytes]):
         return decode_bytes(data)
 
     def s_decode(self, stream: IO[bytes]) -> bytes:
-        return parse_bytes(stream)
+        return self.compile().s_decode(stream)
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        builder.write_leb128(f'len({value})')
+        builder.write(value)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        length = builder.new_var('n')
+        builder.read_leb128(32, length)
+        builder.require(length)
+        builder.emit(f'{target} = bytes(buf[pos:pos + {length}])')
+        builder.emit(f'pos += {length}')
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        length = builder.new_var('n')
+        builder.read_leb128(32, length)
+        builder.advance(length)
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        return 1, None
+
+
+class BitfieldType(BaseType[Bitfield]):
+    """
+    A dynamic length sequence of bits packed eight to a byte, least
+    significant bit first, after the number of bits as a ``scalar32``.  Any
+    padding bits in the last byte must be zero.
+    """
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        return 'bitfield'
+
+    def encode(self, value: Sequence[bool]) -> bytes:
+        return self.compile().encode(value)
+
+    def decode(self, data: bytes) -> Bitfield:
+        return self.compile().decode(data)
+
+    def s_decode(self, stream: IO[bytes]) -> Bitfield:
+        return self.compile().s_decode(stream)
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        pack = builder.add_const(pack_bits, 'pack_bits')
+        data = builder.new_var('t')
+        builder.emit(f'{data} = {pack}({value})')
+        builder.write_leb128(f'len({value})', 32)
+        builder.write(data)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        bitfield = builder.add_const(Bitfield, 'Bitfield')
+        length = builder.new_var('n')
+        num_bytes = builder.new_var('n')
+        data = builder.new_var('t')
+        builder.read_leb128(32, length)
+        builder.emit(f'{num_bytes} = ({length} + 7) >> 3')
+        builder.require(num_bytes)
+        builder.emit(f'{data} = bytes(buf[pos:pos + {num_bytes}])')
+        with builder.block(f'if {length} & 7 and {data}[-1] >> ({length} & 7):'):
+            builder.emit(f'raise {builder.error}("Invalid bitfield: padding bits are set")')
+        builder.emit(f'{target} = {bitfield}({data}, {length})')
+        builder.emit(f'pos += {num_bytes}')
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        length = builder.new_var('n')
+        builder.read_leb128(32, length)
+        builder.advance(f'({length} + 7) >> 3')
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        return 1, None
 
 
 class OptionalType(BaseType[Any]):
-    def __init__(self, value_type: BaseType) -> None:
-        self.value_type = value_type
+    __slots__ = ('value_type',)
 
-    def __eq__(self, other: Any) -> bool:
-        return isinstance(other, OptionalType) and other.value_type == self.value_type
+    value_type: BaseType[Any]
 
     def __str__(self) -> str:
         return f'{self.value_type}?'
 
     def encode(self, value: Any) -> bytes:
-        if value:
-            return b'\x01' + self.value_type.encode(value)
-        else:
-            return b'\x00'
+        return self.compile().encode(value)
 
     def decode(self, data: bytes) -> Any:
-        flag = data[0]
-        if flag == 0:
-            return b''
-        elif flag == 1:
-            return self.value_type.decode(data[1:])
-        else:
-            raise DecodingError('TODO: INVALID')
+        return self.compile().decode(data)
 
     def s_decode(self, stream: IO[bytes]) -> bytes:
-        flag = stream.read(1)
-        if flag == b'':
-            raise DecodingError('TODO: MISSING FLAG')
-        elif flag == b'\x00':
-            return b''
-        elif flag == b'\x01':
-            return self.value_type.s_decode(stream)
+        return self.compile().s_decode(stream)
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        if isinstance(self.value_type, (ArrayType, TupleType, BitfieldType)):
+            # The truth value of a numpy array is ambiguous so the presence
+            # of sequences is tested by their length.
+            present = f'{value} is not None and len({value})'
+        else:
+            present = value
+        with builder.block(f'if {present}:'):
+            builder.write_byte('1')
+            builder.emit_encode(self.value_type, value)
+        with builder.block('else:'):
+            builder.write_byte('0')
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        flag = builder.new_var('f')
+        builder.require('1')
+        builder.emit(f'{flag} = buf[pos]')
+        builder.emit('pos += 1')
+        with builder.block(f'if {flag} == 0:'):
+            builder.emit(f"{target} = b''")
+        with builder.block(f'elif {flag} == 1:'):
+            builder.emit_decode(self.value_type, target)
+        with builder.block('else:'):
+            builder.emit(f'raise DecodingError(f"Invalid optional flag: {{{flag}}}")')
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        flag = builder.new_var('f')
+        builder.require('1')
+        builder.emit(f'{flag} = buf[pos]')
+        builder.emit('pos += 1')
+        with builder.block(f'if {flag} == 1:'):
+            builder.emit_skip(self.value_type)
+        with builder.block(f'elif {flag} != 0:'):
+            builder.emit(f'raise DecodingError(f"Invalid optional flag: {{{flag}}}")')
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        max_size = self.value_type.max_size
+        if max_size is None:
+            return 1, None
         else:
-            raise DecodingError('TODO: INVALID')
+            return 1, 1 + max_size
 
 
 class FixedBytesType(BaseType[bytes]):
-    def __init__(self, length: int):
-        self.length = length
+    __slots__ = ('length',)
 
-    def __eq__(self, other: Any) -> bool:
-        return isinstance(other, FixedBytesType) and self.length == other.length
+    length: int
 
     def __str__(self) -> str:
         return f'bytes{self.length}'
@@ -326,3 +863,123 @@ class FixedBytesType(BaseType[bytes]):
         if len(value) != self.length:
             raise DecodingError("TODO: INVALID SIZE")
         return value
+
+    def _emit_encode(self, builder: CodeBuilder, value: str) -> None:
+        with builder.block(f'if len({value}) != {self.length}:'):
+            builder.emit(
+                f'raise EncodingError(f"Expected {self.length} bytes: got {{len({value})}}")'
+            )
+        builder.write(value, self.length)
+
+    def _emit_decode(self, builder: CodeBuilder, target: str) -> None:
+        builder.require(str(self.length))
+        builder.emit(f'{target} = bytes(buf[pos:pos + {self.length}])')
+        builder.emit(f'pos += {self.length}')
+
+    def _emit_skip(self, builder: CodeBuilder) -> None:
+        builder.advance(str(self.length))
+
+    def _compute_size_bounds(self) -> Tuple[int, Optional[int]]:
+        return self.length, self.length
+
+
+def _format_array_type(value_type: BaseType[Any]) -> str:
+    # Array suffixes in type strings apply from the outside in.
+    suffixes = []
+    while isinstance(value_type, (TupleType, ArrayType)):
+        if isinstance(value_type, TupleType):
+            suffixes.append(f'[{value_type.length}]')
+        else:
+            suffixes.append('[]')
+        value_type = value_type.item_type
+    return str(value_type) + ''.join(suffixes)
+
+
+def _is_ndarray_item_type(item_type: BaseType[Any]) -> bool:
+    return isinstance(item_type, UnsignedIntegerType) and item_type.bit_size in UINT_DTYPES
+
+
+def _get_ndarray_bit_size(item_type: BaseType[Any]) -> int:
+    require_numpy()
+    if _is_ndarray_item_type(item_type):
+        return item_type.bit_size
+    else:
+        raise TypeError(f"Cannot decode items of type {item_type} as a numpy array")
+
+
+def _iter_read_items(item_type: BaseType[Any], stream: IO[bytes], length: int) -> Iterator[Any]:
+    read = item_type.compile().read
+    for _ in range(length):
+        item, _ = read(stream, bytearray(), 0)
+        yield item
+
+
+def _emit_encode_items(builder: CodeBuilder, item_type: BaseType[Any], values: str) -> None:
+    if HAS_NUMPY and _is_ndarray_item_type(item_type):
+        check_ndarray = builder.add_const(is_ndarray, 'is_ndarray')
+        encode_uints = builder.add_const(encode_uint_array, 'encode_uints')
+        with builder.block(f'if {check_ndarray}({values}):'):
+            builder.write(f'{encode_uints}({item_type.bit_size}, {values})')
+        with builder.block('else:'):
+            _emit_encode_item_loop(builder, item_type, values)
+    elif HAS_NUMPY and isinstance(item_type, ScalarType):
+        encode_scalars = builder.add_const(encode_scalar_array, 'encode_scalars')
+        with builder.block(f'if len({values}) >= {VECTORIZE_THRESHOLD}:'):
+            builder.write(f'{encode_scalars}({item_type.bit_size}, {values})')
+        with builder.block('else:'):
+            _emit_encode_item_loop(builder, item_type, values)
+    else:
+        _emit_encode_item_loop(builder, item_type, values)
+
+
+def _emit_encode_item_loop(builder: CodeBuilder, item_type: BaseType[Any], values: str) -> None:
+    item = builder.new_var('i')
+    with builder.loop(f'for {item} in {values}:'):
+        builder.emit_encode(item_type, item)
+        builder.flush()
+
+
+def _emit_decode_items(builder: CodeBuilder,
+                       item_type: BaseType[Any],
+                       length: str,
+                       target: str) -> None:
+    if item_type == UnsignedIntegerType(8):
+        # single byte integers map directly onto the buffer.
+        builder.require(length)
+        builder.emit(f'{target} = tuple(buf[pos:pos + {length}])')
+        builder.emit(f'pos += {length}')
+    elif HAS_NUMPY and builder.in_memory and isinstance(item_type, ScalarType):
+        decode_scalars = builder.add_const(decode_scalar_array_from, 'decode_scalars')
+        with builder.block(f'if {length} >= {VECTORIZE_THRESHOLD}:'):
+            builder.emit(
+                f'{target}, pos = {decode_scalars}({item_type.bit_size}, buf, pos, {length})'
+            )
+        with builder.block('else:'):
+            _emit_decode_item_loop(builder, item_type, length, target)
+    else:
+        _emit_decode_item_loop(builder, item_type, length, target)
+
+
+def _emit_decode_item_loop(builder: CodeBuilder,
+                           item_type: BaseType[Any],
+                           length: str,
+                           target: str) -> None:
+    items = builder.new_var('l')
+    item = builder.new_var('i')
+    builder.emit(f'{items} = []')
+    with builder.checked_items(length, item_type.fixed_size):
+        with builder.loop(f'for _ in range({length}):'):
+            builder.emit_decode(item_type, item)
+            builder.emit(f'{items}.append({item})')
+    builder.emit(f'{target} = tuple({items})')
+
+
+def _emit_skip_items(builder: CodeBuilder, item_type: BaseType[Any], length: str) -> None:
+    item_size = item_type.fixed_size
+    if item_size == 1:
+        builder.advance(length)
+    elif item_size is not None:
+        builder.advance(f'{length} * {item_size}')
+    else:
+        with builder.loop(f'for _ in range({length}):'):
+            builder.emit_skip(item_type)
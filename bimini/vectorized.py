@@ -0,0 +1,226 @@
+"""
+Bulk encoding and decoding of integer arrays backed by numpy.
+
+numpy is an optional dependency.  When it is not installed ``HAS_NUMPY`` is
+``False`` and the compiled codecs never route values through this module.
+numpy is slow to import, so it is only imported on the first use of this
+module's functions.
+"""
+import functools
+import importlib.util
+import operator
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from bimini.exceptions import (
+    DecodingError,
+    EncodingError,
+)
+from bimini.integers import (
+    HIGH_MASK,
+    LOW_MASK,
+    decode_scalar_from,
+    encode_scalar,
+)
+
+if TYPE_CHECKING:
+    from numpy import ndarray  # noqa: F401
+
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+# Arrays shorter than this are faster to handle with plain python loops.
+VECTORIZE_THRESHOLD = 64
+
+# The longest LEB128 encoding which always fits in a uint64: 9 * 7 = 63 bits
+MAX_UINT64_LEB128_LENGTH = 9
+
+# Fixed width unsigned integers which map directly onto a numpy dtype.
+UINT_DTYPES = {
+    8: '<u1',
+    16: '<u2',
+    32: '<u4',
+    64: '<u8',
+}
+
+
+def require_numpy() -> None:
+    if not HAS_NUMPY:
+        raise ImportError("numpy is required: install it with `pip install bimini[numpy]`")
+
+
+def _import_numpy() -> Any:
+    import numpy
+    return numpy
+
+
+@functools.lru_cache(maxsize=None)
+def _leb128_thresholds() -> 'ndarray':
+    np = _import_numpy()
+    # Smallest value requiring each additional byte of LEB128 encoding.
+    return np.array([1 << shift for shift in range(7, 64, 7)], dtype=np.uint64)
+
+
+def is_ndarray(value: Any) -> bool:
+    # No value can be an array until numpy has been imported.
+    np = sys.modules.get('numpy')
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def _validate_uint_ndarray(bit_size: int, values: 'ndarray', type_str: str) -> None:
+    if values.ndim != 1:
+        raise EncodingError(f"Can only encode one dimensional arrays: got {values.ndim} dimensions")
+    elif values.dtype.kind == 'u' and values.dtype.itemsize * 8 <= bit_size:
+        return
+    elif values.dtype.kind not in 'iu':
+        raise EncodingError(f"Cannot encode array of dtype {values.dtype} as {type_str}")
+    elif not len(values):
+        return
+    elif int(values.min()) < 0 or int(values.max()) >= 2**bit_size:
+        raise EncodingError(f"Array contains values outside of the {type_str} range")
+
+
+def encode_scalar_array(bit_size: int, values: Union[Sequence[int], 'ndarray']) -> bytes:
+    """
+    Encode each of ``values`` as a ``scalar<bit_size>``, concatenated.
+    Values which do not fit in a uint64 fall back to python integer
+    arithmetic.
+    """
+    num_values = len(values)
+    if not num_values:
+        return b''
+
+    np = _import_numpy()
+
+    if is_ndarray(values):
+        _validate_uint_ndarray(min(bit_size, 64), values, f'scalar{bit_size}')  # type: ignore
+        arr = values.astype(np.uint64, copy=False)  # type: ignore
+    else:
+        try:
+            arr = np.fromiter(map(operator.index, values), dtype=np.uint64, count=num_values)
+        except (OverflowError, TypeError, ValueError):
+            return b''.join(encode_scalar(bit_size, value) for value in values)
+        if bit_size < 64 and int(arr.max()) >> bit_size:
+            raise EncodingError(f"Array contains values outside of the scalar{bit_size} range")
+
+    # Number of 7-bit groups needed for each value.
+    lengths = np.searchsorted(_leb128_thresholds(), arr, side='right') + 1
+    max_length = int(lengths.max())
+
+    # Lay out every value as a row of `max_length` 7-bit groups, flag all but
+    # the last group of each value as continued, and drop the unused groups.
+    columns = np.arange(max_length)
+    shifts = np.uint64(7) * columns.astype(np.uint64)
+    groups = ((arr[:, None] >> shifts) & np.uint64(LOW_MASK)).astype(np.uint8)
+    groups[columns < (lengths - 1)[:, None]] |= np.uint8(HIGH_MASK)
+    out = groups[columns < lengths[:, None]]
+
+    return out.tobytes()
+
+
+def decode_scalar_array_from(bit_size: int,
+                             buf: Union[bytes, bytearray, memoryview],
+                             offset: int,
+                             count: int) -> Tuple[Tuple[int, ...], int]:
+    """
+    Decode ``count`` consecutive LEB128 encoded integers from ``buf`` starting
+    at ``offset``, returning the values and the offset following the last one.
+    """
+    if not count:
+        return (), offset
+
+    np = _import_numpy()
+    max_length = (bit_size + 6) // 7
+    window_size = min(len(buf) - offset, count * max_length)
+    window = np.frombuffer(buf, dtype=np.uint8, count=max(window_size, 0), offset=offset)
+
+    # Every encoded integer ends with the first byte that has the high bit unset.
+    ends = np.flatnonzero(window < HIGH_MASK)[:count]
+    if len(ends) < count:
+        if window_size == count * max_length:
+            raise DecodingError(f"Decoded integer exceeds maximum bit size: {bit_size}")
+        raise DecodingError(
+            f"Insufficient bytes: needed {count} LEB128 integers at offset {offset}"
+        )
+
+    lengths = np.diff(ends, prepend=-1)
+    if int(lengths.max()) > max_length:
+        raise DecodingError(f"Decoded integer exceeds maximum bit size: {bit_size}")
+
+    total = int(ends[-1]) + 1
+    starts = ends - lengths + 1
+    data = window[:total]
+
+    byte_indices = np.arange(total) - np.repeat(starts, lengths)
+    components = (data & np.uint8(LOW_MASK)).astype(np.uint64) << (
+        np.uint64(7) * byte_indices.astype(np.uint64)
+    )
+    reduced = np.bitwise_or.reduceat(components, starts)
+    if bit_size < 64 and int(reduced.max()) >> bit_size:
+        raise DecodingError(f"Decoded integer exceeds maximum bit size: {bit_size}")
+    values = reduced.tolist()
+
+    for idx in np.flatnonzero(lengths > MAX_UINT64_LEB128_LENGTH).tolist():
+        values[idx], _ = decode_scalar_from(bit_size, buf, offset + int(starts[idx]))
+
+    return tuple(values), offset + total
+
+
+def encode_uint_array(bit_size: int, values: 'ndarray') -> bytes:
+    """
+    Encode a numpy array as consecutive little endian ``uint<bit_size>``
+    values, validating that every value is within range.
+    """
+    _validate_uint_ndarray(bit_size, values, f'uint{bit_size}')
+    return values.astype(UINT_DTYPES[bit_size], copy=False).tobytes()
+
+
+def decode_uint_array_from(bit_size: int,
+                           buf: Union[bytes, bytearray, memoryview],
+                           offset: int,
+                           count: int) -> Tuple['ndarray', int]:
+    """
+    Return a numpy view over ``count`` consecutive little endian
+    ``uint<bit_size>`` values in ``buf`` starting at ``offset`` without copying.
+    """
+    np = _import_numpy()
+    end = offset + count * (bit_size // 8)
+    if end > len(buf):
+        raise DecodingError(
+            f"Insufficient bytes: needed {end - offset} at offset {offset}, "
+            f"got {len(buf) - offset}"
+        )
+    return np.frombuffer(buf, dtype=UINT_DTYPES[bit_size], count=count, offset=offset), end
+
+
+def pack_bit_array(bits: 'ndarray') -> bytes:
+    """
+    Pack a one dimensional numpy array of bits eight to a byte, least
+    significant bit first.  The array must be boolean or hold only zeros and
+    ones.
+    """
+    np = _import_numpy()
+    if bits.ndim != 1:
+        raise EncodingError(f"Can only encode one dimensional arrays: got {bits.ndim} dimensions")
+    elif bits.dtype != np.bool_:
+        if bits.dtype.kind not in 'iu':
+            raise EncodingError(f"Cannot encode array of {bits.dtype} as bits")
+        elif bits.size and (bits.min() < 0 or bits.max() > 1):
+            raise EncodingError("Bit values must be 0 or 1")
+    return np.packbits(bits, bitorder='little').tobytes()
+
+
+def unpack_bit_array(data: bytes, length: int) -> 'ndarray':
+    """
+    Unpack the first ``length`` bits of ``data``, least significant bit first,
+    into a boolean numpy array.
+    """
+    np = _import_numpy()
+    packed = np.frombuffer(data, dtype=np.uint8)
+    return np.unpackbits(packed, count=length, bitorder='little').view(np.bool_)
@@ -0,0 +1,214 @@
+"""
+Lazily decoded views over encoded containers and arrays.
+
+A view holds a reference to the encoded buffer and decodes individual
+elements only when they are accessed.  The offsets of elements are found by
+skipping over the encodings of the preceding elements, which validates their
+framing without materializing them.
+"""
+from abc import abstractmethod
+from array import array
+import collections.abc
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    List,
+    MutableSequence,
+    Tuple,
+)
+
+from bimini.compiler import (
+    Buffer,
+)
+from bimini.decoders import (
+    decode_scalar_from,
+)
+from bimini.exceptions import (
+    DecodingError,
+)
+
+if TYPE_CHECKING:
+    from bimini.types import (  # noqa: F401
+        ArrayType,
+        BaseType,
+        ContainerType,
+    )
+
+
+_MISSING = object()
+
+
+def _normalize_buffer(buf: Buffer) -> Buffer:
+    if isinstance(buf, memoryview):
+        return buf.cast('B')
+    return buf
+
+
+def _decode_item(item_type: 'BaseType[Any]', buf: Buffer, offset: int) -> Any:
+    # Nested containers and arrays are themselves returned as lazy views.
+    decode_lazy = getattr(item_type, 'decode_lazy', None)
+    if decode_lazy is None:
+        value, _ = item_type.decode_from(buf, offset)
+        return value
+    else:
+        return decode_lazy(buf, offset)
+
+
+class _BaseView(collections.abc.Sequence):
+    __slots__ = ('buf', 'offset', '_offsets')
+
+    buf: Buffer
+    offset: int
+    _offsets: MutableSequence[int]
+
+    @abstractmethod
+    def _skip_item(self, index: int, offset: int) -> int:
+        pass
+
+    def _get_offset(self, index: int) -> int:
+        """
+        Return the offset of the item at ``index``, extending the offset table
+        by skipping over items as needed.
+        """
+        offsets = self._offsets
+        while len(offsets) <= index:
+            offsets.append(self._skip_item(len(offsets) - 1, offsets[-1]))
+        return offsets[index]
+
+    def _normalize_index(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"Index out of range: {index}")
+        return index
+
+    @property
+    def end_offset(self) -> int:
+        """
+        The offset immediately following the encoded value.
+        """
+        return self._get_offset(len(self))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, collections.abc.Sequence) or isinstance(other, (str, bytes)):
+            return False
+        return len(self) == len(other) and all(
+            mine == theirs
+            for mine, theirs
+            in zip(self, other)
+        )
+
+    __hash__ = None  # type: ignore
+
+
+class ContainerView(_BaseView):
+    """
+    A lazily decoded view over an encoded container.
+    """
+    __slots__ = ('container_type', '_values')
+
+    def __init__(self, container_type: 'ContainerType', buf: Buffer, offset: int = 0) -> None:
+        self.container_type = container_type
+        self.buf = _normalize_buffer(buf)
+        self.offset = offset
+        self._offsets: List[int] = [offset]
+        self._values = [_MISSING] * len(container_type.element_types)
+
+    def __repr__(self) -> str:
+        return f'<ContainerView {self.container_type} at offset {self.offset}>'
+
+    def __len__(self) -> int:
+        return len(self.container_type.element_types)
+
+    def _skip_item(self, index: int, offset: int) -> int:
+        return self.container_type.element_types[index].compile().skip_from(self.buf, offset)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return tuple(self[idx] for idx in range(*index.indices(len(self))))
+
+        index = self._normalize_index(index)
+        value = self._values[index]
+        if value is _MISSING:
+            element_type = self.container_type.element_types[index]
+            value = _decode_item(element_type, self.buf, self._get_offset(index))
+            self._values[index] = value
+        return value
+
+    def materialize(self) -> Tuple[Any, ...]:
+        """
+        Decode the complete container.
+        """
+        value, _ = self.container_type.decode_from(self.buf, self.offset)
+        return value
+
+
+class ArrayView(_BaseView):
+    """
+    A lazily decoded view over an encoded array.  The number of items is read
+    eagerly while the items themselves are decoded on access.
+    """
+    __slots__ = ('array_type', '_length', '_item_size', '_values')
+
+    def __init__(self, array_type: 'ArrayType', buf: Buffer, offset: int = 0) -> None:
+        self.array_type = array_type
+        self.buf = _normalize_buffer(buf)
+        self.offset = offset
+        self._length, items_offset = decode_scalar_from(32, self.buf, offset)
+        self._offsets = array('Q', (items_offset,))
+        self._item_size = array_type.item_type.fixed_size
+        self._values = {}
+
+    def __repr__(self) -> str:
+        return f'<ArrayView {self.array_type} at offset {self.offset}>'
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _skip_item(self, index: int, offset: int) -> int:
+        return self.array_type.item_type.compile().skip_from(self.buf, offset)
+
+    def _get_offset(self, index: int) -> int:
+        if self._item_size is None:
+            return super()._get_offset(index)
+
+        # The offsets of items of a fixed size are computed directly rather
+        # than by skipping over the preceding items.
+        items_offset = self._offsets[0]
+        offset = items_offset + index * self._item_size
+        if offset > len(self.buf):
+            raise DecodingError(
+                f"Insufficient bytes: needed {offset - items_offset} at offset "
+                f"{items_offset}, got {len(self.buf) - items_offset}"
+            )
+        return offset
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return tuple(self[idx] for idx in range(*index.indices(len(self))))
+
+        index = self._normalize_index(index)
+        try:
+            return self._values[index]
+        except KeyError:
+            value = _decode_item(self.array_type.item_type, self.buf, self._get_offset(index))
+            self._values[index] = value
+            return value
+
+    def __iter__(self) -> Iterator[Any]:
+        # Iteration does not retain the decoded items.
+        item_type = self.array_type.item_type
+        for index in range(self._length):
+            if index in self._values:
+                yield self._values[index]
+            else:
+                yield _decode_item(item_type, self.buf, self._get_offset(index))
+
+    def materialize(self) -> Tuple[Any, ...]:
+        """
+        Decode the complete array.
+        """
+        value, _ = self.array_type.decode_from(self.buf, self.offset)
+        return value
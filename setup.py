@@ -6,11 +6,13 @@ from setuptools import (
 )
 
 extras_require = {
-    'bimini': [
-        "parsimonious>=0.8.1,<0.9.0",
-        "cytoolz>=0.9.0.1,<0.10",
+    'bimini': [],
+    'numpy': [
+        "numpy>=1.17.0",
     ],
     'test': [
+        "cytoolz>=0.9.0.1,<0.10",
+        "numpy>=1.17.0",
         "pytest==4.3.0",
         "pytest-xdist",
         "tox>=2.9.1,<3",
@@ -69,7 +71,7 @@ setup(
     license="MIT",
     zip_safe=False,
     keywords='ethereum',
-    packages=find_packages(exclude=["tests", "tests.*"]),
+    packages=find_packages(exclude=["tests", "tests.*", "benchmarks", "benchmarks.*"]),
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from bimini.exceptions import (
+    DecodingError,
+    ParseError,
+)
+from bimini.grammar import parse
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class CountingReader(asyncio.StreamReader):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_reads = 0
+
+    async def readexactly(self, n):
+        self.num_reads += 1
+        return await super().readexactly(n)
+
+
+async def decode_chunks(value_type, chunks):
+    reader = CountingReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    value = await value_type.async_decode(reader)
+    return value, reader.num_reads, await reader.read()
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.chunks = []
+        self.num_drains = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+
+    async def drain(self):
+        self.num_drains += 1
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('bool', True),
+        ('uint64', 2**64 - 1),
+        ('scalar256', 2**255),
+        ('bytes', b'\x00' * 300),
+        ('bytes8?', b''),
+        ('bytes8?', b'\x01' * 8),
+        ('{bytes,scalar32,uint8[]}', (b'abc', 300, (1, 2, 3))),
+        ('{uint8,bool}[]', ((1, True),) * 200),
+        ('bytes[]', tuple(bytes(idx) for idx in range(200))),
+        ('uint16' + '[]' * 16, ((((((((((((((((1, 2),),),),),),),),),),),),),),),)),
+    ),
+)
+def test_async_round_trip(type_str, value):
+    value_type = parse(type_str)
+    writer = RecordingWriter()
+    run(value_type.async_encode(writer, value))
+    encoded = b''.join(writer.chunks)
+
+    assert encoded == value_type.encode(value)
+    assert writer.num_drains == len(writer.chunks)
+
+    decoded, _, remaining = run(decode_chunks(value_type, (encoded, b'\xff')))
+    assert decoded == value
+    assert remaining == b'\xff'
+
+
+def test_async_decode_batches_fixed_size_reads():
+    value_type = parse('{bytes32,bytes32,uint64}[]')
+    value = ((b'\x01' * 32, b'\x02' * 32, 3),) * 100
+    encoded = value_type.encode(value)
+
+    decoded, num_reads, _ = run(decode_chunks(value_type, (encoded,)))
+    assert decoded == value
+    # one read for the length prefix and one for all of the items.
+    assert num_reads == 2
+
+
+def test_async_encode_drains_between_chunks():
+    value_type = parse('bytes')
+    writer = RecordingWriter()
+    run(value_type.async_encode(writer, b'\x00' * 200000))
+
+    assert len(writer.chunks) == 4
+    assert writer.num_drains == 4
+
+
+@pytest.mark.parametrize(
+    'type_str,data,error',
+    (
+        ('{uint16}', b'\x01', ParseError),
+        ('{bytes}', b'\x05\x01', ParseError),
+        ('uint32[]', b'\x02\x00\x00\x00\x00', ParseError),
+        ('{bit}', b'\x02', DecodingError),
+        ('{scalar8}', b'\xff\xff', ParseError),
+    ),
+)
+def test_async_decode_errors(type_str, data, error):
+    with pytest.raises(error):
+        run(decode_chunks(parse(type_str), (data,)))
@@ -0,0 +1,148 @@
+import multiprocessing
+
+import pytest
+
+from bimini import batch
+from bimini.exceptions import (
+    DecodingError,
+)
+from bimini.grammar import parse
+from bimini.records import record
+from bimini.types import ArrayType
+
+
+HEADER_TYPE_STR = '{bytes32,bytes20,uint256,scalar256,scalar64,bytes,bytes8?}'
+
+
+Header = record('Header', zip(
+    ('parent_hash', 'miner', 'difficulty', 'nonce', 'number', 'extra', 'mix'),
+    parse(HEADER_TYPE_STR).element_types,
+))
+
+
+def make_header(idx):
+    return (bytes([idx % 256]) * 32, b'\x02' * 20, idx, 2**200 + idx, idx, bytes(idx % 7), b'')
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_decode_many(workers):
+    value_type = parse(HEADER_TYPE_STR)
+    values = [make_header(idx) for idx in range(100)]
+    blobs = [value_type.encode(value) for value in values]
+
+    assert batch.decode_many(value_type, blobs, workers=workers) == values
+    assert batch.decode_many(HEADER_TYPE_STR, blobs, workers=workers) == values
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_encode_many(workers):
+    value_type = parse(HEADER_TYPE_STR)
+    values = [make_header(idx) for idx in range(100)]
+
+    assert batch.encode_many(value_type, values, workers=workers) == [
+        value_type.encode(value) for value in values
+    ]
+
+
+def test_decode_many_empty():
+    assert batch.decode_many('bytes', [], workers=2) == []
+    assert batch.encode_many('bytes', [], workers=2) == []
+
+
+def test_decode_many_mixed_buffers():
+    blobs = [b'\x01a', bytearray(b'\x00'), memoryview(b'\x02bc')] * 10
+    assert batch.decode_many('bytes', blobs, workers=2) == [b'a', b'', b'bc'] * 10
+
+
+def test_decode_many_invalid_blob():
+    blobs = [b'\x01\x01'] * 10 + [b'\x01']
+    with pytest.raises(DecodingError):
+        batch.decode_many('uint16', blobs, workers=2)
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('bytes[]', tuple(bytes(idx % 50) for idx in range(1000))),
+        ('uint32[]', tuple(range(1000))),
+        ('{bytes32,bytes32,uint64}[]', ((b'\x01' * 32, b'\x02' * 32, 3),) * 100),
+        (HEADER_TYPE_STR + '[]', tuple(make_header(idx) for idx in range(300))),
+        ('bytes[]', ()),
+        ('bytes[]', (b'a',)),
+    ),
+)
+@pytest.mark.parametrize('workers', (1, 3))
+def test_decode_array_parallel(type_str, value, workers):
+    value_type = parse(type_str)
+    encoded = value_type.encode(value)
+
+    assert batch.decode_array_parallel(value_type, encoded, workers=workers) == value
+    assert batch.decode_array_parallel(type_str, bytearray(encoded), workers=workers) == value
+
+
+@pytest.mark.parametrize(
+    'type_str,data',
+    (
+        ('bytes[]', b'\x03\x01a\x01b\x05c'),
+        ('uint32[]', b'\x02\x00\x00\x00\x00\x00\x00\x00'),
+        ('bytes[]', b'\xff'),
+    ),
+)
+def test_decode_array_parallel_invalid(type_str, data):
+    with pytest.raises(DecodingError):
+        batch.decode_array_parallel(type_str, data, workers=2)
+
+
+def test_decode_array_parallel_requires_array():
+    with pytest.raises(TypeError):
+        batch.decode_array_parallel('bytes[3]', b'\x00\x00\x00', workers=2)
+
+
+def test_batch_with_caller_pool():
+    value_type = parse(HEADER_TYPE_STR)
+    values = [make_header(idx) for idx in range(100)]
+    array_type = parse(HEADER_TYPE_STR + '[]')
+
+    with multiprocessing.Pool(2) as pool:
+        for _ in range(3):
+            blobs = batch.encode_many(value_type, values, pool=pool)
+            assert batch.decode_many(value_type, blobs, pool=pool) == values
+            assert batch.decode_array_parallel(
+                array_type, array_type.encode(values), pool=pool,
+            ) == tuple(values)
+
+        # The pool is still usable after a failed batch.
+        with pytest.raises(DecodingError):
+            batch.decode_many('uint16', [b'\x01\x01'] * 10 + [b'\x01'], pool=pool)
+        assert batch.decode_many('uint16', [b'\x01\x00'] * 10, pool=pool) == [1] * 10
+
+
+def test_batch_without_shared_memory(monkeypatch):
+    monkeypatch.setattr(batch, 'HAS_SHARED_MEMORY', False)
+    value_type = parse(HEADER_TYPE_STR)
+    values = [make_header(idx) for idx in range(100)]
+    array_type = parse(HEADER_TYPE_STR + '[]')
+
+    blobs = [value_type.encode(value) for value in values]
+    assert batch.decode_many(value_type, blobs, workers=2) == values
+    assert batch.decode_array_parallel(array_type, array_type.encode(values), workers=3) == (
+        tuple(values)
+    )
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_batch_records(workers):
+    value_type = Header._value_type
+    values = [Header(*make_header(idx)) for idx in range(20)]
+    blobs = [value_type.encode(value) for value in values]
+
+    decoded = batch.decode_many(value_type, blobs, workers=workers)
+    assert decoded == values
+    assert all(type(value) is Header for value in decoded)
+    assert batch.encode_many(value_type, values, workers=workers) == blobs
+
+    array_type = ArrayType(value_type)
+    data = array_type.encode(values)
+    decoded = batch.decode_array_parallel(array_type, data, workers=workers)
+    assert decoded == tuple(values)
+    assert all(type(value) is Header for value in decoded)
@@ -0,0 +1,196 @@
+import io
+import pickle
+import random
+
+import pytest
+
+from bimini.bitfield import (
+    Bitfield,
+    pack_bits,
+)
+from bimini.exceptions import (
+    DecodingError,
+    EncodingError,
+    ParseError,
+)
+from bimini.grammar import parse
+
+
+def _random_bits(length, seed=0):
+    rng = random.Random(seed)
+    return tuple(rng.random() < 0.5 for _ in range(length))
+
+
+def _pack_bits_slowly(bits):
+    packed = bytearray((len(bits) + 7) // 8)
+    for index, bit in enumerate(bits):
+        if bit:
+            packed[index // 8] |= 1 << (index % 8)
+    return bytes(packed)
+
+
+@pytest.mark.parametrize(
+    'bits,expected',
+    (
+        ((), b'\x00'),
+        ((False,), b'\x01\x00'),
+        ((True,), b'\x01\x01'),
+        ((True, False, True), b'\x03\x05'),
+        ((0, 1, 0, 0, 0, 0, 0, 0), b'\x08\x02'),
+        ((True,) * 9, b'\x09\xff\x01'),
+        ((False,) * 8 + (True,), b'\x09\x00\x01'),
+    ),
+)
+def test_bitfield_encoding(bits, expected):
+    bitfield_type = parse('bitfield')
+
+    assert bitfield_type.encode(bits) == expected
+    assert bitfield_type.encode(list(bits)) == expected
+    assert bitfield_type.decode(expected) == bits
+    assert bitfield_type.s_decode(io.BytesIO(expected)) == bits
+    assert bitfield_type.skip(expected) == len(expected)
+
+
+@pytest.mark.parametrize('length', (0, 1, 7, 8, 9, 63, 64, 65, 2048, 10000))
+def test_bitfield_round_trip(length):
+    bits = _random_bits(length, seed=length)
+    bitfield_type = parse('bitfield')
+
+    encoded = bitfield_type.encode(bits)
+    decoded = bitfield_type.decode(encoded)
+
+    assert isinstance(decoded, Bitfield)
+    assert decoded == bits
+    assert tuple(decoded) == bits
+    assert decoded.to_bytes() == _pack_bits_slowly(bits)
+    assert bitfield_type.encode(decoded) == encoded
+    assert len(encoded) < len(parse('bit[]').encode(bits)) or length < 2
+
+
+def test_bitfield_nested():
+    value_type = parse('{bitfield,bitfield?[2]}[]')
+    value = (
+        ((True, False), ((True,) * 20, b'')),
+        ((), ((False, True), (True,))),
+    )
+    assert value_type.decode(value_type.encode(value)) == value
+
+
+@pytest.mark.parametrize(
+    'bits',
+    (
+        (2,),
+        (True, -1),
+        (None,),
+        ('1',),
+        '0101',
+        (True, 256),
+    ),
+)
+def test_bitfield_encoding_invalid_bits(bits):
+    with pytest.raises(EncodingError):
+        parse('bitfield').encode(bits)
+
+
+@pytest.mark.parametrize(
+    'data',
+    (
+        # padding bits set
+        b'\x01\x02',
+        b'\x09\xff\x02',
+        # missing bytes
+        b'\x09\xff',
+        b'\x01',
+    ),
+)
+def test_bitfield_decoding_invalid(data):
+    bitfield_type = parse('bitfield')
+    with pytest.raises(DecodingError):
+        bitfield_type.decode(data)
+    with pytest.raises(ParseError):
+        bitfield_type.s_decode(io.BytesIO(data))
+
+
+def test_bitfield_sequence():
+    bits = _random_bits(100)
+    bitfield = Bitfield.from_bits(bits)
+
+    assert len(bitfield) == 100
+    assert [bitfield[index] for index in range(100)] == list(bits)
+    assert bitfield[-1] is bits[-1]
+    assert bitfield[3:50] == bits[3:50]
+    assert isinstance(bitfield[3:50], Bitfield)
+    assert bitfield[::-3] == bits[::-3]
+    assert bitfield[90:10] == ()
+    assert bitfield.count(True) == bits.count(True)
+    assert bitfield.count(False) == bits.count(False)
+    assert bitfield.count(None) == 0
+    assert True in bitfield
+    assert hash(bitfield) == hash(bits)
+    assert Bitfield.from_bits(iter(bits)) == bitfield
+    assert pickle.loads(pickle.dumps(bitfield)) == bitfield
+    assert bitfield != bits[:-1]
+    assert bitfield != 'x' * 100
+
+    with pytest.raises(IndexError):
+        bitfield[100]
+
+
+@pytest.mark.parametrize(
+    'data,length',
+    (
+        (b'', 1),
+        (b'\x00', 0),
+        (b'\x00', 9),
+        (b'\x08', 3),
+    ),
+)
+def test_bitfield_invalid_construction(data, length):
+    with pytest.raises(ValueError):
+        Bitfield(data, length)
+
+
+@pytest.mark.parametrize('length', (0, 1, 8, 13, 1000))
+def test_bitfield_ndarray(length):
+    np = pytest.importorskip('numpy')
+    bits = _random_bits(length)
+    array = np.array(bits, dtype=bool)
+
+    assert pack_bits(array) == _pack_bits_slowly(bits)
+    assert pack_bits(array.astype(np.uint8)) == _pack_bits_slowly(bits)
+    assert parse('bitfield').encode(array) == parse('bitfield').encode(bits)
+
+    unpacked = Bitfield.from_bits(bits).to_ndarray()
+    assert unpacked.dtype == np.bool_
+    assert unpacked.tolist() == list(bits)
+
+
+def test_bitfield_ndarray_invalid():
+    np = pytest.importorskip('numpy')
+    with pytest.raises(EncodingError):
+        pack_bits(np.array([0, 2]))
+    with pytest.raises(EncodingError):
+        pack_bits(np.array([0.0, 1.0]))
+    with pytest.raises(EncodingError):
+        pack_bits(np.zeros((2, 2), dtype=bool))
+
+
+@pytest.mark.parametrize('length', (0, 1, 9, 8000, 100000))
+def test_bitfield_skip_in_container(length):
+    value_type = parse('{bytes32,bitfield,uint8}')
+    encoded = value_type.encode((b'\x01' * 32, _random_bits(length), 7))
+
+    assert value_type.skip(encoded) == len(encoded)
+    assert value_type.s_skip(io.BytesIO(encoded + b'\xff')) == len(encoded)
+
+
+@pytest.mark.parametrize('length', (9, 8000, 100000))
+def test_bitfield_skip_truncated(length):
+    value_type = parse('{bytes32,bitfield}')
+    encoded = value_type.encode((b'\x01' * 32, _random_bits(length)))
+
+    for truncated in (encoded[:33], encoded[:-1]):
+        with pytest.raises(DecodingError):
+            value_type.skip(truncated)
+        with pytest.raises(ParseError):
+            value_type.s_skip(io.BytesIO(truncated))
@@ -0,0 +1,114 @@
+import io
+import tracemalloc
+
+import pytest
+
+from bimini.compiler import (
+    READ_CHUNK_SIZE,
+)
+from bimini.exceptions import (
+    DecodingError,
+    EncodingError,
+    ParseError,
+)
+from bimini.grammar import parse
+
+
+HEADER_TYPE_STR = '{bytes32,bytes20,uint256,scalar256,scalar64,bytes,bytes8?}'
+HEADER = (b'\x01' * 32, b'\x02' * 20, 2**255, 2**200 + 1, 12345, b'extra', b'\x03' * 8)
+
+
+def test_compile_is_cached():
+    container_type = parse('{uint8,scalar32}')
+    assert container_type.compile() is container_type.compile()
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('{bit,bool,byte,uint8,uint16,scalar8,scalar256}', (True, False, b'\xff', 1, 2, 3, 2**255)),
+        ('{bytes,bytes4}', (b'dynamic', b'\x00\x01\x02\x03')),
+        ('{uint8,{uint16,{scalar32,bytes}}}', (1, (2, (3, b'nested')))),
+        ('uint8[]', tuple(range(256))),
+        ('scalar64[]', tuple(range(0, 2**64, 2**58))),
+        ('{bytes,scalar16}[]', ((b'a', 1), (b'bb', 2**16 - 1))),
+        ('uint16[3][]', ((1, 2), (3,), ())),
+        ('bytes32?', b'\x01' * 32),
+        ('bytes32?', b''),
+        ('{%s,%s[]}' % (HEADER_TYPE_STR, HEADER_TYPE_STR), (HEADER, (HEADER,) * 200)),
+    ),
+)
+def test_compiled_round_trip(type_str, value):
+    value_type = parse(type_str)
+    encoded = value_type.encode(value)
+    assert value_type.decode(encoded) == value
+    assert value_type.s_decode(io.BytesIO(encoded)) == value
+
+
+def test_compiled_deeply_nested_types():
+    value_type = parse('uint16' + '[]' * 24)
+    value = (1, 2)
+    for _ in range(23):
+        value = (value,)
+
+    assert value_type.decode(value_type.encode(value)) == value
+
+
+def test_s_decode_leaves_trailing_bytes():
+    stream = io.BytesIO(b'\x01\x02\x03\x04')
+    assert parse('{uint8,scalar8}').s_decode(stream) == (1, 2)
+    assert stream.read() == b'\x03\x04'
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('{uint8,uint8}', (1,)),
+        ('uint8[2]', (1, 2, 3)),
+        ('bytes4', b'\x00'),
+        ('{byte}', (b'',)),
+        ('{bit}', (1,)),
+        ('scalar32', -1),
+        ('{uint16}', (-1,)),
+        ('{uint16}', (2**16,)),
+        ('uint8[]', (256,)),
+        ('uint256[2]', (0, 2**256)),
+        ('uint64?', -1),
+    ),
+)
+def test_compiled_encoding_errors(type_str, value):
+    with pytest.raises(EncodingError):
+        parse(type_str).compile().encode(value)
+
+
+@pytest.mark.parametrize(
+    'type_str,data,error',
+    (
+        ('{uint16}', b'\x01', ParseError),
+        ('{bytes}', b'\x05\x01', ParseError),
+        ('{bit}', b'\x02', DecodingError),
+        ('{scalar8}', b'\xff\xff', ParseError),
+        ('uint8?', b'\x02', DecodingError),
+    ),
+)
+def test_compiled_decoding_errors(type_str, data, error):
+    with pytest.raises(error):
+        parse(type_str).s_decode(io.BytesIO(data))
+
+
+@pytest.mark.parametrize('type_str', ('bytes', 'uint8[]', 'uint32[]', '{bytes32[],uint8}'))
+def test_stream_decoding_bogus_length(type_str, tmp_path):
+    # Claims 2**32 - 1 items but provides a few bytes.  Unlike `io.BytesIO`,
+    # files allocate the full size of a read up front.
+    path = tmp_path / 'data'
+    path.write_bytes(b'\xff\xff\xff\xff\x0f' + b'\x00' * 100)
+    value_type = parse(type_str)
+    value_type.compile()
+    tracemalloc.start()
+    try:
+        with pytest.raises(ParseError), path.open('rb') as stream:
+            value_type.s_decode(stream)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 2 * READ_CHUNK_SIZE + 2**16
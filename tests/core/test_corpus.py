@@ -0,0 +1,112 @@
+import pytest
+
+from bimini.corpus import (
+    ITEM,
+    PRESETS,
+    CorpusGenerator,
+    constant,
+    log_uniform,
+    preset,
+    random_bytes,
+    uniform,
+)
+from bimini.grammar import parse
+from bimini.records import record
+
+
+@pytest.mark.parametrize(
+    'type_str',
+    (
+        'bit',
+        'bool',
+        'byte',
+        'uint8',
+        'uint256',
+        'scalar8',
+        'scalar256',
+        'bytes',
+        'bytes32',
+        'bitfield',
+        '{bitfield?,bitfield[]}',
+        'uint8?',
+        '{}?',
+        'bytes[]?',
+        '{uint8,bytes,bool?}',
+        'scalar64[4]',
+        'bytes[][2]',
+        '{bytes,{scalar32,uint8[]}[]}[]',
+    ),
+)
+def test_generated_values_round_trip(type_str):
+    value_type = parse(type_str)
+    for value in CorpusGenerator(value_type, seed=1).samples(50):
+        assert value_type.decode(value_type.encode(value)) == value
+
+
+@pytest.mark.parametrize('name', sorted(PRESETS))
+def test_presets_round_trip(name):
+    generator = preset(name, seed=2)
+    value_type = generator.value_type
+    for value in generator.samples(10):
+        assert value_type.decode(value_type.encode(value)) == value
+
+
+def test_generation_is_deterministic():
+    assert preset('block', seed=3).samples(5) == preset('block', seed=3).samples(5)
+    assert preset('block', seed=3).samples(5) != preset('block', seed=4).samples(5)
+
+    values = CorpusGenerator('{bytes,scalar64[]}', seed=5).samples(20)
+    assert CorpusGenerator('{bytes,scalar64[]}', seed=5).samples(20) == values
+
+
+def test_distributions():
+    generator = CorpusGenerator(
+        '{bytes,uint8[],scalar256}',
+        bytes_length=uniform(3, 5),
+        array_length=constant(7),
+        scalar_bits=constant(200),
+    )
+    for data, items, scalar in generator.samples(100):
+        assert 3 <= len(data) <= 5
+        assert len(items) == 7
+        assert scalar < 2**200
+
+    sample = log_uniform(0, 1000)
+    values = [sample(generator.rng) for _ in range(1000)]
+    assert min(values) >= 0 and max(values) <= 1000
+    assert sorted(values)[500] < 100
+
+
+def test_lengths_and_overrides():
+    generator = CorpusGenerator(
+        '{bytes,bytes,{bytes32,uint8}[]}',
+        lengths={(1,): constant(2), (2,): constant(3)},
+        overrides={(0,): random_bytes(9), (2, ITEM, 1): constant(42)},
+    )
+    for first, second, items in generator.samples(20):
+        assert len(first) == 9
+        assert len(second) == 2
+        assert len(items) == 3
+        assert all(item[1] == 42 for item in items)
+
+
+def test_preset_options():
+    for block in preset('block', lengths={(1,): constant(300)}).samples(3):
+        assert len(block[1]) == 300
+
+    for header in preset('header', overrides={(11,): constant(1)}).samples(3):
+        assert header[11] == 1
+
+
+def test_optional_rate():
+    assert set(CorpusGenerator('uint8?', optional_rate=0).samples(50)) == {b''}
+    assert b'' not in CorpusGenerator('bytes32?', optional_rate=1).samples(50)
+
+
+def test_generated_records():
+    Point = record('Point', (('x', 'scalar64'), ('y', 'scalar64'), ('label', 'bytes?')))
+    value_type = Point._value_type
+    for point in CorpusGenerator(value_type, seed=1, overrides={(0,): constant(7)}).samples(20):
+        assert type(point) is Point
+        assert point.x == 7
+        assert value_type.decode(value_type.encode(point)) == point
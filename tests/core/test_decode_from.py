@@ -0,0 +1,63 @@
+import pytest
+
+from bimini.exceptions import (
+    DecodingError,
+)
+from bimini.grammar import parse
+
+
+@pytest.mark.parametrize(
+    'type_str,data,expected',
+    (
+        ('bit', b'\x01', True),
+        ('bool', b'\x00', False),
+        ('byte', b'\xab', b'\xab'),
+        ('uint16', b'\x01\x02', 0x0201),
+        ('scalar16', b'\xff\xff\x03', 2**16 - 1),
+        ('bytes', b'\x02\xff\xff', b'\xff\xff'),
+        ('bytes2', b'\xff\xfe', b'\xff\xfe'),
+        ('uint8?', b'\x01\x05', 5),
+        ('uint8?', b'\x00', b''),
+        ('{byte,uint8[]}', b'\xab\x02\x01\x02', (b'\xab', (1, 2))),
+        ('bytes[]', b'\x02\x01\x00\x00', (b'\x00', b'')),
+    ),
+)
+@pytest.mark.parametrize('buffer_type', (bytes, bytearray, memoryview))
+def test_decode_from(type_str, data, expected, buffer_type):
+    buf = buffer_type(b'\xff\xff' + data + b'\xee')
+    value, offset = parse(type_str).decode_from(buf, 2)
+
+    assert value == expected
+    assert offset == 2 + len(data)
+    if isinstance(value, bytes):
+        assert type(value) is bytes
+
+
+def test_decode_from_consecutive_values():
+    value_type = parse('{scalar32,bytes}')
+    data = b''.join(value_type.encode((idx, bytes(idx))) for idx in range(200))
+
+    offset = 0
+    values = []
+    while offset < len(data):
+        value, offset = value_type.decode_from(data, offset)
+        values.append(value)
+
+    assert values == [(idx, bytes(idx)) for idx in range(200)]
+
+
+@pytest.mark.parametrize(
+    'type_str,data',
+    (
+        ('uint16', b'\x01'),
+        ('scalar32', b'\x80\x80'),
+        ('scalar8', b'\xff\xff'),
+        ('bytes', b'\x05\x01'),
+        ('bytes4', b'\x01\x02'),
+        ('{uint8,uint8}', b'\x01'),
+        ('uint8[]', b'\x03\x01\x02'),
+    ),
+)
+def test_decode_from_insufficient_or_invalid_data(type_str, data):
+    with pytest.raises(DecodingError):
+        parse(type_str).decode_from(data, 0)
@@ -0,0 +1,15 @@
+from bimini._utils.decorators import (
+    curry,
+)
+
+
+def test_curry():
+    @curry
+    def add(a, b, c=0):
+        return a + b + c
+
+    assert add(1, 2) == 3
+    assert add(1)(2) == 3
+    assert add(1)(2, c=3) == 6
+    assert add(1, b=2) == 3
+    assert add.__name__ == 'add'
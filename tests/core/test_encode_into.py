@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from bimini.exceptions import (
+    EncodingError,
+)
+from bimini.grammar import parse
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('bool', True),
+        ('byte', b'\x01'),
+        ('uint64', 2**64 - 1),
+        ('scalar256', 2**255),
+        ('bytes', b'\x00' * 300),
+        ('bytes32', b'\x01' * 32),
+        ('bytes8?', b''),
+        ('bytes8?', b'\x01' * 8),
+        ('{bytes32,bytes32,uint64}', (b'\x00' * 32, b'\x01' * 32, 5)),
+        ('{bytes,scalar32,uint8[]}', (b'abc', 300, (1, 2, 3))),
+        ('uint16[4]', (1, 2, 3, 4)),
+        ('{uint8,bool}[]', ((1, True),) * 200),
+        ('bytes[]', tuple(bytes(idx) for idx in range(200))),
+        ('scalar64[]', tuple(range(0, 2**64, 2**50))),
+    ),
+)
+def test_encode_into_matches_encode(type_str, value):
+    value_type = parse(type_str)
+    encoded = value_type.encode(value)
+
+    buf = bytearray(b'\xff')
+    assert value_type.encode_into(buf, 1, value) == len(encoded) + 1
+    assert buf == b'\xff' + encoded
+
+    buf = bytearray(len(encoded) + 2)
+    assert value_type.encode_into(memoryview(buf), 1, value) == len(encoded) + 1
+    assert buf == b'\x00' + encoded + b'\x00'
+
+    stream = io.BytesIO()
+    value_type.s_encode(stream, value)
+    assert stream.getvalue() == encoded
+
+
+def test_encode_into_consecutive_values():
+    value_type = parse('{scalar32,bytes}')
+    buf = bytearray()
+
+    offset = 0
+    for idx in range(200):
+        offset = value_type.encode_into(buf, offset, (idx, bytes(idx)))
+
+    assert offset == len(buf)
+    assert buf == b''.join(value_type.encode((idx, bytes(idx))) for idx in range(200))
+
+
+@pytest.mark.parametrize(
+    'type_str,value,size',
+    (
+        ('uint32', 1, 3),
+        ('{bytes32,uint64}', (b'\x00' * 32, 1), 39),
+        ('bytes', b'\x00' * 10, 10),
+        ('scalar32[]', (2**32 - 1,), 5),
+    ),
+)
+def test_encode_into_insufficient_space(type_str, value, size):
+    with pytest.raises(EncodingError):
+        parse(type_str).encode_into(memoryview(bytearray(size)), 0, value)
+
+
+class RecordingStream(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.write_sizes = []
+
+    def write(self, data):
+        self.write_sizes.append(len(data))
+        return super().write(data)
+
+
+def test_s_encode_writes_in_chunks():
+    value_type = parse('{bytes,bytes[]}')
+    value = (b'\x01' * 200000, tuple(b'\x02' * 100 for _ in range(10000)))
+    stream = RecordingStream()
+
+    value_type.s_encode(stream, value)
+
+    assert stream.getvalue() == value_type.encode(value)
+    assert len(stream.write_sizes) > 1
+    assert 200000 in stream.write_sizes
+    assert max(size for size in stream.write_sizes if size != 200000) < 70000
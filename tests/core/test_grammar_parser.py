@@ -1,7 +1,11 @@
 import pytest
 
+from bimini.exceptions import (
+    ParseError,
+)
 from bimini.types import (
     ArrayType,
+    BitfieldType,
     BitType,
     BoolType,
     ByteType,
@@ -13,9 +17,14 @@ from bimini.types import (
     TupleType,
     UnsignedIntegerType,
 )
-from bimini.grammar import parse
+from bimini.grammar import (
+    MAX_NESTING_DEPTH,
+    normalize,
+    parse,
+)
 
 t_bit = BitType()
+t_bitfield = BitfieldType()
 t_bool = BoolType()
 t_byte = ByteType()
 t_bytes = BytesType()
@@ -32,6 +41,7 @@ t_scalar256 = ScalarType(256)
     'type_str,expected',
     (
         ('bit', t_bit),
+        ('bitfield', t_bitfield),
         ('bool', t_bool),
         ('byte', t_byte),
         ('bytes', t_bytes),
@@ -141,3 +151,135 @@ def test_parsing_container_type_strings(type_str, expected):
 def test_parsing_optional_types(type_str, expected):
     result = parse(type_str)
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    'type_str,expected',
+    (
+        ('{}', ContainerType(())),
+        ('{{}}', ContainerType((ContainerType(()),))),
+        ('{}[2]?', OptionalType(TupleType(ContainerType(()), 2))),
+    ),
+)
+def test_parsing_empty_container(type_str, expected):
+    assert parse(type_str) == expected
+
+
+@pytest.mark.parametrize(
+    'type_str',
+    (
+        'uint8[10][]',
+        'uint8[10][][5]',
+        'uint8?[]?',
+        '{uint8,scalar8}[5]',
+        '{bytes32,{bit?,byte[2]}[]}?',
+        '{bitfield,bitfield?[4]}[]',
+        '{bytes32,bytes20,uint2048,scalar256,bytes8?}[]',
+    ),
+)
+def test_type_str_round_trip(type_str):
+    assert str(parse(type_str)) == type_str
+
+
+@pytest.mark.parametrize(
+    'type_str,offset',
+    (
+        ('', 0),
+        ('foo', 0),
+        ('uint', 4),
+        ('uint7', 4),
+        ('uint08', 4),
+        ('bit8', 3),
+        ('bitfield8', 8),
+        ('bytes0', 5),
+        ('uint8[0]', 6),
+        ('uint8[', 5),
+        ('uint8[x]', 5),
+        ('uint8]', 5),
+        ('{uint8,}', 7),
+        ('{uint8', 6),
+        ('{uint8;bytes}', 6),
+        ('uint8???', 7),
+        ('uint8[]?[]', 8),
+        ('{uint8,bytes32}}', 15),
+    ),
+)
+def test_parse_error_offset(type_str, offset):
+    with pytest.raises(ParseError, match=f'at offset {offset}$'):
+        parse(type_str)
+
+
+def test_parse_deeply_nested_container():
+    with pytest.raises(ParseError):
+        parse('{' * 5000 + '}' * 5000)
+
+
+def _nested(value, depth):
+    for _ in range(depth):
+        value = (value,)
+    return value
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('uint8' + '[]' * (MAX_NESTING_DEPTH - 1), _nested(1, MAX_NESTING_DEPTH - 1)),
+        (
+            '{' * (MAX_NESTING_DEPTH - 1) + 'uint8' + '}' * (MAX_NESTING_DEPTH - 1),
+            _nested(1, MAX_NESTING_DEPTH - 1),
+        ),
+        ('{uint8' + '[1]' * (MAX_NESTING_DEPTH - 3) + '?}', (_nested(1, MAX_NESTING_DEPTH - 3),)),
+    ),
+)
+def test_parse_maximum_nesting_depth(type_str, value):
+    value_type = parse(type_str)
+    assert value_type.decode(value_type.encode(value)) == value
+
+
+@pytest.mark.parametrize(
+    'type_str',
+    (
+        'uint8' + '[]' * MAX_NESTING_DEPTH,
+        'uint8' + '[2]' * 400,
+        'uint8' + '[]' * (MAX_NESTING_DEPTH - 1) + '?',
+        '{' * MAX_NESTING_DEPTH + 'uint8' + '}' * MAX_NESTING_DEPTH,
+        '{' * (MAX_NESTING_DEPTH - 1) + '}' * (MAX_NESTING_DEPTH - 1) + '[][]',
+        '{bytes,{uint8' + '[]' * (MAX_NESTING_DEPTH - 1) + '}}',
+    ),
+)
+def test_parse_too_deeply_nested(type_str):
+    with pytest.raises(ParseError, match='nested'):
+        parse(type_str)
+
+
+def test_parsed_types_are_interned():
+    assert parse('{uint8,bytes[]}') is ContainerType((t_uint8, ArrayType(t_bytes)))
+    assert parse('uint8[10][5]') is t_uint8_tuple10_tuple5
+    assert hash(parse('{uint8,scalar8}')) == hash(t_cont_uint8_scalar8)
+    assert parse('bool') is not parse('bit')
+    assert len({parse('uint8[]'), ArrayType(UnsignedIntegerType(8)), parse('bytes')}) == 2
+
+
+def test_types_are_immutable():
+    with pytest.raises(AttributeError):
+        t_uint8.bit_size = 16
+    with pytest.raises(AttributeError):
+        t_uint8.extra = 1
+
+
+@pytest.mark.parametrize(
+    'type_str,expected',
+    (
+        ('uint8', 'uint8'),
+        ('byte', 'uint8'),
+        ('bool', 'bit'),
+        ('bytes', 'uint8[]'),
+        ('bytes32', 'uint8[32]'),
+        ('{bool,byte?,bytes[2]}[]', '{bit,uint8?,uint8[2][]}[]'),
+        ('bytes32[]?', 'uint8[][32]?'),
+        ('{bool,bitfield}', '{bit,bitfield}'),
+    ),
+)
+def test_normalize(type_str, expected):
+    assert normalize(type_str) == expected
+    assert parse(normalize(type_str)) is parse(expected)
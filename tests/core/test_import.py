@@ -1,4 +1,26 @@
+import os
+import subprocess
+import sys
+
+import pytest
 
 
 def test_import():
     import bimini  # noqa: F401
+
+
+@pytest.mark.parametrize('module', ('bimini', 'bimini.types', 'bimini.grammar'))
+def test_import_does_not_load_slow_dependencies(module):
+    script = (
+        f'import sys, {module}; '
+        f'print(",".join(sorted(set(sys.modules) & {{"numpy", "asyncio", "cytoolz"}})))'
+    )
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        stdout=subprocess.PIPE,
+        env=dict(os.environ, PYTHONPATH=root),
+        universal_newlines=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ''
@@ -0,0 +1,176 @@
+import io
+import random
+
+import pytest
+
+import bimini
+from bimini.exceptions import (
+    DecodingError,
+    ParseError,
+)
+from bimini.grammar import parse
+from bimini.incremental import (
+    DEFAULT_CHUNK_SIZE,
+    Decoder,
+)
+
+
+NESTED = (1, 2)
+for _ in range(15):
+    NESTED = (NESTED,)
+
+
+VALUES = (
+    ('uint8', tuple(range(10))),
+    ('scalar256', (0, 1, 2**255, 2**64)),
+    ('bytes', (b'', b'\x01' * 300, b'abc')),
+    ('{bytes32,bytes32,uint64}', ((b'\x00' * 32, b'\x01' * 32, 5),) * 3),
+    ('{bytes,scalar32,uint8[]}', ((b'abc', 300, (1, 2, 3)), (b'', 0, ()))),
+    ('bytes8?', (b'', b'\x01' * 8, b'')),
+    ('bytes[]', (tuple(bytes(idx) for idx in range(50)), ())),
+    ('uint16' + '[]' * 16, (NESTED, NESTED)),
+)
+
+
+@pytest.mark.parametrize('type_str,values', VALUES)
+@pytest.mark.parametrize('chunk_size', (1, 2, 7, 1000))
+def test_decoder_feed_chunks(type_str, values, chunk_size):
+    value_type = parse(type_str)
+    data = b''.join(value_type.encode(value) for value in values)
+    decoder = Decoder(value_type)
+
+    decoded = []
+    for start in range(0, len(data), chunk_size):
+        decoded.extend(decoder.feed(data[start:start + chunk_size]))
+
+    assert tuple(decoded) == values
+    assert decoder.buffered == 0
+    decoder.close()
+
+
+MAX_VALUE_SIZE = 2000
+
+
+def _long_stream(value_type, num_values=5000, seed=0):
+    rng = random.Random(seed)
+    values = tuple(
+        bytes(rng.randrange(MAX_VALUE_SIZE - 2)) for _ in range(num_values)
+    )
+    return values, b''.join(value_type.encode(value) for value in values)
+
+
+def test_decoder_buffer_is_bounded():
+    value_type = parse('bytes')
+    values, data = _long_stream(value_type)
+    decoder = Decoder(value_type)
+
+    decoded = []
+    for start in range(0, len(data), DEFAULT_CHUNK_SIZE):
+        decoded.extend(decoder.feed(data[start:start + DEFAULT_CHUNK_SIZE]))
+        assert len(decoder._buf) < MAX_VALUE_SIZE
+
+    assert tuple(decoded) == values
+
+
+def test_decoder_returns_values_as_completed():
+    value_type = parse('{uint16,bytes}')
+    decoder = Decoder(value_type)
+
+    assert decoder.feed(b'\x01') == []
+    assert decoder.feed(b'\x00\x02a') == []
+    assert decoder.buffered == 4
+    assert decoder.feed(b'b\x02\x00\x01') == [(1, b'ab')]
+    assert decoder.buffered == 3
+    assert decoder.feed(b'c') == [(2, b'c')]
+    assert decoder.feed(b'') == []
+
+
+def test_decoder_close_incomplete():
+    decoder = Decoder(parse('bytes'))
+    assert decoder.feed(b'\x05abc') == []
+
+    with pytest.raises(ParseError):
+        decoder.close()
+
+
+@pytest.mark.parametrize(
+    'type_str,data,error',
+    (
+        ('scalar8', b'\xff\xff', ParseError),
+        ('bool', b'\x02', DecodingError),
+        ('uint8?', b'\x03', DecodingError),
+    ),
+)
+def test_decoder_invalid_data(type_str, data, error):
+    with pytest.raises(error):
+        Decoder(parse(type_str)).feed(data)
+
+
+def test_decoder_fails_after_invalid_data():
+    decoder = Decoder(parse('bool'))
+    with pytest.raises(DecodingError):
+        decoder.feed(b'\x02')
+
+    with pytest.raises(ParseError) as excinfo:
+        decoder.feed(b'\x01')
+    assert isinstance(excinfo.value.__cause__, DecodingError)
+    with pytest.raises(ParseError):
+        decoder.close()
+
+
+def test_decoder_returns_values_before_invalid_data():
+    decoder = Decoder(parse('bool'))
+    assert decoder.feed(b'\x01\x00\x02\x01') == [True, False]
+
+    with pytest.raises(ParseError) as excinfo:
+        decoder.feed(b'')
+    assert isinstance(excinfo.value.__cause__, DecodingError)
+
+
+@pytest.mark.parametrize('type_str', ('{}', '{}[3]', '{{},{}}'))
+def test_decoder_rejects_empty_types(type_str):
+    with pytest.raises(ValueError):
+        Decoder(parse(type_str))
+    with pytest.raises(ValueError):
+        next(bimini.iter_decode(parse(type_str), io.BytesIO(b'\x01')))
+
+
+@pytest.mark.parametrize('type_str,values', VALUES)
+@pytest.mark.parametrize('chunk_size', (1, 7, 65536))
+def test_iter_decode_stream(type_str, values, chunk_size):
+    value_type = parse(type_str)
+    stream = io.BytesIO(b''.join(value_type.encode(value) for value in values))
+
+    assert tuple(bimini.iter_decode(value_type, stream, chunk_size=chunk_size)) == values
+
+
+def test_iter_decode_buffer_is_bounded(monkeypatch):
+    value_type = parse('bytes')
+    values, data = _long_stream(value_type)
+    buffer_sizes = []
+    feed = Decoder.feed
+
+    def recording_feed(self, chunk):
+        result = feed(self, chunk)
+        buffer_sizes.append(len(self._buf))
+        return result
+
+    monkeypatch.setattr(Decoder, 'feed', recording_feed)
+
+    assert tuple(bimini.iter_decode(value_type, io.BytesIO(data))) == values
+    assert len(buffer_sizes) > 50
+    assert max(buffer_sizes) < MAX_VALUE_SIZE
+
+
+def test_iter_decode_empty_stream():
+    assert tuple(bimini.iter_decode(parse('bytes'), io.BytesIO())) == ()
+
+
+def test_iter_decode_truncated_stream():
+    value_type = parse('{uint32,bytes}')
+    data = value_type.encode((1, b'abc')) + value_type.encode((2, b'def'))[:-1]
+    values = bimini.iter_decode(value_type, io.BytesIO(data), chunk_size=2)
+
+    assert next(values) == (1, b'abc')
+    with pytest.raises(ParseError):
+        next(values)
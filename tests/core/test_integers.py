@@ -0,0 +1,160 @@
+import io
+
+import pytest
+
+from bimini.exceptions import (
+    DecodingError,
+    EncodingError,
+    ParseError,
+)
+from bimini.grammar import parse
+from bimini.vectorized import VECTORIZE_THRESHOLD
+from bimini.integers import (
+    SMALL_VALUE_LIMIT,
+    decode_scalar,
+    decode_scalar_from,
+    decode_scalars,
+    decode_uint,
+    encode_leb128,
+    encode_scalar,
+    encode_scalars,
+    encode_uint,
+    read_scalar,
+)
+
+
+def _reference_leb128(value):
+    result = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            result.append(byte | 0x80)
+        else:
+            result.append(byte)
+            return bytes(result)
+
+
+VALUES = (
+    0, 1, 127, 128, 255, 256, 300, SMALL_VALUE_LIMIT - 1, SMALL_VALUE_LIMIT,
+    2**21 - 1, 2**21, 2**32 - 1, 2**63, 2**64 - 1, 2**256 - 1,
+)
+
+
+@pytest.mark.parametrize('value', VALUES)
+def test_scalar_round_trip(value):
+    bit_size = max(8, -(-value.bit_length() // 8) * 8)
+    encoded = encode_scalar(bit_size, value)
+
+    assert encoded == encode_leb128(value) == _reference_leb128(value)
+    assert decode_scalar(bit_size, encoded) == value
+    assert decode_scalar_from(bit_size, b'\xff' + encoded + b'\xff', 1) == (value, len(encoded) + 1)
+
+    stream = io.BytesIO(encoded + b'\xff')
+    assert read_scalar(bit_size, stream) == value
+    assert stream.read() == b'\xff'
+
+
+def test_small_value_table():
+    for value in range(SMALL_VALUE_LIMIT):
+        assert encode_scalar(16, value) == _reference_leb128(value)
+
+
+@pytest.mark.parametrize(
+    'bit_size,value',
+    (
+        (8, 256),
+        (8, SMALL_VALUE_LIMIT - 1),
+        (16, 2**16),
+        (64, 2**64),
+        (8, -1),
+        (8, 1.0),
+        (8, '1'),
+    ),
+)
+def test_encode_out_of_range(bit_size, value):
+    with pytest.raises(EncodingError):
+        encode_scalar(bit_size, value)
+    with pytest.raises(EncodingError):
+        encode_uint(bit_size, value)
+    # Arrays of at least `VECTORIZE_THRESHOLD` items are encoded in bulk.
+    with pytest.raises(EncodingError):
+        parse(f'scalar{bit_size}[]').encode((0,) * (VECTORIZE_THRESHOLD - 1) + (value,))
+    with pytest.raises(EncodingError):
+        encode_scalars(bit_size, (0, value))
+    with pytest.raises(EncodingError):
+        encode_scalars(bit_size, (0,) * (VECTORIZE_THRESHOLD - 1) + (value,))
+
+
+@pytest.mark.parametrize('bit_size', (0, 7, 12))
+def test_invalid_bit_size(bit_size):
+    with pytest.raises(ValueError):
+        encode_scalar(bit_size, 1)
+    with pytest.raises(ValueError):
+        decode_uint(bit_size, b'\x01')
+
+
+@pytest.mark.parametrize(
+    'bit_size,data',
+    (
+        # 256 fits in the two bytes allowed for a scalar8 but not in 8 bits
+        (8, b'\x80\x02'),
+        (8, b'\x80\x80\x01'),
+        (16, b'\xff\xff\x04'),
+        (16, b'\x80'),
+        (8, b''),
+    ),
+)
+def test_decode_invalid_scalar(bit_size, data):
+    with pytest.raises(DecodingError):
+        decode_scalar(bit_size, data)
+    with pytest.raises(DecodingError):
+        parse(f'scalar{bit_size}').decode_from(data)
+    with pytest.raises(ParseError):
+        read_scalar(bit_size, io.BytesIO(data))
+    with pytest.raises(ParseError):
+        parse(f'scalar{bit_size}').s_decode(io.BytesIO(data))
+
+
+def test_decode_scalar_trailing_bytes():
+    with pytest.raises(DecodingError):
+        decode_scalar(8, b'\x01\x00')
+
+
+def test_decode_uint_length():
+    assert decode_uint(16, b'\x01\x01') == 257
+    with pytest.raises(DecodingError):
+        decode_uint(16, b'\x01')
+    with pytest.raises(DecodingError):
+        decode_uint(16, b'\x01\x00\x00')
+
+
+def test_compiled_scalar_range():
+    with pytest.raises(EncodingError):
+        parse('scalar8').compile().encode(256)
+    with pytest.raises(EncodingError):
+        parse('scalar8[]').compile().encode((1, 256))
+    assert parse('scalar8').compile().encode(255) == b'\xff\x01'
+
+
+@pytest.mark.parametrize('num_repeats', (1, VECTORIZE_THRESHOLD))
+@pytest.mark.parametrize('bit_size', (8, 32, 64, 256))
+def test_bulk_round_trip(bit_size, num_repeats):
+    values = tuple(value for value in VALUES if value.bit_length() <= bit_size) * num_repeats
+    encoded = encode_scalars(bit_size, values)
+
+    assert encoded == b''.join(_reference_leb128(value) for value in values)
+    assert encode_scalars(bit_size, iter(values)) == encoded
+    assert decode_scalars(bit_size, b'\x00' + encoded, 1, len(values)) == (
+        values,
+        len(encoded) + 1,
+    )
+    assert decode_scalars(bit_size, encoded, 0, 0) == ((), 0)
+
+
+@pytest.mark.parametrize('count', (3, VECTORIZE_THRESHOLD + 2))
+def test_decode_scalars_errors(count):
+    with pytest.raises(DecodingError):
+        decode_scalars(32, b'\x01' * (count - 1), 0, count)
+    with pytest.raises(DecodingError):
+        decode_scalars(8, b'\x01' * (count - 2) + b'\x80\x02', 0, count - 1)
@@ -0,0 +1,51 @@
+import io
+
+import pytest
+
+from bimini.exceptions import (
+    ParseError,
+)
+from bimini.grammar import parse
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('uint8[]', ()),
+        ('uint8[]', tuple(range(256))),
+        ('bytes[]', tuple(bytes(idx) for idx in range(300))),
+        ('{scalar64,bytes}[]', tuple((idx, b'\x01' * idx) for idx in range(200))),
+        ('uint16[]', (1, 2, 3)),
+        ('bytes[3]', (b'a', b'', b'bc')),
+        ('{bool,uint8[]}[2]', ((True, (1,)), (False, ()))),
+    ),
+)
+def test_iter_decode(type_str, value):
+    value_type = parse(type_str)
+    stream = io.BytesIO(value_type.encode(value) + b'\xff')
+
+    assert tuple(value_type.iter_decode(stream)) == value
+    assert stream.read() == b'\xff'
+
+
+def test_iter_decode_reads_items_on_demand():
+    value_type = parse('bytes[]')
+    stream = io.BytesIO(value_type.encode((b'abc', b'def', b'ghi')))
+
+    items = value_type.iter_decode(stream)
+    assert stream.tell() == 1
+    assert next(items) == b'abc'
+    assert stream.tell() == 5
+    assert next(items) == b'def'
+    assert stream.tell() == 9
+
+
+def test_iter_decode_truncated():
+    value_type = parse('uint32[]')
+    stream = io.BytesIO(value_type.encode((1, 2, 3))[:-1])
+
+    items = value_type.iter_decode(stream)
+    assert next(items) == 1
+    assert next(items) == 2
+    with pytest.raises(ParseError):
+        next(items)
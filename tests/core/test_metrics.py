@@ -0,0 +1,138 @@
+import gc
+import io
+import threading
+import weakref
+
+import pytest
+
+from bimini import metrics
+from bimini.grammar import parse
+from bimini.records import record
+from bimini.types import (
+    BaseType,
+    ContainerType,
+    ScalarType,
+)
+
+
+@pytest.fixture
+def enabled():
+    metrics.reset()
+    metrics.enable()
+    try:
+        yield
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+
+def test_disabled_by_default():
+    assert not metrics.is_enabled()
+    parse('uint8').encode(1)
+    assert metrics.snapshot() == {}
+
+
+def test_records_calls_and_bytes(enabled):
+    value_type = parse('{bytes,scalar32}')
+    data = value_type.encode((b'abc', 300))
+    value_type.decode(data)
+    value_type.s_decode(io.BytesIO(data + b'\x00'))
+    value_type.s_decode(io.BytesIO(data))
+
+    stats = metrics.snapshot()
+    encode = stats[('{bytes,scalar32}', 'encode')]
+    assert (encode.calls, encode.bytes_in, encode.bytes_out) == (1, 0, len(data))
+    decode = stats[('{bytes,scalar32}', 'decode')]
+    assert (decode.calls, decode.bytes_in, decode.bytes_out) == (1, len(data), 0)
+    s_decode = stats[('{bytes,scalar32}', 's_decode')]
+    assert (s_decode.calls, s_decode.bytes_in) == (2, 2 * len(data))
+    assert 0 < s_decode.p99_seconds <= s_decode.total_seconds
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('bool', True),
+        ('uint16', 5),
+        ('scalar64', 2**40),
+        ('byte', b'\x01'),
+        ('bytes', b'abc'),
+        ('bytes4', b'abcd'),
+        ('uint8?', 1),
+        ('uint8[2]', (1, 2)),
+        ('uint8[]', (1, 2)),
+    ),
+)
+def test_records_every_type(enabled, type_str, value):
+    value_type = parse(type_str)
+    assert value_type.decode(value_type.encode(value)) == value
+    stats = metrics.snapshot()
+    assert stats[(type_str, 'encode')].calls == 1
+    assert stats[(type_str, 'decode')].calls == 1
+
+
+def test_record_and_container_are_counted_together(enabled):
+    Pair = record('Pair', (('key', 'bytes'), ('value', 'scalar32')))
+    container_type = parse('{bytes,scalar32}')
+    data = container_type.encode((b'abc', 300))
+    container_type.decode(data)
+    Pair._value_type.decode(data)
+    Pair._value_type.decode(data)
+
+    decode = metrics.snapshot()[('{bytes,scalar32}', 'decode')]
+    assert (decode.calls, decode.bytes_in) == (3, 3 * len(data))
+
+
+def test_types_are_not_kept_alive(enabled):
+    value_type = ContainerType((ScalarType(24), ScalarType(40)))
+    value_type.decode(value_type.encode((1, 2)))
+    type_ref = weakref.ref(value_type)
+    del value_type
+    gc.collect()
+
+    assert type_ref() is None
+    assert metrics.snapshot()[('{scalar24,scalar40}', 'decode')].calls == 1
+
+
+def test_calls_from_every_thread_are_counted(enabled):
+    value_type = parse('{uint8,bytes}')
+
+    def encode_values():
+        for idx in range(100):
+            value_type.encode((idx, b'abc'))
+
+    threads = [threading.Thread(target=encode_values) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    encode_values()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.snapshot()[('{uint8,bytes}', 'encode')].calls == 500
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_disable_restores_methods(enabled):
+    assert ScalarType.encode is not ScalarType.__dict__['encode'].__wrapped__
+    metrics.enable()
+    metrics.disable()
+    assert not metrics.is_enabled()
+    assert not hasattr(ScalarType.__dict__['encode'], '__wrapped__')
+    assert not hasattr(BaseType.__dict__['s_decode'], '__wrapped__')
+
+    parse('uint8').encode(1)
+    assert metrics.snapshot() == {}
+
+
+def test_prometheus_export(enabled):
+    parse('uint8').encode(1)
+    parse('uint8').encode(2)
+    parse('{bytes}').decode(b'\x01a')
+
+    text = metrics.to_prometheus()
+    assert '# TYPE bimini_calls_total counter' in text
+    assert 'bimini_calls_total{type="uint8",operation="encode"} 2' in text
+    assert 'bimini_bytes_in_total{type="{bytes}",operation="decode"} 2' in text
+    assert 'bimini_latency_p99_seconds{type="uint8",operation="encode"}' in text
+    assert text.endswith('\n')
@@ -0,0 +1,154 @@
+import io
+import pickle
+
+import pytest
+
+from bimini import record
+from bimini.exceptions import EncodingError
+from bimini.grammar import parse
+from bimini.records import Record
+from bimini.types import (
+    ArrayType,
+    ContainerType,
+    RecordType,
+)
+
+
+Log = record('Log', (('address', 'bytes20'), ('topics', 'uint256[]'), ('data', 'bytes')))
+Receipt = record('Receipt', (
+    ('state_root', 'bytes'),
+    ('gas_used', 'scalar256'),
+    ('logs', ArrayType(Log._value_type)),
+    ('log', Log),
+))
+Empty = record('Empty', ())
+
+
+def _as_tuples(value):
+    if isinstance(value, (Record, tuple)):
+        return tuple(_as_tuples(element) for element in value)
+    return value
+
+
+LOG = Log(b'\x01' * 20, (1, 2**255), b'data')
+RECEIPT = Receipt(b'\x02' * 32, 21000, (LOG, Log(b'\x03' * 20, (), b'')), LOG)
+
+
+@pytest.mark.parametrize(
+    'record_class,value,type_str',
+    (
+        (Log, LOG, '{bytes20,uint256[],bytes}'),
+        (
+            Receipt,
+            RECEIPT,
+            '{bytes,scalar256,{bytes20,uint256[],bytes}[],{bytes20,uint256[],bytes}}',
+        ),
+        (Empty, Empty(), '{}'),
+    ),
+)
+def test_record_round_trip(record_class, value, type_str):
+    value_type = record_class._value_type
+    encoded = value_type.encode(value)
+
+    assert isinstance(value_type, RecordType)
+    assert str(value_type) == type_str
+    assert encoded == parse(type_str).encode(_as_tuples(value))
+
+    decoded = value_type.decode(encoded)
+    assert type(decoded) is record_class
+    assert decoded == value
+    assert value_type.s_decode(io.BytesIO(encoded)) == value
+    assert value_type.decode_from(b'\x00' + encoded, 1) == (value, len(encoded) + 1)
+    assert value_type.skip(encoded) == len(encoded)
+
+    stream = io.BytesIO()
+    value_type.s_encode(stream, value)
+    assert stream.getvalue() == encoded
+
+
+def test_record_fields():
+    log = Log(topics=(), data=b'', address=b'\x00' * 20)
+
+    assert Log._fields == ('address', 'topics', 'data')
+    assert log.address == b'\x00' * 20
+    assert tuple(log) == (b'\x00' * 20, (), b'')
+    assert repr(Log(b'\x00', (), b'')) == "Log(address=b'\\x00', topics=(), data=b'')"
+    assert not hasattr(log, '__dict__')
+    assert isinstance(log, Record)
+    with pytest.raises(AttributeError):
+        log.extra = 1
+
+    log.data = b'x'
+    assert Log._value_type.decode(Log._value_type.encode(log)).data == b'x'
+
+
+def test_record_equality():
+    assert Log(*tuple(LOG)) == LOG
+    assert Log(b'\x01' * 20, (), b'') != LOG
+    assert LOG != tuple(LOG)
+    with pytest.raises(TypeError):
+        hash(LOG)
+
+
+def test_record_pickle():
+    assert pickle.loads(pickle.dumps(RECEIPT)) == RECEIPT
+    assert pickle.loads(pickle.dumps(Receipt._value_type)) is Receipt._value_type
+
+
+def test_record_type_is_distinct_from_container():
+    assert Log._value_type is RecordType(Log)
+    assert Log._value_type is not parse('{bytes20,uint256[],bytes}')
+    assert isinstance(Log._value_type, ContainerType)
+    assert parse('{bytes20,uint256[],bytes}').decode(Log._value_type.encode(LOG)) == tuple(LOG)
+
+
+def test_record_decode_lazy():
+    receipt = Receipt._value_type.decode_lazy(b'\x00' + Receipt._value_type.encode(RECEIPT), 1)
+    assert type(receipt) is Receipt
+    assert receipt == RECEIPT
+
+    container_type = ContainerType((parse('bytes'), Receipt._value_type))
+    view = container_type.decode_lazy(container_type.encode((b'', RECEIPT)))
+    assert type(view[1]) is Receipt
+    assert view[1] == RECEIPT
+
+    array_type = ArrayType(Log._value_type)
+    view = array_type.decode_lazy(array_type.encode(RECEIPT.logs))
+    assert type(view[1]) is Log
+    assert all(type(log) is Log for log in view)
+    assert tuple(view) == RECEIPT.logs
+
+
+def test_record_encodes_objects_with_the_fields():
+    class Duck:
+        address = b'\x01' * 20
+        topics = (1, 2**255)
+        data = b'data'
+
+    assert Log._value_type.encode(Duck()) == Log._value_type.encode(LOG)
+
+
+@pytest.mark.parametrize('value', (tuple(LOG), None, Empty()))
+def test_record_encoding_missing_fields(value):
+    with pytest.raises(EncodingError, match='as Log'):
+        Log._value_type.encode(value)
+
+
+@pytest.mark.parametrize(
+    'name,fields',
+    (
+        ('Log', (('address', 'bytes20'), ('address', 'bytes'))),
+        ('Log', (('_address', 'bytes20'),)),
+        ('Log', (('class', 'bytes20'),)),
+        ('Log', (('two words', 'bytes20'),)),
+        ('not valid', (('address', 'bytes20'),)),
+    ),
+)
+def test_record_invalid_names(name, fields):
+    with pytest.raises(ValueError):
+        record(name, fields)
+
+
+def test_record_invalid_field_type():
+    with pytest.raises(TypeError):
+        record('Log', (('address', 20),))
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+import bimini
+from bimini.exceptions import (
+    ParseError,
+)
+from bimini.grammar import (
+    parse,
+    registry,
+)
+from bimini.registry import (
+    CodecRegistry,
+)
+
+
+def test_registry_hits_and_misses():
+    cache = CodecRegistry(parse, maxsize=4)
+
+    assert cache.get_type('uint8') is parse('uint8')
+    assert cache.get_type('uint8') is parse('uint8')
+    assert cache.get_type('bytes') is parse('bytes')
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size, stats.maxsize) == (1, 2, 2, 4)
+
+    cache.clear()
+    assert cache.stats() == (0, 0, 0, 0, 4)
+
+
+def test_registry_evicts_least_recently_used():
+    cache = CodecRegistry(parse, maxsize=2)
+
+    cache.get_type('uint8')
+    cache.get_type('uint16')
+    cache.get_type('uint8')
+    cache.get_type('uint32')
+
+    assert cache.stats().evictions == 1
+    cache.get_type('uint8')
+    assert cache.stats().misses == 3
+    cache.get_type('uint16')
+    assert cache.stats().misses == 4
+
+    cache.resize(1)
+    assert cache.stats().size == 1
+    assert cache.stats().evictions == 3
+
+
+def test_registry_does_not_cache_errors():
+    cache = CodecRegistry(parse)
+    with pytest.raises(ParseError):
+        cache.get_type('uint7')
+    assert cache.stats().size == 0
+    with pytest.raises(TypeError):
+        cache.get_type(8)
+
+
+def test_codec_for():
+    codec = bimini.codec_for('{uint8,bytes}')
+
+    assert codec is parse('{uint8,bytes}').compile()
+    assert codec.decode(codec.encode((1, b'abc'))) == (1, b'abc')
+    assert registry.stats().maxsize == registry.maxsize
+
+
+def test_registry_concurrent_access():
+    cache = CodecRegistry(parse, maxsize=8)
+    type_strs = [f'uint{8 * idx}[]' for idx in range(1, 17)]
+    # keep the types alive so that evicted entries are parsed to the same types
+    value_types = [parse(type_str) for type_str in type_strs]
+    results = []
+
+    def lookup():
+        for _ in range(50):
+            results.extend(cache.codec_for(type_str) for type_str in type_strs)
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats.hits + stats.misses == 4 * 50 * 16
+    assert stats.size == 8
+    assert set(results) == {value_type.compile() for value_type in value_types}
@@ -0,0 +1,110 @@
+import io
+
+import pytest
+
+from bimini.exceptions import (
+    DecodingError,
+    ParseError,
+)
+from bimini.grammar import parse
+
+
+@pytest.mark.parametrize(
+    'type_str,min_size,max_size',
+    (
+        ('bit', 1, 1),
+        ('bool', 1, 1),
+        ('byte', 1, 1),
+        ('uint8', 1, 1),
+        ('uint256', 32, 32),
+        ('scalar16', 1, 3),
+        ('scalar8', 1, 2),
+        ('scalar256', 1, 37),
+        ('bytes', 1, None),
+        ('bytes32', 32, 32),
+        ('uint16?', 1, 3),
+        ('bytes?', 1, None),
+        ('{bytes32,bytes32,uint64}', 72, 72),
+        ('{bytes32,scalar32}', 33, 37),
+        ('{uint8,bytes}', 2, None),
+        ('uint16[4]', 8, 8),
+        ('scalar16[2]', 2, 6),
+        ('bytes[2]', 2, None),
+        ('uint8[]', 1, None),
+        ('{uint8,uint16[2]}[3]', 15, 15),
+    ),
+)
+def test_size_bounds(type_str, min_size, max_size):
+    value_type = parse(type_str)
+
+    assert value_type.min_size == min_size
+    assert value_type.max_size == max_size
+    assert value_type.is_fixed_size is (min_size == max_size)
+    if value_type.is_fixed_size:
+        assert value_type.fixed_size == min_size
+    else:
+        assert value_type.fixed_size is None
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('{bytes32,scalar32}', (b'\x00' * 32, 0)),
+        ('{bytes32,scalar32}', (b'\x00' * 32, 2**32 - 1)),
+        ('uint16?', 0),
+        ('uint16?', 2**16 - 1),
+        ('{uint8,uint16[2]}[3]', ((1, (2, 3)),) * 3),
+    ),
+)
+def test_encoded_size_within_bounds(type_str, value):
+    value_type = parse(type_str)
+    encoded = value_type.encode(value)
+
+    assert value_type.min_size <= len(encoded)
+    assert value_type.max_size is None or len(encoded) <= value_type.max_size
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.num_reads = 0
+
+    def read(self, size=-1):
+        self.num_reads += 1
+        return super().read(size)
+
+
+def test_fixed_size_container_read_at_once():
+    value_type = parse('{bytes32,bytes32,uint64}')
+    value = (b'\x01' * 32, b'\x02' * 32, 12345)
+    stream = CountingStream(value_type.encode(value) + b'\xff')
+
+    assert value_type.s_decode(stream) == value
+    assert stream.num_reads == 1
+    assert stream.read() == b'\xff'
+
+
+def test_minimum_size_read_at_once():
+    value_type = parse('{uint64,uint64,bytes}')
+    value = (1, 2, b'')
+    stream = CountingStream(value_type.encode(value))
+
+    assert value_type.s_decode(stream) == value
+    assert stream.num_reads == 1
+
+
+@pytest.mark.parametrize(
+    'type_str,data',
+    (
+        ('{bytes32,bytes32,uint64}', b'\x00' * 71),
+        ('{uint64,uint64,bytes}', b'\x00' * 16),
+        ('uint32[4]', b'\x00' * 15),
+    ),
+)
+def test_short_input_rejected(type_str, data):
+    value_type = parse(type_str)
+
+    with pytest.raises(DecodingError, match=f'needed {value_type.min_size} at offset 0'):
+        value_type.decode(data)
+    with pytest.raises(ParseError):
+        value_type.s_decode(CountingStream(data))
@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+from bimini.exceptions import (
+    DecodingError,
+    ParseError,
+)
+from bimini.grammar import parse
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('bool', True),
+        ('byte', b'\x01'),
+        ('uint64', 2**64 - 1),
+        ('scalar256', 2**255),
+        ('bytes', b'\x00' * 300),
+        ('bytes32', b'\x01' * 32),
+        ('bytes8?', b''),
+        ('bytes8?', b'\x01' * 8),
+        ('{bytes32,bytes32,uint64}', (b'\x00' * 32, b'\x01' * 32, 5)),
+        ('{bytes,scalar32,uint8[]}', (b'abc', 300, (1, 2, 3))),
+        ('uint16[4]', (1, 2, 3, 4)),
+        ('{uint8,bool}[]', ((1, True),) * 200),
+        ('bytes[]', tuple(bytes(idx) for idx in range(200))),
+        ('scalar64[]', tuple(range(0, 2**64, 2**50))),
+    ),
+)
+def test_skip_matches_decoding(type_str, value):
+    value_type = parse(type_str)
+    encoded = value_type.encode(value)
+    buf = b'\xff' + encoded + b'\xff'
+
+    assert value_type.skip(buf, 1) == len(encoded) + 1
+    assert value_type.skip(memoryview(buf), 1) == len(encoded) + 1
+
+    stream = io.BytesIO(encoded + b'\xff')
+    assert value_type.s_skip(stream) == len(encoded)
+    assert stream.read() == b'\xff'
+
+
+class ReadOnlyStream:
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, size):
+        return self._stream.read(size)
+
+
+def test_s_skip_large_payload_without_readinto():
+    value_type = parse('{bytes,scalar32}')
+    encoded = value_type.encode((b'\x00' * 200000, 7))
+    stream = ReadOnlyStream(encoded + b'\xee')
+
+    assert value_type.s_skip(stream) == len(encoded)
+    assert stream.read(1) == b'\xee'
+
+
+@pytest.mark.parametrize(
+    'type_str,data',
+    (
+        ('uint32', b'\x00\x00'),
+        ('scalar16', b'\x80\x80\x80\x01'),
+        ('bytes', b'\x05\x00'),
+        ('{bytes32,uint64}', b'\x00' * 39),
+        ('uint16[]', b'\x03\x00\x00'),
+        ('bytes8?', b'\x02'),
+    ),
+)
+def test_skip_invalid_framing(type_str, data):
+    value_type = parse(type_str)
+
+    with pytest.raises(DecodingError):
+        value_type.skip(data)
+    with pytest.raises((ParseError, DecodingError)):
+        value_type.s_skip(io.BytesIO(data))
@@ -0,0 +1,161 @@
+import random
+
+import pytest
+
+from bimini.exceptions import (
+    DecodingError,
+    EncodingError,
+)
+from bimini.grammar import parse
+from bimini.integers import (
+    encode_leb128,
+)
+from bimini.vectorized import (
+    VECTORIZE_THRESHOLD,
+    decode_scalar_array_from,
+    encode_scalar_array,
+)
+
+np = pytest.importorskip('numpy')
+
+
+def _random_values(bit_size, count, seed=0):
+    rng = random.Random(seed)
+    return tuple(
+        rng.randrange(0, 2**rng.randint(1, bit_size))
+        for _ in range(count)
+    )
+
+
+@pytest.mark.parametrize('bit_size', (8, 32, 64, 128, 256))
+@pytest.mark.parametrize('count', (0, 1, 100, 1000))
+def test_scalar_array_codec_matches_python_encoding(bit_size, count):
+    values = _random_values(bit_size, count)
+    expected = b''.join(encode_leb128(value) for value in values)
+
+    assert encode_scalar_array(bit_size, values) == expected
+    assert decode_scalar_array_from(bit_size, b'\xff' + expected, 1, count) == (
+        values,
+        len(expected) + 1,
+    )
+
+
+@pytest.mark.parametrize('type_str', ('scalar32[]', 'scalar256[]', '{uint8,scalar64[]}[]'))
+@pytest.mark.parametrize('buffer_type', (bytes, bytearray, memoryview))
+def test_vectorized_array_round_trip(type_str, buffer_type):
+    value_type = parse(type_str)
+    if type_str.startswith('{'):
+        value = tuple((idx, _random_values(64, VECTORIZE_THRESHOLD * 2, idx)) for idx in range(3))
+    else:
+        value = _random_values(int(type_str[6:-2]), VECTORIZE_THRESHOLD * 4)
+
+    encoded = value_type.encode(value)
+    assert value_type.decode(buffer_type(encoded)) == value
+
+
+@pytest.mark.parametrize(
+    'data',
+    (
+        # truncated final value
+        b'\x01' * 99 + b'\x80',
+        # value exceeding 32 bits
+        b'\x01' * 99 + b'\xff\xff\xff\xff\xff\x01',
+    ),
+)
+def test_vectorized_decoding_errors(data):
+    with pytest.raises(DecodingError):
+        decode_scalar_array_from(32, data, 0, 100)
+
+
+@pytest.mark.parametrize('bit_size', (8, 16, 32, 64))
+def test_uint_ndarray_round_trip(bit_size):
+    array_type = parse(f'uint{bit_size}[]')
+    tuple_type = parse(f'uint{bit_size}[5]')
+    values = np.array([0, 1, 2, 3, 2**bit_size - 1], dtype=f'<u{bit_size // 8}')
+
+    encoded = array_type.encode(values)
+    assert encoded == array_type.encode(tuple(values.tolist()))
+    assert tuple_type.encode(values) == encoded[1:]
+
+    decoded = array_type.decode_ndarray(encoded)
+    assert decoded.dtype == np.dtype(f'<u{bit_size // 8}')
+    assert np.array_equal(decoded, values)
+    assert np.array_equal(tuple_type.decode_ndarray(encoded[1:]), values)
+
+
+def test_uint_ndarray_decoding_shares_memory():
+    buf = bytearray(parse('uint32[]').encode((1, 2, 3)))
+    decoded, offset = parse('uint32[]').decode_ndarray_from(buf)
+
+    assert offset == len(buf)
+    buf[1] = 5
+    assert decoded[0] == 5
+
+
+def test_uint_ndarray_encoding_in_container():
+    container_type = parse('{bytes,uint16[]}')
+    values = np.arange(1000, dtype=np.int64)
+
+    encoded = container_type.encode((b'abc', values))
+    assert container_type.decode(encoded) == (b'abc', tuple(range(1000)))
+
+
+@pytest.mark.parametrize(
+    'type_str,values,expected',
+    (
+        ('{uint16[]?,uint8}', (np.arange(5, dtype=np.uint16), 1), ((0, 1, 2, 3, 4), 1)),
+        ('{uint16[]?,uint8}', (np.arange(0, dtype=np.uint16), 1), (b'', 1)),
+        ('{uint16[]?,uint8}', (None, 1), (b'', 1)),
+        ('{uint8[2]?}', (np.array([1, 2], dtype=np.uint8),), ((1, 2),)),
+        ('{bitfield?}', (np.array([True, False]),), ((True, False),)),
+    ),
+)
+def test_ndarray_encoding_in_optional(type_str, values, expected):
+    value_type = parse(type_str)
+    assert value_type.decode(value_type.encode(values)) == expected
+
+
+@pytest.mark.parametrize(
+    'type_str,values',
+    (
+        ('uint8[]', np.array([256])),
+        ('uint16[]', np.array([-1])),
+        ('uint32[]', np.array([1.5])),
+        ('uint8[]', np.zeros((2, 2), dtype=np.uint8)),
+        ('uint8[3]', np.zeros(2, dtype=np.uint8)),
+    ),
+)
+def test_uint_ndarray_encoding_validation(type_str, values):
+    with pytest.raises(EncodingError):
+        parse(type_str).encode(values)
+
+
+@pytest.mark.parametrize(
+    'type_str,value',
+    (
+        ('scalar8[]', 256),
+        ('scalar8[]', 1000),
+        ('scalar32[]', 2**32),
+        ('scalar64[]', -1),
+        ('scalar256[]', 2**300),
+        ('scalar64[]', 1.0),
+    ),
+)
+def test_scalar_array_encoding_validation(type_str, value):
+    values = (0,) * (VECTORIZE_THRESHOLD - 1) + (value,)
+    with pytest.raises(EncodingError):
+        parse(type_str).encode(values)
+    if isinstance(value, int) and 0 <= value < 2**64:
+        with pytest.raises(EncodingError):
+            parse(type_str).encode(np.array(values, dtype=np.uint64))
+
+
+@pytest.mark.parametrize('type_str', ('uint256[]', 'scalar32[]', 'bytes[]', 'uint8[2][]'))
+def test_decode_ndarray_unsupported_item_types(type_str):
+    with pytest.raises(TypeError):
+        parse(type_str).decode_ndarray(b'\x00')
+
+
+def test_decode_ndarray_insufficient_bytes():
+    with pytest.raises(DecodingError):
+        parse('uint16[]').decode_ndarray(b'\x02\x00\x00\x00')
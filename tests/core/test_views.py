@@ -0,0 +1,106 @@
+import pytest
+
+from bimini.exceptions import (
+    DecodingError,
+)
+from bimini.grammar import parse
+from bimini.views import (
+    ArrayView,
+    ContainerView,
+)
+
+
+HEADER_TYPE_STR = '{bytes32,bytes,scalar64,bytes8?}'
+TXN_TYPE_STR = '{scalar64,bytes20?,bytes}'
+BLOCK_TYPE = parse('{%s,%s[],%s[]}' % (HEADER_TYPE_STR, TXN_TYPE_STR, HEADER_TYPE_STR))
+
+
+def mk_header(number):
+    return (bytes([number]) * 32, b'extra', number, b'')
+
+
+def mk_txn(nonce):
+    return (nonce, b'\x01' * 20, b'data' * nonce)
+
+
+BLOCK = (mk_header(7), tuple(mk_txn(idx) for idx in range(300)), (mk_header(5), mk_header(6)))
+ENCODED_BLOCK = BLOCK_TYPE.encode(BLOCK)
+
+
+def test_container_view_field_access():
+    view = BLOCK_TYPE.decode_lazy(ENCODED_BLOCK)
+
+    assert isinstance(view, ContainerView)
+    assert len(view) == 3
+
+    header, txns, uncles = view
+    assert isinstance(header, ContainerView)
+    assert isinstance(txns, ArrayView)
+    assert header[2] == 7
+    assert len(txns) == 300
+    assert txns[-1] == mk_txn(299)
+    assert uncles[1][0] == b'\x06' * 32
+
+
+def test_view_decodes_only_accessed_fields():
+    # claim five uncles without providing any: accessing the header and the
+    # transaction count must not notice
+    corrupted = BLOCK_TYPE.encode((BLOCK[0], BLOCK[1], ()))[:-1] + b'\x05'
+    view = BLOCK_TYPE.decode_lazy(corrupted)
+
+    assert view[0][2] == 7
+    assert len(view[1]) == 300
+    assert len(view[2]) == 5
+    with pytest.raises(DecodingError):
+        view[2][0][0]
+
+
+def test_view_equality_and_materialize():
+    view = BLOCK_TYPE.decode_lazy(ENCODED_BLOCK)
+
+    assert view == BLOCK
+    assert view.materialize() == BLOCK
+    assert view[1].materialize() == BLOCK[1]
+    assert view[1][10:13] == BLOCK[1][10:13]
+    assert view.end_offset == len(ENCODED_BLOCK)
+
+
+@pytest.mark.parametrize('buffer_type', (bytes, bytearray, memoryview))
+def test_view_at_offset(buffer_type):
+    array_type = parse('bytes[]')
+    values = tuple(bytes(idx) for idx in range(50))
+    buf = buffer_type(b'\xff' * 3 + array_type.encode(values) + b'\xff')
+
+    view = array_type.decode_lazy(buf, 3)
+    assert view[49] == bytes(49)
+    assert list(view) == list(values)
+    assert view.end_offset == len(buf) - 1
+
+
+@pytest.mark.parametrize('type_str', ('bytes32[]', 'bool[]', '{bytes20,uint8}[]'))
+def test_fixed_size_array_view(type_str):
+    array_type = parse(type_str)
+    item_size = array_type.item_type.fixed_size
+    values = tuple(array_type.item_type.decode(bytes([idx % 2]) * item_size) for idx in range(100))
+    data = array_type.encode(values)
+
+    view = array_type.decode_lazy(data)
+    assert view[73] == values[73]
+    assert len(view._offsets) == 1
+    assert list(view) == list(values)
+    assert view.end_offset == len(data)
+
+    truncated = array_type.decode_lazy(data[:-1])
+    assert truncated[98] == values[98]
+    with pytest.raises(DecodingError):
+        tuple(truncated[99])
+    with pytest.raises(DecodingError):
+        truncated.end_offset
+
+
+def test_view_index_errors():
+    view = parse('{uint8,uint8}').decode_lazy(b'\x01\x02')
+
+    assert view[-1] == 2
+    with pytest.raises(IndexError):
+        view[2]